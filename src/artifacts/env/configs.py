@@ -5,13 +5,14 @@
 from enum import Enum
 
 # ** info: typing imports
+from typing import Dict
 from typing import Set
 
 # ** info: pydantic imports
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
-__all__: list[str] = ["configs"]
+__all__: list[str] = ["LoggingQueueFullPolicy", "configs"]
 
 
 class EnvironmentMode(str, Enum):
@@ -25,15 +26,43 @@ class LoggingMode(str, Enum):
     pretty: str = "pretty"
 
 
+class LoggingQueueFullPolicy(str, Enum):
+    block: str = "block"
+    drop: str = "drop"
+
+
 class Configs(BaseSettings):
     # ** info: app configs
     app_environment_mode: EnvironmentMode = Field(..., env="APP_ENVIRONMENT_MODE")
     app_logging_mode: LoggingMode = Field(..., env="APP_LOGGING_MODE")
     app_server_port: int = Field(..., env="APP_SERVER_PORT")
     app_database_health_check_middleware_exclude: Set[str] = Field(..., env="APP_DATABASE_HEALTH_CHECK_MIDDLEWARE_EXCLUDE")
+    app_database_health_check_routes_databases: Dict[str, Set[str]] = Field(..., env="APP_DATABASE_HEALTH_CHECK_ROUTES_DATABASES")
     app_use_database_health_check_middleware: bool = Field(..., env="APP_USE_DATABASE_HEALTH_CHECK_MIDDLEWARE")
+    app_database_health_check_interval: int = Field(..., env="APP_DATABASE_HEALTH_CHECK_INTERVAL")
+    app_database_health_check_timeout: int = Field(..., env="APP_DATABASE_HEALTH_CHECK_TIMEOUT")
     app_authentication_handler_middleware_exclude: Set[str] = Field(..., env="APP_AUTHENTICATION_HANDLER_MIDDLEWARE_EXCLUDE")
     app_use_authentication_handler_middleware: bool = Field(..., env="APP_USE_AUTHENTICATION_HANDLER_MIDDLEWARE")
+    app_check_database_indexes_on_startup: bool = Field(..., env="APP_CHECK_DATABASE_INDEXES_ON_STARTUP")
+    app_metrics_middleware_exclude: Set[str] = Field(..., env="APP_METRICS_MIDDLEWARE_EXCLUDE")
+    app_use_metrics_middleware: bool = Field(..., env="APP_USE_METRICS_MIDDLEWARE")
+    app_use_request_profiler_middleware: bool = Field(..., env="APP_USE_REQUEST_PROFILER_MIDDLEWARE")
+    app_request_profiler_token: str = Field(..., env="APP_REQUEST_PROFILER_TOKEN")
+    app_request_profiler_sample_rate: float = Field(..., env="APP_REQUEST_PROFILER_SAMPLE_RATE")
+    app_request_profiler_slow_request_threshold_ms: int = Field(..., env="APP_REQUEST_PROFILER_SLOW_REQUEST_THRESHOLD_MS")
+    app_request_profiler_slow_request_cooldown: int = Field(..., env="APP_REQUEST_PROFILER_SLOW_REQUEST_COOLDOWN")
+    app_request_profiler_directory: str = Field(..., env="APP_REQUEST_PROFILER_DIRECTORY")
+    app_request_profiler_max_profiles: int = Field(..., env="APP_REQUEST_PROFILER_MAX_PROFILES")
+    app_logging_request_body_max_bytes: int = Field(..., env="APP_LOGGING_REQUEST_BODY_MAX_BYTES")
+    app_logging_response_body_max_bytes: int = Field(..., env="APP_LOGGING_RESPONSE_BODY_MAX_BYTES")
+    app_logging_response_body_sample_rate: float = Field(..., env="APP_LOGGING_RESPONSE_BODY_SAMPLE_RATE")
+    app_logging_response_body_content_types: Set[str] = Field(..., env="APP_LOGGING_RESPONSE_BODY_CONTENT_TYPES")
+    app_logging_response_body_exclude: Set[str] = Field(..., env="APP_LOGGING_RESPONSE_BODY_EXCLUDE")
+    app_streamed_request_body_routes: Set[str] = Field(..., env="APP_STREAMED_REQUEST_BODY_ROUTES")
+    app_logging_queue_size: int = Field(..., env="APP_LOGGING_QUEUE_SIZE")
+    app_logging_batch_size: int = Field(..., env="APP_LOGGING_BATCH_SIZE")
+    app_logging_queue_full_policy: LoggingQueueFullPolicy = Field(..., env="APP_LOGGING_QUEUE_FULL_POLICY")
+    app_logging_queue_block_timeout_ms: int = Field(..., env="APP_LOGGING_QUEUE_BLOCK_TIMEOUT_MS")
 
     # ** info: users database credentials
     database_password: str = Field(..., env="DATABASE_PASSWORD")
@@ -42,6 +71,12 @@ class Configs(BaseSettings):
     database_name: str = Field(..., env="DATABASE_NAME")
     database_user: str = Field(..., env="DATABASE_USER")
     database_port: int = Field(..., env="DATABASE_PORT")
+    database_pool_size: int = Field(..., env="DATABASE_POOL_SIZE")
+    database_pool_max_overflow: int = Field(..., env="DATABASE_POOL_MAX_OVERFLOW")
+    database_pool_recycle: int = Field(..., env="DATABASE_POOL_RECYCLE")
+    database_pool_pre_ping: bool = Field(..., env="DATABASE_POOL_PRE_PING")
+    database_pool_timeout: int = Field(..., env="DATABASE_POOL_TIMEOUT")
+    database_slow_query_threshold_ms: int = Field(..., env="DATABASE_SLOW_QUERY_THRESHOLD_MS")
 
     # ** info: tv database credentials
     tv_database_password: str = Field(..., env="TV_DATABASE_PASSWORD")
@@ -50,6 +85,13 @@ class Configs(BaseSettings):
     tv_database_name: str = Field(..., env="TV_DATABASE_NAME")
     tv_database_user: str = Field(..., env="TV_DATABASE_USER")
     tv_database_port: int = Field(..., env="TV_DATABASE_PORT")
+    tv_database_pool_size: int = Field(..., env="TV_DATABASE_POOL_SIZE")
+    tv_database_pool_max_overflow: int = Field(..., env="TV_DATABASE_POOL_MAX_OVERFLOW")
+    tv_database_pool_recycle: int = Field(..., env="TV_DATABASE_POOL_RECYCLE")
+    tv_database_pool_pre_ping: bool = Field(..., env="TV_DATABASE_POOL_PRE_PING")
+    tv_database_pool_timeout: int = Field(..., env="TV_DATABASE_POOL_TIMEOUT")
+    tv_database_slow_query_threshold_ms: int = Field(..., env="TV_DATABASE_SLOW_QUERY_THRESHOLD_MS")
+    tv_database_bulk_chunk_size: int = Field(..., env="TV_DATABASE_BULK_CHUNK_SIZE")
 
     # ** info: cache database credentials
     cache_database_default_ttl: int = Field(..., env="CACHE_DATABASE_DEFAULT_TTL")
@@ -58,6 +100,8 @@ class Configs(BaseSettings):
     cache_database_host: str = Field(..., env="CACHE_DATABASE_HOST")
     cache_database_name: str = Field(..., env="CACHE_DATABASE_NAME")
     cache_database_port: int = Field(..., env="CACHE_DATABASE_PORT")
+    cache_database_compression_threshold: int = Field(..., env="CACHE_DATABASE_COMPRESSION_THRESHOLD")
+    cache_database_key_version: str = Field(..., env="CACHE_DATABASE_KEY_VERSION")
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,127 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from threading import Thread
+from threading import Lock
+import queue
+import sys
+
+# ** info: typing imports
+from typing import Callable
+from typing import TextIO
+from typing import Union
+from typing import Self
+from typing import Dict
+from typing import List
+from typing import Any
+
+# ** info: artifacts imports
+from src.artifacts.env.configs import LoggingQueueFullPolicy
+
+__all__: list[str] = ["BatchedLogSink"]
+
+
+class BatchedLogSink:
+
+    """batched log sink
+    this class provides a loguru sink that only puts the records on a bounded in memory queue, a
+    background writer thread serializes them and writes them to the stream in batches, so the
+    threads that log never pay for the serialization or the stream writes
+    """
+
+    _STOP_SIGNAL: object = object()
+
+    def __init__(
+        self: Self,
+        serializer: Callable[[Dict[str, Any]], str],
+        max_queue_size: int,
+        batch_size: int,
+        queue_full_policy: LoggingQueueFullPolicy,
+        block_timeout_ms: int,
+        stream: TextIO = sys.stdout,
+    ):
+        self._serializer: Callable[[Dict[str, Any]], str] = serializer
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._max_queue_size: int = max_queue_size
+        self._batch_size: int = batch_size
+        self._queue_full_policy: LoggingQueueFullPolicy = queue_full_policy
+        self._block_timeout: float = block_timeout_ms / 1000
+        self._stream: TextIO = stream
+
+        self._writer: Union[None, Thread] = None
+        self._counters_lock: Lock = Lock()
+        self._dropped_records: int = 0
+        self._failed_records: int = 0
+        self._written_records: int = 0
+        self._written_batches: int = 0
+
+    def __call__(self: Self, message: Any) -> None:
+        try:
+            # ** info: the block policy waits at most the block timeout for the writer, so logging never stalls the caller for longer
+            if self._queue_full_policy == LoggingQueueFullPolicy.block:
+                self._queue.put(message.record, timeout=self._block_timeout)
+            else:
+                self._queue.put_nowait(message.record)
+
+        except queue.Full:
+            with self._counters_lock:
+                self._dropped_records += 1
+
+    def start(self: Self) -> None:
+        if self._writer is None:
+            self._writer = Thread(target=self._write_batches, name="batched-log-sink", daemon=True)
+            self._writer.start()
+
+    def stop(self: Self) -> None:
+        # ** info: the stop signal is queued after the pending records, so they are written before the writer ends
+        if self._writer is not None:
+            self._queue.put(self._STOP_SIGNAL)
+            self._writer.join()
+            self._writer = None
+
+    def get_statistics(self: Self) -> Dict[str, Any]:
+        return {
+            "queueFullPolicy": self._queue_full_policy.value,
+            "maxQueueSize": self._max_queue_size,
+            "queueDepth": self._queue.qsize(),
+            "droppedRecords": self._dropped_records,
+            "failedRecords": self._failed_records,
+            "writtenRecords": self._written_records,
+            "writtenBatches": self._written_batches,
+        }
+
+    def _write_batches(self: Self) -> None:
+        is_stopped: bool = False
+
+        # ** info: the writer waits for a record and then drains what is already queued, so the batches grow with the load
+        while is_stopped is False:
+            batch: List[Any] = [self._queue.get()]
+
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            is_stopped = any(record is self._STOP_SIGNAL for record in batch)
+
+            self._write_batch(batch=[record for record in batch if record is not self._STOP_SIGNAL])
+
+    def _write_batch(self: Self, batch: List[Dict[str, Any]]) -> None:
+        lines: List[str] = list()
+
+        for record in batch:
+            try:
+                lines.append(self._serializer(record))
+
+            # ! warning: super general exception handling here, a record that can't be serialized must never stop the writer thread
+            except Exception as exception:
+                sys.stderr.write(f"unable to serialize log record: {exception!r}\n")
+                self._failed_records += 1
+
+        if len(lines) > 0:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+            self._written_records += len(lines)
+            self._written_batches += 1
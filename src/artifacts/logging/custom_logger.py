@@ -2,9 +2,8 @@
 # type: ignore
 
 # ** info: python imports
-import traceback
 import logging
-import json
+import atexit
 import sys
 
 # ** info: typing imports
@@ -14,19 +13,17 @@ from typing import Self
 from typing import Any
 
 # ** info: types imports
-from types import TracebackType
 from types import FrameType
 
 # ** info: loguru imports
 from loguru import logger
 
-# ** info: loguru _recattrs imports
-from loguru._recattrs import RecordException
-
 # ** info: artifacts imports
-from src.artifacts.datetime.datetime_provider import datetime_provider
+from src.artifacts.logging.batched_log_sink import BatchedLogSink
+from src.artifacts.logging.record_encoder import RecordEncoder
 from src.artifacts.uuid.uuid_provider import uuid_provider
 from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
 
 __all__: list[str] = ["custom_logger"]
 
@@ -50,6 +47,16 @@ class CustomLogger(metaclass=Singleton):
             "group": "undefined",
         }
 
+        self._record_encoder: RecordEncoder = RecordEncoder(app_name=self._extras["appName"], app_instance_id=self._extras["appInstanceId"])
+
+        self._batched_log_sink: BatchedLogSink = BatchedLogSink(
+            serializer=self._record_encoder.encode,
+            max_queue_size=configs.app_logging_queue_size,
+            batch_size=configs.app_logging_batch_size,
+            queue_full_policy=configs.app_logging_queue_full_policy,
+            block_timeout_ms=configs.app_logging_queue_block_timeout_ms,
+        )
+
     def setup_pretty_logging(self: Self) -> None:
         """setup pretty logging
         this function overwrites the python root logger with a custom logger, so all the logs are
@@ -82,7 +89,8 @@ class CustomLogger(metaclass=Singleton):
     def setup_structured_logging(self: Self) -> None:
         """setup structured logging
         this function overwrites the python root logger with a custom logger, so all the logs are
-        written with the new overwritten configuration
+        written with the new overwritten configuration, the records are queued and written in
+        batches by a background thread
         """
 
         fmt: str = "{message}"
@@ -97,8 +105,9 @@ class CustomLogger(metaclass=Singleton):
 
         # ** info: loguru configs
         loguru_configs: dict = {
-            "sink": self.__custom_log_sink,
-            "serialize": True,
+            "sink": self._batched_log_sink,
+            # ** info: the sink only queues the raw records, the writer thread serializes them off the request path
+            "serialize": False,
             "colorize": False,
             "format": fmt,
         }
@@ -106,69 +115,14 @@ class CustomLogger(metaclass=Singleton):
         logger.configure(extra=self._extras)
         logger.configure(handlers=[loguru_configs])
 
-    def __custom_log_sink(self: Self, message) -> None:
-        serialized = self.__custom_serializer(message.record)
-        sys.stdout.write(serialized)
-        sys.stdout.write("\n")
-        sys.stdout.flush()
-
-    def __custom_serializer(self: Self, record) -> str:
-        subset: Dict[str, Any] = {
-            "loggId": uuid_provider.get_str_uuid(),
-            "severity": record["level"].name,
-            "timestamp": datetime_provider.get_utc_pretty_string(),
-            "message": record["message"],
-            "execution": {
-                "group": record["extra"]["group"],
-                "function": record["function"],
-                "module": record["module"],
-                "line": record["line"],
-                "processName": record["process"].name,
-                "processId": record["process"].id,
-                "threadName": record["thread"].name,
-                "threadId": record["thread"].id,
-                "filePath": record["file"].path,
-                "fileName": record["file"].name,
-            },
-            "request": {
-                "externalId": record["extra"]["externalId"],
-                "internalId": record["extra"]["internalId"],
-                "body": record["extra"]["requestBody"],
-                "headers": record["extra"]["requestHeaders"],
-                "endpointUrl": record["extra"]["endpointUrl"],
-                "fullUrl": record["extra"]["fullUrl"],
-                "startTime": record["extra"]["startTime"],
-            },
-            "response": {
-                "body": record["extra"]["responseBody"],
-                "headers": record["extra"]["responseHeaders"],
-                "status": record["extra"]["responseCode"],
-                "endTime": record["extra"]["endTime"],
-            },
-            "app": {
-                "name": record["extra"]["appName"],
-                "id": record["extra"]["appInstanceId"],
-                "aliveTime": datetime_provider.prettify_time_delta_obj(record["elapsed"]),
-            },
-        }
-
-        if record["exception"] is not None:
-            error: RecordException = record["exception"]
-
-            error_traceback: TracebackType = error.traceback
-            error_message: str = error.value.args[0]
-            error_type: str = error.type.__name__
-            string_traceback: str
-
-            string_traceback = "".join(traceback.format_tb(error_traceback))
+        self._batched_log_sink.start()
+        atexit.register(self._batched_log_sink.stop)
 
-            subset["error"] = {
-                "type": error_type,
-                "message": error_message,
-                "traceback": string_traceback,
-            }
+    def stop_structured_logging(self: Self) -> None:
+        self._batched_log_sink.stop()
 
-        return json.dumps(subset)
+    def get_statistics(self: Self) -> Dict[str, Any]:
+        return self._batched_log_sink.get_statistics()
 
     class _CustomInterceptHandler(logging.Handler):
         def emit(self: Self, record: logging.LogRecord):
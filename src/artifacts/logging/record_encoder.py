@@ -0,0 +1,140 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from datetime import timezone
+from datetime import datetime
+from datetime import timedelta
+import traceback
+import itertools
+import uuid
+
+# ** info: typing imports
+from typing import Iterator
+from typing import Union
+from typing import Tuple
+from typing import Self
+from typing import Dict
+from typing import Any
+
+# ** info: orjson imports
+import orjson
+
+# ** info: artifacts imports
+from src.artifacts.datetime.datetime_provider import datetime_provider
+
+__all__: list[str] = ["RecordEncoder"]
+
+MAX_CACHED_THREADS: int = 256
+
+
+class RecordEncoder:
+
+    """record encoder
+    this class encodes the loguru records as structured json logs, the fields that never change
+    are computed once, the timestamps are formatted once per second and the json is written by orjson
+    """
+
+    def __init__(self: Self, app_name: str, app_instance_id: str):
+        self._app_name: str = app_name
+        self._app_instance_id: str = app_instance_id
+
+        # ** info: the logg ids share a random prefix and end with a sequence, so they keep the uuid shape without a uuid4 per record
+        self._logg_id_prefix: str = str(uuid.uuid4())[:24]
+        self._logg_id_sequence: Iterator[int] = itertools.count()
+
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
+        self._alive_time_cache: Tuple[int, str] = (-1, "")
+        self._threads_cache: Dict[Tuple[int, int, str], Dict[str, Any]] = dict()
+
+    def encode(self: Self, record: Dict[str, Any]) -> str:
+        """encode
+        this function encodes a loguru record as a structured json log line
+        args:
+        - record (dict): the loguru record
+        returns:
+        - str: the json log line
+        """
+
+        extra: Dict[str, Any] = record["extra"]
+
+        subset: Dict[str, Any] = {
+            "loggId": f"{self._logg_id_prefix}{next(self._logg_id_sequence):012x}",
+            "severity": record["level"].name,
+            "timestamp": self._format_timestamp(record_time=record["time"]),
+            "message": record["message"],
+            "execution": {
+                "group": extra["group"],
+                "function": record["function"],
+                "module": record["module"],
+                "line": record["line"],
+                **self._get_thread_fields(record=record),
+                "filePath": record["file"].path,
+                "fileName": record["file"].name,
+            },
+            "request": {
+                "externalId": extra["externalId"],
+                "internalId": extra["internalId"],
+                "body": extra["requestBody"],
+                "headers": extra["requestHeaders"],
+                "endpointUrl": extra["endpointUrl"],
+                "fullUrl": extra["fullUrl"],
+                "startTime": extra["startTime"],
+            },
+            "response": {
+                "body": extra["responseBody"],
+                "headers": extra["responseHeaders"],
+                "status": extra["responseCode"],
+                "endTime": extra["endTime"],
+            },
+            "app": {
+                "name": self._app_name,
+                "id": self._app_instance_id,
+                "aliveTime": self._format_alive_time(elapsed=record["elapsed"]),
+            },
+        }
+
+        if record["exception"] is not None:
+            subset["error"] = {
+                "type": record["exception"].type.__name__,
+                "message": str(record["exception"].value),
+                "traceback": "".join(traceback.format_tb(record["exception"].traceback)),
+            }
+
+        return orjson.dumps(subset, default=str).decode()
+
+    def _format_timestamp(self: Self, record_time: datetime) -> str:
+        record_second: int = int(record_time.timestamp())
+
+        if self._timestamp_cache[0] != record_second:
+            utc_time: datetime = datetime.fromtimestamp(record_second, tz=timezone.utc)
+            self._timestamp_cache = (record_second, utc_time.strftime("%Y-%m-%d %H:%M:%S"))
+
+        return f"{self._timestamp_cache[1]}.{record_time.microsecond:06d}"
+
+    def _format_alive_time(self: Self, elapsed: timedelta) -> str:
+        elapsed_seconds: int = int(elapsed.total_seconds())
+
+        if self._alive_time_cache[0] != elapsed_seconds:
+            self._alive_time_cache = (elapsed_seconds, datetime_provider.prettify_time_delta_obj(time_delta_obj=elapsed))
+
+        return self._alive_time_cache[1]
+
+    def _get_thread_fields(self: Self, record: Dict[str, Any]) -> Dict[str, Any]:
+        thread_key: Tuple[int, int, str] = (record["process"].id, record["thread"].id, record["thread"].name)
+
+        thread_fields: Union[None, Dict[str, Any]] = self._threads_cache.get(thread_key)
+
+        if thread_fields is None:
+            thread_fields = {
+                "processName": record["process"].name,
+                "processId": record["process"].id,
+                "threadName": record["thread"].name,
+                "threadId": record["thread"].id,
+            }
+
+            # ** info: the thread ids are recycled by short lived threads, so only a bounded number of them is cached
+            if len(self._threads_cache) < MAX_CACHED_THREADS:
+                self._threads_cache[thread_key] = thread_fields
+
+        return thread_fields
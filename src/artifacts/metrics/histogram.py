@@ -0,0 +1,44 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import bisect
+
+# ** info: typing imports
+from typing import Union
+from typing import Tuple
+from typing import List
+from typing import Self
+from typing import Dict
+from typing import Any
+
+__all__: list[str] = ["Histogram"]
+
+
+class Histogram:
+
+    """histogram
+    this class counts the observed values in fixed buckets, each bucket counts the values lower or
+    equal than its upper bound and the last one counts every value
+    """
+
+    def __init__(self: Self, bounds: Tuple[float, ...]):
+        self._bounds: Tuple[float, ...] = bounds
+        self._counts: List[int] = [0] * (len(bounds) + 1)
+        self._total: float = 0.0
+        self._count: int = 0
+
+    def observe(self: Self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._total += value
+        self._count += 1
+
+    def to_dict(self: Self) -> Dict[str, Any]:
+        buckets: List[Dict[str, Union[None, float, int]]] = list()
+        cumulative_count: int = 0
+
+        for bound, count in zip([*self._bounds, None], self._counts):
+            cumulative_count += count
+            buckets.append({"le": bound, "count": cumulative_count})
+
+        return {"count": self._count, "sum": self._total, "buckets": buckets}
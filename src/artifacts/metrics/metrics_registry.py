@@ -0,0 +1,126 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: typing imports
+from typing import Union
+from typing import Tuple
+from typing import List
+from typing import Self
+from typing import Dict
+from typing import Any
+
+# ** info: artifacts imports
+from src.artifacts.metrics.histogram import Histogram
+from src.artifacts.pattern.singleton import Singleton
+
+__all__: list[str] = ["metrics_registry", "MetricFamily"]
+
+COUNTER: str = "counter"
+GAUGE: str = "gauge"
+HISTOGRAM: str = "histogram"
+
+
+class MetricFamily:
+
+    """metric family
+    this class keeps the series of a single counter, gauge or histogram metric, one series per
+    labels values, and renders them in the prometheus text exposition format
+    """
+
+    def __init__(self: Self, name: str, metric_type: str, description: str, label_names: Tuple[str, ...], bounds: Tuple[float, ...] = tuple()):
+        self.name: str = name
+        self.metric_type: str = metric_type
+        self.description: str = description
+        self.label_names: Tuple[str, ...] = label_names
+        self._bounds: Tuple[float, ...] = bounds
+        self._series: Dict[Tuple[str, ...], Union[float, Histogram]] = dict()
+
+    def increment(self: Self, labels: Tuple[str, ...], value: float = 1.0) -> None:
+        self._series[labels] = self._series.get(labels, 0.0) + value
+
+    def observe(self: Self, labels: Tuple[str, ...], value: float) -> None:
+        histogram: Union[None, Histogram] = self._series.get(labels)
+
+        if histogram is None:
+            histogram = self._series[labels] = Histogram(bounds=self._bounds)
+
+        histogram.observe(value)
+
+    def render(self: Self) -> List[str]:
+        lines: List[str] = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+
+        for labels, series in self._series.items():
+            labels_pairs: List[str] = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(self.label_names, labels)]
+
+            if self.metric_type != HISTOGRAM:
+                lines.append(f"{self.name}{_format_labels(labels_pairs)} {_format_value(series)}")
+                continue
+
+            histogram_rep: Dict[str, Any] = series.to_dict()
+
+            for bucket in histogram_rep["buckets"]:
+                bound_pair: str = 'le="+Inf"' if bucket["le"] is None else f'le="{_format_value(bucket["le"])}"'
+                lines.append(f"{self.name}_bucket{_format_labels([*labels_pairs, bound_pair])} {bucket['count']}")
+
+            lines.append(f"{self.name}_sum{_format_labels(labels_pairs)} {_format_value(histogram_rep['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(labels_pairs)} {histogram_rep['count']}")
+
+        return lines
+
+
+class MetricsRegistry(metaclass=Singleton):
+
+    """metrics registry
+    this class keeps the app metric families, the metrics are updated in memory by the request
+    handling code and only rendered when the metrics endpoint is scraped
+    """
+
+    def __init__(self: Self):
+        self._families: Dict[str, MetricFamily] = dict()
+
+    def counter(self: Self, name: str, description: str, label_names: Tuple[str, ...]) -> MetricFamily:
+        return self._register(name=name, metric_type=COUNTER, description=description, label_names=label_names)
+
+    def gauge(self: Self, name: str, description: str, label_names: Tuple[str, ...]) -> MetricFamily:
+        return self._register(name=name, metric_type=GAUGE, description=description, label_names=label_names)
+
+    def histogram(self: Self, name: str, description: str, label_names: Tuple[str, ...], bounds: Tuple[float, ...]) -> MetricFamily:
+        return self._register(name=name, metric_type=HISTOGRAM, description=description, label_names=label_names, bounds=bounds)
+
+    def render(self: Self) -> str:
+        """render
+        this function renders every registered metric family in the prometheus text exposition format
+        returns:
+        - str: the metrics text exposition
+        """
+
+        lines: List[str] = list()
+
+        for family in self._families.values():
+            lines.extend(family.render())
+
+        return "\n".join(lines) + "\n"
+
+    def _register(
+        self: Self, name: str, metric_type: str, description: str, label_names: Tuple[str, ...], bounds: Tuple[float, ...] = tuple()
+    ) -> MetricFamily:
+        # ** info: the families are registered once, so the modules that share a metric name share its series
+        if name not in self._families:
+            self._families[name] = MetricFamily(name=name, metric_type=metric_type, description=description, label_names=label_names, bounds=bounds)
+
+        return self._families[name]
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels_pairs: List[str]) -> str:
+    return f"{{{','.join(labels_pairs)}}}" if len(labels_pairs) > 0 else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics_registry: MetricsRegistry = MetricsRegistry()
@@ -0,0 +1,56 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import binascii
+import base64
+import json
+
+# ** info: typing imports
+from typing import List
+from typing import Self
+
+# ** info: artifacts imports
+from src.artifacts.pattern.singleton import Singleton
+
+__all__: list[str] = ["cursor_provider"]
+
+
+class CursorProvider(metaclass=Singleton):
+    def encode_cursor(self: Self, *values: str) -> str:
+        """encode cursor
+        this function packs the received keyset values into an opaque url safe cursor, so the
+        clients can't rely on the cursor internal layout
+        args:
+        - values (list[str]): the keyset values of the row the cursor points to
+        returns:
+        - str: opaque cursor
+        """
+
+        cursor_literal: bytes = json.dumps(list(values), separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(cursor_literal).decode().rstrip("=")
+
+    def decode_cursor(self: Self, cursor: str, size: int) -> List[str]:
+        """decode cursor
+        this function unpacks an opaque cursor generated with encode cursor back into its keyset
+        values, raising a value error if the cursor is malformed or doesn't have the expected size
+        args:
+        - cursor (str): opaque cursor
+        - size (int): the expected number of keyset values
+        returns:
+        - list[str]: the keyset values of the row the cursor points to
+        """
+
+        try:
+            padding: str = "=" * (-len(cursor) % 4)
+            values: List[str] = json.loads(base64.urlsafe_b64decode(f"{cursor}{padding}".encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError(f"malformed cursor {cursor}")
+
+        if not isinstance(values, list) or len(values) != size or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"malformed cursor {cursor}")
+
+        return values
+
+
+cursor_provider: CursorProvider = CursorProvider()
@@ -0,0 +1,61 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from pathlib import Path
+import logging
+import cProfile
+
+# ** info: typing imports
+from typing import Self
+from typing import List
+
+# ** info: artifacts imports
+from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["profiles_store"]
+
+
+class ProfilesStore(metaclass=Singleton):
+
+    """profiles store
+    this class writes the captured request profiles to a local directory, keeping at most max
+    profiles files so the directory never grows unbounded
+    """
+
+    def __init__(self: Self, directory: str, max_profiles: int):
+        self._directory: Path = Path(directory)
+        self._max_profiles: int = max_profiles
+
+    def get_profile_name(self: Self, internal_id: str) -> str:
+        return f"{internal_id}.prof"
+
+    def save_profile(self: Self, profiler: cProfile.Profile, internal_id: str) -> Path:
+        """save profile
+        this function writes the profile in the pstats format, so it can be opened offline with pstats
+        or snakeviz, and removes the oldest profiles once the store is full
+        args:
+        - profiler (cProfile.Profile): the disabled profiler of the request
+        - internal_id (str): the request internal id
+        returns:
+        - Path: the profile file path
+        """
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        profile_path: Path = self._directory / self.get_profile_name(internal_id=internal_id)
+        profiler.dump_stats(profile_path)
+
+        profiles: List[Path] = sorted(self._directory.glob("*.prof"), key=lambda path: path.stat().st_mtime)
+
+        for expired_profile in profiles[: max(len(profiles) - self._max_profiles, 0)]:
+            expired_profile.unlink(missing_ok=True)
+            logging.debug(f"profile {expired_profile.name} removed from the profiles store")
+
+        return profile_path
+
+
+profiles_store: ProfilesStore = ProfilesStore(
+    directory=configs.app_request_profiler_directory, max_profiles=configs.app_request_profiler_max_profiles
+)
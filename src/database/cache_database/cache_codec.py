@@ -0,0 +1,181 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import logging
+import struct
+import time
+import zlib
+
+# ** info: typing imports
+from typing import Tuple
+from typing import Union
+from typing import Self
+from typing import Dict
+from typing import Any
+
+# ** info: msgpack imports
+import msgpack
+
+# ** info: pydantic imports
+from pydantic import BaseModel
+
+# ** info: dtos imports
+from src.dtos.tv_programmation_dtos import TvProgrammationResponseDto
+from src.dtos.users_dtos import UsersPageDto
+from src.dtos.users_dtos import PageInfoDto
+from src.dtos.users_dtos import UserDto
+
+# ** info: artifacts imports
+from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["cache_codec"]
+
+# ** info: bumping the codec version turns every cached entry written by older deploys into a miss
+CACHE_CODEC_VERSION: int = 1
+
+# ** info: payload header layout: magic byte, codec version, flags and the registered dtos layout fingerprint
+HEADER: struct.Struct = struct.Struct("!BBBI")
+MAGIC: int = 0xCA
+
+COMPRESSED_FLAG: int = 0b00000001
+
+
+class CacheCodec(metaclass=Singleton):
+
+    """cache codec
+    this class encodes the cached values with msgpack, packing the registered dtos as compact field
+    arrays, compressing the payloads above a size threshold and prefixing them with a version header
+    so the entries written with another codec version or dtos layout are treated as misses
+    """
+
+    def __init__(self: Self, compression_threshold: int):
+        self._compression_threshold: int = compression_threshold
+
+        self._registered_types: Dict[type, Tuple[int, Tuple[str, ...]]] = dict()
+        self._registered_codes: Dict[int, Tuple[type, Tuple[str, ...]]] = dict()
+        self._fingerprint: int = 0
+
+        self._encoded_bytes: int = 0
+        self._max_encoded_bytes: int = 0
+        self._compressed_count: int = 0
+        self._encode_seconds: float = 0.0
+        self._decode_seconds: float = 0.0
+        self._encoded_count: int = 0
+        self._decoded_count: int = 0
+        self._stale_count: int = 0
+
+    def register(self: Self, dto_type: type, code: int) -> None:
+        fields: Tuple[str, ...]
+
+        if issubclass(dto_type, BaseModel):
+            fields = tuple(dto_type.model_fields.keys())
+        else:
+            fields = tuple(dto_type.__annotations__.keys())
+
+        self._registered_types[dto_type] = (code, fields)
+        self._registered_codes[code] = (dto_type, fields)
+
+        layout: str = ";".join(f"{code}:{dto.__name__}:{','.join(dto_fields)}" for code, (dto, dto_fields) in sorted(self._registered_codes.items()))
+        self._fingerprint = zlib.crc32(layout.encode())
+
+    def encode(self: Self, value: Any) -> bytes:
+        encode_start: float = time.perf_counter()
+
+        flags: int = 0
+        body: bytes = msgpack.packb(value, default=self._encode_dto, use_bin_type=True)
+
+        if len(body) > self._compression_threshold:
+            body = zlib.compress(body, 1)
+            flags |= COMPRESSED_FLAG
+            self._compressed_count += 1
+
+        payload: bytes = HEADER.pack(MAGIC, CACHE_CODEC_VERSION, flags, self._fingerprint) + body
+
+        encode_time: float = time.perf_counter() - encode_start
+        self._encode_seconds += encode_time
+        self._encoded_count += 1
+        self._encoded_bytes += len(payload)
+        self._max_encoded_bytes = max(self._max_encoded_bytes, len(payload))
+
+        logging.debug(f"cache value encoded in {encode_time * 1000:.3f} ms into {len(payload)} bytes")
+
+        return payload
+
+    def decode(self: Self, payload: bytes) -> Any:
+        decode_start: float = time.perf_counter()
+
+        _, _, flags, _ = HEADER.unpack_from(payload)
+        body: bytes = payload[HEADER.size :]
+
+        if flags & COMPRESSED_FLAG:
+            body = zlib.decompress(body)
+
+        value: Any = msgpack.unpackb(body, ext_hook=self._decode_dto, raw=False)
+
+        decode_time: float = time.perf_counter() - decode_start
+        self._decode_seconds += decode_time
+        self._decoded_count += 1
+
+        logging.debug(f"cache value decoded in {decode_time * 1000:.3f} ms from {len(payload)} bytes")
+
+        return value
+
+    def is_current(self: Self, payload: bytes) -> bool:
+        if len(payload) < HEADER.size:
+            self._stale_count += 1
+            return False
+
+        magic, version, _, fingerprint = HEADER.unpack_from(payload)
+
+        if magic != MAGIC or version != CACHE_CODEC_VERSION or fingerprint != self._fingerprint:
+            self._stale_count += 1
+            return False
+
+        return True
+
+    def get_statistics(self: Self) -> Dict[str, Union[int, float]]:
+        return {
+            "encodedCount": self._encoded_count,
+            "decodedCount": self._decoded_count,
+            "compressedCount": self._compressed_count,
+            "staleCount": self._stale_count,
+            "averageEncodeMs": self._encode_seconds / self._encoded_count * 1000 if self._encoded_count > 0 else 0.0,
+            "averageDecodeMs": self._decode_seconds / self._decoded_count * 1000 if self._decoded_count > 0 else 0.0,
+            "averagePayloadBytes": self._encoded_bytes / self._encoded_count if self._encoded_count > 0 else 0.0,
+            "maxPayloadBytes": self._max_encoded_bytes,
+        }
+
+    def _encode_dto(self: Self, value: Any) -> msgpack.ExtType:
+        registered_type: Union[None, Tuple[int, Tuple[str, ...]]] = self._registered_types.get(type(value))
+
+        if registered_type is None:
+            raise TypeError(f"values of type {type(value).__name__} can't be cached, register the type in the cache codec")
+
+        code, fields = registered_type
+        field_values: list = [getattr(value, field, None) for field in fields]
+
+        return msgpack.ExtType(code, msgpack.packb(field_values, default=self._encode_dto, use_bin_type=True))
+
+    def _decode_dto(self: Self, code: int, data: bytes) -> Any:
+        dto_type, fields = self._registered_codes[code]
+        field_values: Dict[str, Any] = dict(zip(fields, msgpack.unpackb(data, ext_hook=self._decode_dto, raw=False)))
+
+        if issubclass(dto_type, BaseModel):
+            return dto_type.model_construct(**field_values)
+
+        dto: Any = dto_type()
+        for field, field_value in field_values.items():
+            setattr(dto, field, field_value)
+
+        return dto
+
+
+cache_codec: CacheCodec = CacheCodec(compression_threshold=configs.cache_database_compression_threshold)
+
+# ** info: the registered codes are part of the cached payloads, never reuse a code for another dto
+cache_codec.register(dto_type=UserDto, code=1)
+cache_codec.register(dto_type=PageInfoDto, code=2)
+cache_codec.register(dto_type=UsersPageDto, code=3)
+cache_codec.register(dto_type=TvProgrammationResponseDto, code=4)
@@ -2,9 +2,15 @@
 # type: ignore
 
 # ** info: python imports
+from datetime import datetime
+from datetime import date
 import functools
+import inspect
 import hashlib
+import asyncio
 import logging
+import json
+import time
 
 # ** info: fastapi imports
 from fastapi import HTTPException
@@ -12,18 +18,31 @@ from fastapi import HTTPException
 # ** info: graphql imports
 from graphql import GraphQLError
 
+# ** info: pydantic imports
+from pydantic import BaseModel
+
 # ** info: typing imports
+from typing import Awaitable
 from typing import Callable
 from typing import Union
+from typing import Tuple
 from typing import Self
+from typing import List
+from typing import Dict
+from typing import Set
 from typing import Any
 
 # ** info: databases imports
 from src.database.cache_database.connection_manager import connection_manager
+from src.database.cache_database.cache_statistics import FunctionCacheStatistics
 from src.database.cache_database.connection_manager import ConnectionManager
+from src.database.cache_database.memory_cache import MemoryCache
+from src.database.cache_database.cache_codec import cache_codec
 
 # ** info: artifacts imports
+from src.artifacts.uuid.uuid_provider import uuid_provider
 from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
 
 __all__: list[str] = ["cache_provider"]
 
@@ -31,42 +50,470 @@ __all__: list[str] = ["cache_provider"]
 class CacheProvider(metaclass=Singleton):
     def __init__(self: Self, cache_connection_manager: ConnectionManager):
         self._connection_manager: ConnectionManager = cache_connection_manager
+        self._tagged_memory_caches: Dict[str, Set[MemoryCache]] = dict()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._statistics: Dict[str, FunctionCacheStatistics] = dict()
+
+    def ttl_cache(
+        self: Self,
+        ttl: Union[int, None] = None,
+        l1_ttl: Union[int, None] = None,
+        l1_max_entries: int = 1024,
+        single_flight: bool = True,
+        distributed_lock: bool = False,
+        lock_timeout: int = 10,
+        tags: Union[None, List[str], Callable[..., List[str]]] = None,
+        soft_ttl: Union[None, int] = None,
+    ) -> Any:
+        """ttl cache
+        this decorator caches the decorated coroutine results in redis, optionally keeping the
+        hottest values in a bounded in process first tier that is checked before redis
+        args:
+        - ttl (int): the redis time to live in seconds, the cache database default one if none
+        - l1_ttl (int): the in process time to live in seconds, the in process tier is disabled if none
+        - l1_max_entries (int): the maximum number of values kept in the in process tier
+        - single_flight (bool): concurrent misses of the same key in this worker await a single computation
+        - distributed_lock (bool): a redis lock makes a single node compute a missing key while the others wait for it
+        - lock_timeout (int): the seconds the redis lock is held before the waiting nodes compute the value by themselves
+        - tags (list[str] | callable): the tags of the cached values, or a function that receives the call arguments and returns them
+        - soft_ttl (int): the seconds a value is fresh, after them it is still returned while a single background task refreshes it
+        and callers only wait for the computation after the redis time to live, disabled if none
+        returns:
+        - callable: the decorator
+        """
+
+        redis_ttl: int = configs.cache_database_default_ttl if ttl is None else ttl
+        stale_after: Union[None, int] = self._get_stale_after(ttl=redis_ttl, soft_ttl=soft_ttl)
 
-    def ttl_cache(self: Self, ttl: Union[int, None] = None) -> Any:
         def decorator(func: Callable) -> Callable:
+            key_builder: Callable[..., str] = self._get_key_builder(func=func)
+            statistics: FunctionCacheStatistics = self._statistics.setdefault(f"{func.__module__}.{func.__qualname__}", FunctionCacheStatistics())
+
+            memory_cache: Union[None, MemoryCache] = self._get_memory_cache(ttl=redis_ttl, l1_ttl=l1_ttl, l1_max_entries=l1_max_entries)
+
+            self._register_static_tags(memory_cache=memory_cache, tags=tags)
+
+            in_flight: Union[None, Dict[str, asyncio.Future]] = dict() if single_flight is True else None
+            computation_lock_timeout: Union[None, int] = lock_timeout if distributed_lock is True else None
+            refreshing: Set[str] = set()
+
             async def cache_wrapper(*args, **kwargs) -> Any:
                 # ** info: generation function key
-                key: str = hashlib.sha256((func.__name__ + str(args) + str(kwargs)).encode()).hexdigest()
+                key: str = key_builder(*args, **kwargs)
+                call_tags: Callable[[], List[str]] = functools.partial(self._resolve_tags, tags=tags, args=args, kwargs=kwargs)
 
-                # ** info: searching key in the cache database
-                cached_value: Union[None, Any] = await self._connection_manager.get(key=key)
+                # ** info: executing the function
+                async def compute() -> Tuple[Any, bytes]:
+                    value_tags: List[str] = call_tags()
 
-                if cached_value is not None:
-                    logging.info("returning requested value from redis cache")
-                    return cached_value
+                    # ** info: the tag versions are read before the function runs so an invalidation during the computation discards its value
+                    tag_versions: Union[None, List[str]] = await self._get_tag_versions(tags=value_tags, statistics=statistics)
 
-                # ** info: executing the function
-                try:
+                    compute_start: float = time.perf_counter()
                     value: Any = await func(*args, **kwargs)
+                    statistics.compute_latency.observe(value=(time.perf_counter() - compute_start) * 1000)
 
-                    # ** info: storing the value in the cache database
-                    if ttl is None:
-                        await self._connection_manager.set_with_ttl(key=key, value=value)
-                    else:
-                        await self._connection_manager.set_with_ttl(key=key, value=value, time=ttl)
+                    # ** info: storing the value in the cache database and in the in process cache
+                    payload: bytes = self._connection_manager.serialize(value=value)
+                    statistics.value_size.observe(value=len(payload))
+                    await self._store_payload(
+                        key=key,
+                        payload=payload,
+                        ttl=redis_ttl,
+                        memory_cache=memory_cache,
+                        tags=value_tags,
+                        tag_versions=tag_versions,
+                        statistics=statistics,
+                    )
 
-                    # ** info: returning
-                    return value
+                    return value, payload
 
-                except HTTPException as error:
-                    raise HTTPException(status_code=error.status_code, detail=error.detail)
+                # ** info: searching key in the in process cache and in the cache database
+                try:
+                    cached_value, is_stale = await self._search_payload(
+                        key=key, memory_cache=memory_cache, stale_after=stale_after, call_tags=call_tags, statistics=statistics
+                    )
+
+                # ** info: the cache database is unavailable, the function runs without the cache
+                except HTTPException:
+                    logging.warning("cache database unavailable, bypassing the cache")
+                    statistics.errors += 1
+                    statistics.bypasses += 1
+                    return await func(*args, **kwargs)
+
+                if cached_value is not None:
+                    if is_stale is True:
+                        self._schedule_refresh(key=key, compute=compute, refreshing=refreshing, lock_timeout=lock_timeout, statistics=statistics)
+                    return self._connection_manager.deserialize(payload=cached_value)
+
+                try:
+                    return await self._compute_value(key=key, compute=compute, in_flight=in_flight, lock_timeout=computation_lock_timeout)
 
-                except GraphQLError as error:
-                    raise GraphQLError(message=error.message, extensions=error.extensions)
+                except (HTTPException, GraphQLError) as error:
+                    raise self._rebuild_error(error=error)
 
             return functools.wraps(func)(cache_wrapper)
 
         return decorator
 
+    async def _compute_value(
+        self: Self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[Any, bytes]]],
+        in_flight: Union[None, Dict[str, asyncio.Future]],
+        lock_timeout: Union[None, int],
+    ) -> Any:
+        if lock_timeout is not None:
+            compute = functools.partial(self._compute_with_lock, key=key, compute=compute, lock_timeout=lock_timeout)
+
+        if in_flight is not None:
+            return await self._compute_single_flight(key=key, compute=compute, in_flight=in_flight)
+
+        value, _ = await compute()
+
+        return value
+
+    async def _compute_single_flight(
+        self: Self, key: str, compute: Callable[[], Awaitable[Tuple[Any, bytes]]], in_flight: Dict[str, asyncio.Future]
+    ) -> Any:
+        in_flight_computation: Union[None, asyncio.Future] = in_flight.get(key)
+
+        # ** info: another coroutine is already computing the key, if it gets cancelled this one computes the key by itself
+        if in_flight_computation is not None:
+            await asyncio.wait({in_flight_computation})
+            if in_flight_computation.cancelled() is False:
+                logging.info("returning requested value from a coalesced computation")
+                return self._connection_manager.deserialize(payload=in_flight_computation.result())
+
+        computation: asyncio.Future = asyncio.get_running_loop().create_future()
+        computation.add_done_callback(self._discard_unretrieved_exception)
+        in_flight[key] = computation
+
+        try:
+            value, payload = await compute()
+            computation.set_result(payload)
+            return value
+
+        except Exception as error:
+            computation.set_exception(error)
+            raise
+
+        finally:
+            if computation.done() is False:
+                computation.cancel()
+            if in_flight.get(key) is computation:
+                del in_flight[key]
+
+    async def _compute_with_lock(self: Self, key: str, compute: Callable[[], Awaitable[Tuple[Any, bytes]]], lock_timeout: int) -> Tuple[Any, bytes]:
+        token: str = uuid_provider.get_str_uuid()
+
+        try:
+            is_lock_acquired: bool = await self._connection_manager.acquire_lock(key=key, token=token, time=lock_timeout)
+
+        # ** info: the cache database is unavailable, the value is computed without the lock
+        except HTTPException:
+            logging.warning("cache database unavailable, computing the value without the lock")
+            return await compute()
+
+        if is_lock_acquired is True:
+            try:
+                return await compute()
+            finally:
+                await self._release_lock(key=key, token=token)
+
+        try:
+            locked_value: Union[None, Tuple[Any, bytes]] = await self._await_locked_value(key=key, lock_timeout=lock_timeout)
+
+        # ** info: the cache database is unavailable, the value computed by the other node can't be read
+        except HTTPException:
+            logging.warning("cache database unavailable, computing the value locked by another node locally")
+            return await compute()
+
+        if locked_value is not None:
+            return locked_value
+
+        logging.warning("the value locked by another node wasn't computed in time, computing it locally")
+
+        return await compute()
+
+    async def _await_locked_value(self: Self, key: str, lock_timeout: int) -> Union[None, Tuple[Any, bytes]]:
+        # ** info: another node holds the lock, its value is awaited until the lock is released or expires
+        deadline: float = time.monotonic() + lock_timeout
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+            payload: Union[None, bytes] = await self._connection_manager.get_raw(key=key)
+
+            if payload is not None:
+                logging.info("returning requested value computed by another node")
+                return self._connection_manager.deserialize(payload=payload), payload
+
+            if await self._connection_manager.is_locked(key=key) is False:
+                break
+
+        return None
+
+    async def _release_lock(self: Self, key: str, token: str) -> None:
+        try:
+            await self._connection_manager.release_lock(key=key, token=token)
+        except HTTPException:
+            logging.warning("cache database unavailable, the lock is released when its timeout expires")
+
+    async def _get_tag_versions(self: Self, tags: List[str], statistics: FunctionCacheStatistics) -> Union[None, List[str]]:
+        try:
+            return await self._connection_manager.get_tag_versions(tags=tags)
+        except HTTPException:
+            logging.warning("cache database unavailable, bypassing the cache")
+            statistics.errors += 1
+            statistics.bypasses += 1
+            return None
+
+    def _get_key_builder(self: Self, func: Callable) -> Callable[..., str]:
+        """get key builder
+        this function returns the canonical key builder of the given function, the keys are built from
+        the module qualified function name and the bound arguments without self, normalized so equal
+        calls get the same key on every worker and node
+        args:
+        - func (callable): the cached function
+        returns:
+        - callable: a function that receives the call arguments and returns the cache key
+        """
+
+        signature: inspect.Signature = inspect.signature(func)
+        has_self: bool = len(signature.parameters) > 0 and next(iter(signature.parameters)) in ("self", "cls")
+        key_prefix: str = f"cache:{configs.cache_database_key_version}:{func.__module__}.{func.__qualname__}"
+
+        def key_builder(*args, **kwargs) -> str:
+            bound_arguments: inspect.BoundArguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+
+            arguments: Dict[str, Any] = dict(bound_arguments.arguments)
+            if has_self is True:
+                arguments.pop(next(iter(signature.parameters)))
+
+            canonical_arguments: str = json.dumps(self._normalize_argument(arguments), sort_keys=True, separators=(",", ":"))
+
+            return f"{key_prefix}:{hashlib.sha256(canonical_arguments.encode()).hexdigest()}"
+
+        return key_builder
+
+    def _normalize_argument(self: Self, argument: Any) -> Any:
+        if argument is None or isinstance(argument, (bool, int, float, str)):
+            return argument
+        if isinstance(argument, BaseModel):
+            return self._normalize_argument(argument.model_dump(mode="json"))
+        if isinstance(argument, dict):
+            return {str(key): self._normalize_argument(value) for key, value in argument.items()}
+        if isinstance(argument, (list, tuple)):
+            return [self._normalize_argument(value) for value in argument]
+        if isinstance(argument, (set, frozenset)):
+            return sorted((self._normalize_argument(value) for value in argument), key=repr)
+        if isinstance(argument, (datetime, date)):
+            return argument.isoformat()
+        if hasattr(argument, "__dict__"):
+            return self._normalize_argument(vars(argument))
+        return str(argument)
+
+    @staticmethod
+    def _rebuild_error(error: Union[HTTPException, GraphQLError]) -> Union[HTTPException, GraphQLError]:
+        if isinstance(error, HTTPException):
+            return HTTPException(status_code=error.status_code, detail=error.detail)
+        return GraphQLError(message=error.message, extensions=error.extensions)
+
+    @staticmethod
+    def _get_memory_cache(ttl: int, l1_ttl: Union[None, int], l1_max_entries: int) -> Union[None, MemoryCache]:
+        # ** info: the in process tier keeps the serialized values so each caller still gets its own copy of the value
+        if l1_ttl is None:
+            return None
+        return MemoryCache(max_entries=l1_max_entries, ttl=min(l1_ttl, ttl))
+
+    @staticmethod
+    def _get_stale_after(ttl: int, soft_ttl: Union[None, int]) -> Union[None, int]:
+        # ** info: the values are stale once their remaining redis time to live drops below this number of seconds
+        if soft_ttl is None:
+            return None
+        if soft_ttl >= ttl:
+            raise ValueError("the soft ttl must be lower than the ttl")
+        return ttl - soft_ttl
+
+    @staticmethod
+    def _resolve_tags(tags: Union[None, List[str], Callable[..., List[str]]], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> List[str]:
+        if tags is None:
+            return list()
+        if callable(tags):
+            return tags(*args, **kwargs)
+        return tags
+
+    @staticmethod
+    def _discard_unretrieved_exception(computation: asyncio.Future) -> None:
+        # ** info: marks the exception as retrieved so asyncio doesn't warn when no other coroutine awaited the computation
+        if computation.cancelled() is False:
+            computation.exception()
+
+    async def _search_payload(
+        self: Self,
+        key: str,
+        memory_cache: Union[None, MemoryCache],
+        stale_after: Union[None, int],
+        call_tags: Callable[[], List[str]],
+        statistics: FunctionCacheStatistics,
+    ) -> Tuple[Union[None, bytes], bool]:
+        if memory_cache is not None:
+            memory_cached_value: Union[None, bytes] = memory_cache.get(key=key)
+            if memory_cached_value is not None:
+                logging.debug("returning requested value from in process cache")
+                statistics.l1_hits += 1
+                return memory_cached_value, False
+
+        cached_value: Union[None, bytes]
+        is_stale: bool = False
+
+        redis_start: float = time.perf_counter()
+
+        if stale_after is None:
+            cached_value = await self._connection_manager.get_raw(key=key)
+        else:
+            cached_value, remaining_time = await self._connection_manager.get_raw_with_ttl(key=key)
+            is_stale = remaining_time < stale_after * 1000
+
+        statistics.redis_latency.observe(value=(time.perf_counter() - redis_start) * 1000)
+
+        if cached_value is None:
+            statistics.misses += 1
+            return None, False
+
+        logging.debug("returning requested value from redis cache")
+
+        if is_stale is True:
+            statistics.stale_hits += 1
+
+        # ** info: the stale values are kept out of the in process cache so the refreshed value is seen as soon as it is stored
+        else:
+            statistics.l2_hits += 1
+            if memory_cache is not None:
+                memory_cache.set(key=key, value=cached_value)
+                self._register_memory_cache(memory_cache=memory_cache, tags=call_tags())
+
+        return cached_value, is_stale
+
+    def _schedule_refresh(
+        self: Self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[Any, bytes]]],
+        refreshing: Set[str],
+        lock_timeout: int,
+        statistics: FunctionCacheStatistics,
+    ) -> None:
+        if key in refreshing:
+            return
+
+        logging.info("returning stale value while it is refreshed in background")
+
+        refreshing.add(key)
+        refresh_task: asyncio.Task = asyncio.create_task(
+            self._refresh_value(key=key, compute=compute, lock_timeout=lock_timeout, statistics=statistics)
+        )
+        self._refresh_tasks.add(refresh_task)
+        refresh_task.add_done_callback(self._refresh_tasks.discard)
+        refresh_task.add_done_callback(lambda _: refreshing.discard(key))
+
+    async def _refresh_value(
+        self: Self, key: str, compute: Callable[[], Awaitable[Tuple[Any, bytes]]], lock_timeout: int, statistics: FunctionCacheStatistics
+    ) -> None:
+        token: str = uuid_provider.get_str_uuid()
+
+        try:
+            # ** info: the lock makes a single node refresh the value, the others keep returning the stale one
+            if await self._connection_manager.acquire_lock(key=key, token=token, time=lock_timeout) is False:
+                return
+
+            try:
+                await compute()
+                statistics.refreshes += 1
+            finally:
+                await self._connection_manager.release_lock(key=key, token=token)
+
+        # ! warning: super general exception handling here, a failed refresh must never reach the event loop
+        except Exception as exception:
+            statistics.errors += 1
+            logging.exception(f"unable to refresh the stale cached value: {exception}")
+
+    async def _store_payload(
+        self: Self,
+        key: str,
+        payload: bytes,
+        ttl: int,
+        memory_cache: Union[None, MemoryCache],
+        tags: List[str],
+        tag_versions: Union[None, List[str]],
+        statistics: FunctionCacheStatistics,
+    ) -> None:
+        # ** info: the cache database went down after the search, the computed value is returned without storing it
+        if tag_versions is None:
+            return
+
+        redis_start: float = time.perf_counter()
+
+        try:
+            if len(tags) == 0:
+                await self._connection_manager.set_raw_with_ttl(key=key, payload=payload, time=ttl)
+
+            elif (
+                await self._connection_manager.set_raw_with_ttl_and_tags(key=key, payload=payload, time=ttl, tags=tags, tag_versions=tag_versions)
+                is False
+            ):
+                logging.info("discarding computed value since its tags were invalidated during the computation")
+                return
+
+        # ** info: the computed value is still returned when it can't be stored
+        except HTTPException:
+            logging.warning("cache database unavailable, the computed value isn't cached")
+            statistics.errors += 1
+            return
+
+        finally:
+            statistics.redis_latency.observe(value=(time.perf_counter() - redis_start) * 1000)
+
+        if memory_cache is not None:
+            memory_cache.set(key=key, value=payload)
+            self._register_memory_cache(memory_cache=memory_cache, tags=tags)
+
+    def _register_static_tags(self: Self, memory_cache: Union[None, MemoryCache], tags: Union[None, List[str], Callable[..., List[str]]]) -> None:
+        # ** info: the static tags are known upfront, so the in process cache is cleared by their invalidations however it was filled
+        if memory_cache is not None and tags is not None and callable(tags) is False:
+            self._register_memory_cache(memory_cache=memory_cache, tags=tags)
+
+    def _register_memory_cache(self: Self, memory_cache: MemoryCache, tags: List[str]) -> None:
+        # ** info: the registrations are kept after the invalidations, the in process cache can be filled again from redis at any time
+        for tag in tags:
+            self._tagged_memory_caches.setdefault(tag, set()).add(memory_cache)
+
+    def get_statistics(self: Self) -> Dict[str, Any]:
+        return {
+            "functions": {function_name: statistics.to_dict() for function_name, statistics in sorted(self._statistics.items())},
+            "codec": cache_codec.get_statistics(),
+        }
+
+    async def invalidate_tags(self: Self, tags: List[str]) -> None:
+        """invalidate tags
+        this function evicts the cached values tagged with any of the given tags from redis and from
+        the in process caches of this worker, the in process caches of other workers keep their
+        values until their own in process time to live expires
+        args:
+        - tags (list[str]): the tags to invalidate
+        """
+
+        for tag in tags:
+            try:
+                await self._connection_manager.invalidate_tag(tag=tag)
+            except HTTPException:
+                logging.error(f"unable to invalidate the cache tag {tag}, its values expire with their time to live")
+
+            for memory_cache in self._tagged_memory_caches.get(tag, set()):
+                memory_cache.clear()
+
+        logging.info(f"cache tags invalidated: {', '.join(tags)}")
+
 
 cache_provider: CacheProvider = CacheProvider(cache_connection_manager=connection_manager)
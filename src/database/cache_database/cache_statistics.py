@@ -0,0 +1,54 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: typing imports
+from typing import Tuple
+from typing import Self
+from typing import Dict
+from typing import Any
+
+# ** info: artifacts imports
+from src.artifacts.metrics.histogram import Histogram
+
+__all__: list[str] = ["FunctionCacheStatistics"]
+
+REDIS_LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 1000.0)
+COMPUTE_LATENCY_BUCKETS_MS: Tuple[float, ...] = (1.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 5000.0)
+VALUE_SIZE_BUCKETS_BYTES: Tuple[float, ...] = (256.0, 1024.0, 4096.0, 16384.0, 65536.0, 262144.0, 1048576.0)
+
+
+class FunctionCacheStatistics:
+
+    """function cache statistics
+    this class keeps the cache counters and distributions of a single cached function
+    """
+
+    def __init__(self: Self):
+        self.l1_hits: int = 0
+        self.l2_hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self.errors: int = 0
+        self.bypasses: int = 0
+        self.refreshes: int = 0
+
+        self.redis_latency: Histogram = Histogram(bounds=REDIS_LATENCY_BUCKETS_MS)
+        self.compute_latency: Histogram = Histogram(bounds=COMPUTE_LATENCY_BUCKETS_MS)
+        self.value_size: Histogram = Histogram(bounds=VALUE_SIZE_BUCKETS_BYTES)
+
+    def to_dict(self: Self) -> Dict[str, Any]:
+        requests: int = self.l1_hits + self.l2_hits + self.stale_hits + self.misses + self.bypasses
+
+        return {
+            "l1Hits": self.l1_hits,
+            "l2Hits": self.l2_hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "bypasses": self.bypasses,
+            "refreshes": self.refreshes,
+            "hitRatio": (self.l1_hits + self.l2_hits + self.stale_hits) / requests if requests > 0 else 0.0,
+            "redisLatencyMs": self.redis_latency.to_dict(),
+            "computeLatencyMs": self.compute_latency.to_dict(),
+            "valueSizeBytes": self.value_size.to_dict(),
+        }
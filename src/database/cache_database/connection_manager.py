@@ -3,14 +3,19 @@
 
 # ** info: python imports
 from datetime import timedelta
+import hashlib
+import asyncio
 import logging
-import pickle
 import gc
 
 # ** info: typing imports
+from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
+from typing import List
 from typing import Union
 from typing import Self
+from typing import Dict
 from typing import Any
 
 # ** info: fastapi imports
@@ -22,6 +27,11 @@ from redis.asyncio import Redis as AsyncRedis
 
 # **info: redis exceptions imports
 from redis.exceptions import ConnectionError as AsyncConnectionError
+from redis.exceptions import TimeoutError as AsyncTimeoutError
+from redis.exceptions import NoScriptError
+
+# ** info: cache codec imports
+from src.database.cache_database.cache_codec import cache_codec
 
 # ** info: artifacts imports
 from src.artifacts.datetime.datetime_provider import datetime_provider
@@ -32,6 +42,63 @@ from src.artifacts.env.configs import configs
 __all__: list[str] = ["connection_manager"]
 
 
+class LuaScript(NamedTuple):
+    name: str
+    source: str
+    sha: str
+
+
+def _build_lua_script(name: str, source: str) -> LuaScript:
+    # ** info: the scripts are called by their sha, so the hot path doesn't send their source on every call
+    return LuaScript(name=name, source=source, sha=hashlib.sha1(source.encode()).hexdigest())
+
+
+# ** info: deletes the key only if it still holds the given value, so a lock is only released by its owner
+DELETE_IF_EQUAL_SCRIPT: LuaScript = _build_lua_script(
+    name="delete_if_equal", source="if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+# ** info: reads a value together with its remaining time to live in milliseconds in a single round trip, a missing value is
+# ** info: returned as false because redis cuts the lua arrays off at their first nil, which would also drop the time to live
+GET_WITH_TTL_SCRIPT: LuaScript = _build_lua_script(
+    name="get_with_ttl", source="return {redis.call('get', KEYS[1]) or false, redis.call('pttl', KEYS[1])}"
+)
+
+# ** info: stores the value only if none of its tags was invalidated since the given versions were read, adding the key to the tags sets
+STORE_TAGGED_SCRIPT: LuaScript = _build_lua_script(
+    name="store_tagged",
+    source="""
+local tags = (#KEYS - 1) / 2
+for index = 1, tags do
+    if (redis.call('get', KEYS[1 + tags + index]) or '0') ~= ARGV[2 + index] then return 0 end
+end
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for index = 1, tags do
+    redis.call('sadd', KEYS[1 + index], KEYS[1])
+    if redis.call('ttl', KEYS[1 + index]) < tonumber(ARGV[2]) then redis.call('expire', KEYS[1 + index], ARGV[2]) end
+end
+return 1
+""",
+)
+
+# ** info: deletes every key of the tag set and bumps the tag version so the values computed before the invalidation are never stored
+INVALIDATE_TAG_SCRIPT: LuaScript = _build_lua_script(
+    name="invalidate_tag",
+    source="""
+local keys = redis.call('smembers', KEYS[1])
+for index = 1, #keys, 500 do
+    redis.call('del', unpack(keys, index, math.min(index + 499, #keys)))
+end
+redis.call('del', KEYS[1])
+return redis.call('incr', KEYS[2])
+""",
+)
+
+LUA_SCRIPTS: Dict[str, LuaScript] = {
+    script.sha: script for script in (DELETE_IF_EQUAL_SCRIPT, GET_WITH_TTL_SCRIPT, STORE_TAGGED_SCRIPT, INVALIDATE_TAG_SCRIPT)
+}
+
+
 class AsyncDownloadConnection(AsyncRedis):
     def __init__(self: Self, password: str, host: str, port: int, database: str, logs: bool):
         self._connection_creation: str = datetime_provider.get_utc_iso_string()
@@ -111,18 +178,37 @@ class DownloadConnection(metaclass=Singleton):
                     f"using cache download connection {self._connection._connection_id} since {self._connection._connection_creation}"  # noqa: E501
                 )
             return True
-        except AsyncConnectionError:
+        except (AsyncConnectionError, AsyncTimeoutError):
             if self._logs:
                 logging.exception(f"cache download connection {self._connection._connection_id} isn't healthy")
                 logging.warning("creating a new cache download connection")
             await self._reset_connection()
             return False
 
-    async def _get(self: Self, key: str) -> Union[None, Any]:
+    async def _run_command(self: Self, command: str, *args: Any, **kwargs: Any) -> Any:
+        # ** info: the commands run without a previous ping, a broken connection is detected and replaced on the error path
         self._start_connection()
-        if await self._check_connection_health() is False:
+        try:
+            return await getattr(self._connection, command)(*args, **kwargs)
+        except (AsyncConnectionError, AsyncTimeoutError):
+            if self._logs:
+                logging.exception(f"cache download connection {self._connection._connection_id} failed running {command}")
+                logging.warning("creating a new cache download connection")
+            await self._reset_connection()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        return await self._connection.get(name=key)
+
+    async def _get(self: Self, key: str) -> Union[None, Any]:
+        return await self._run_command("get", name=key)
+
+    async def _get_many(self: Self, keys: List[str]) -> List[Union[None, Any]]:
+        return await self._run_command("mget", keys)
+
+    async def _eval(self: Self, script: LuaScript, keys: List[str], values: List[Any]) -> Any:
+        try:
+            return await self._run_command("evalsha", script.sha, len(keys), *keys, *values)
+        # ** info: the script isn't cached on the server yet, the eval runs it and caches it for the next calls
+        except NoScriptError:
+            return await self._run_command("eval", script.source, len(keys), *keys, *values)
 
 
 class UploadConnection(metaclass=Singleton):
@@ -166,25 +252,42 @@ class UploadConnection(metaclass=Singleton):
                     f"using cache upload connection {self._connection._connection_id} since {self._connection._connection_creation}"  # noqa: E501
                 )
             return True
-        except AsyncConnectionError:
+        except (AsyncConnectionError, AsyncTimeoutError):
             if self._logs:
                 logging.exception(f"cache upload connection {self._connection._connection_id} isn't healthy")
                 logging.warning("creating a new cache upload connection")
             await self._reset_connection()
             return False
 
-    async def _expire(self: Self, key: str, time: int) -> None:
+    async def _run_command(self: Self, command: str, *args: Any, **kwargs: Any) -> Any:
+        # ** info: the commands run without a previous ping, a broken connection is detected and replaced on the error path
         self._start_connection()
-        if await self._check_connection_health() is False:
+        try:
+            return await getattr(self._connection, command)(*args, **kwargs)
+        except (AsyncConnectionError, AsyncTimeoutError):
+            if self._logs:
+                logging.exception(f"cache upload connection {self._connection._connection_id} failed running {command}")
+                logging.warning("creating a new cache upload connection")
+            await self._reset_connection()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        await self._connection.expire(name=key, time=timedelta(seconds=time))
 
     async def _set_with_ttl(self: Self, key: str, value: Any, time: int) -> None:
-        self._start_connection()
-        if await self._check_connection_health() is False:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        await self._connection.set(name=key, value=value)
-        await self._expire(key=key, time=time)
+        # ** info: the value and its expiration are set atomically so the key never lives without a ttl
+        await self._run_command("set", name=key, value=value, ex=timedelta(seconds=time))
+
+    async def _set_if_absent_with_ttl(self: Self, key: str, value: Any, time: int) -> bool:
+        was_set: Union[None, bool] = await self._run_command("set", name=key, value=value, ex=timedelta(seconds=time), nx=True)
+        return was_set is True
+
+    async def _delete_if_equal(self: Self, key: str, value: Any) -> None:
+        await self._eval(script=DELETE_IF_EQUAL_SCRIPT, keys=[key], values=[value])
+
+    async def _eval(self: Self, script: LuaScript, keys: List[str], values: List[Any]) -> Any:
+        try:
+            return await self._run_command("evalsha", script.sha, len(keys), *keys, *values)
+        # ** info: the script isn't cached on the server yet, the eval runs it and caches it for the next calls
+        except NoScriptError:
+            return await self._run_command("eval", script.source, len(keys), *keys, *values)
 
 
 class ConnectionManager(metaclass=Singleton):
@@ -192,14 +295,75 @@ class ConnectionManager(metaclass=Singleton):
         self._download_connection: DownloadConnection = DownloadConnection(password=password, host=host, port=port, database=database, logs=logs)
         self._upload_connection: UploadConnection = UploadConnection(password=password, host=host, port=port, database=database, logs=logs)
 
+    async def check_health(self: Self) -> bool:
+        connections_health: Tuple[bool, bool] = await asyncio.gather(
+            self._download_connection._check_connection_health(),
+            self._upload_connection._check_connection_health(),
+        )
+
+        return all(connections_health)
+
+    def serialize(self: Self, value: Any) -> bytes:
+        return cache_codec.encode(value=value)
+
+    def deserialize(self: Self, payload: bytes) -> Any:
+        return cache_codec.decode(payload=payload)
+
+    async def get_raw(self: Self, key: str) -> Union[None, bytes]:
+        payload: Union[None, bytes] = await self._download_connection._get(key=key)
+        return self._discard_stale_codec_payload(payload=payload)
+
+    async def get_raw_with_ttl(self: Self, key: str) -> Tuple[Union[None, bytes], int]:
+        payload, remaining_time = await self._download_connection._eval(script=GET_WITH_TTL_SCRIPT, keys=[key], values=list())
+        # ** info: the lua false of a missing value reaches the client as a nil reply, the false check keeps both replies as a miss
+        payload = None if payload is None or payload is False else payload
+        return self._discard_stale_codec_payload(payload=payload), int(remaining_time)
+
+    def _discard_stale_codec_payload(self: Self, payload: Union[None, bytes]) -> Union[None, bytes]:
+        # ** info: the payloads written with another codec version or dtos layout are treated as misses
+        if payload is not None and cache_codec.is_current(payload=payload) is False:
+            logging.info("discarding cached value written with another cache codec version")
+            return None
+
+        return payload
+
+    async def set_raw_with_ttl(self: Self, key: str, payload: bytes, time: int = configs.cache_database_default_ttl) -> None:
+        await self._upload_connection._set_with_ttl(key=key, value=payload, time=time)
+
+    async def acquire_lock(self: Self, key: str, token: str, time: int) -> bool:
+        return await self._upload_connection._set_if_absent_with_ttl(key=f"lock:{key}", value=token, time=time)
+
+    async def release_lock(self: Self, key: str, token: str) -> None:
+        await self._upload_connection._delete_if_equal(key=f"lock:{key}", value=token)
+
+    async def is_locked(self: Self, key: str) -> bool:
+        return await self._download_connection._get(key=f"lock:{key}") is not None
+
+    async def get_tag_versions(self: Self, tags: List[str]) -> List[str]:
+        if len(tags) == 0:
+            return list()
+        tag_versions: List[Union[None, bytes]] = await self._download_connection._get_many(keys=[f"tag:{tag}:version" for tag in tags])
+        return [tag_version.decode() if tag_version is not None else "0" for tag_version in tag_versions]
+
+    async def set_raw_with_ttl_and_tags(self: Self, key: str, payload: bytes, time: int, tags: List[str], tag_versions: List[str]) -> bool:
+        was_stored: int = await self._upload_connection._eval(
+            script=STORE_TAGGED_SCRIPT,
+            keys=[key, *[f"tag:{tag}:keys" for tag in tags], *[f"tag:{tag}:version" for tag in tags]],
+            values=[payload, time, *tag_versions],
+        )
+        return was_stored == 1
+
+    async def invalidate_tag(self: Self, tag: str) -> None:
+        await self._upload_connection._eval(script=INVALIDATE_TAG_SCRIPT, keys=[f"tag:{tag}:keys", f"tag:{tag}:version"], values=list())
+
     async def get(self: Self, key: str) -> Union[None, Any]:
-        cache_response: Union[bytes, Any] = await self._download_connection._get(key=key)
+        cache_response: Union[None, bytes] = await self.get_raw(key=key)
         if cache_response is not None:
-            return pickle.loads(cache_response)
+            return self.deserialize(payload=cache_response)
         return None
 
-    async def set_with_ttl(self, key: str, value: Any, time: int = configs.cache_database_default_ttl) -> None:
-        await self._upload_connection._set_with_ttl(key=key, value=pickle.dumps(value), time=time)
+    async def set_with_ttl(self: Self, key: str, value: Any, time: int = configs.cache_database_default_ttl) -> None:
+        await self.set_raw_with_ttl(key=key, payload=self.serialize(value=value), time=time)
 
 
 connection_manager: ConnectionManager = ConnectionManager(
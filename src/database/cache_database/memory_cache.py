@@ -0,0 +1,60 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+from collections import OrderedDict
+import time
+
+# ** info: typing imports
+from typing import Tuple
+from typing import Union
+from typing import Self
+
+__all__: list[str] = ["MemoryCache"]
+
+
+class MemoryCache:
+
+    """memory cache
+    a size and ttl bounded in process cache with lru eviction, it works as the first cache tier in
+    front of redis so the hottest keys are served without any network round trip
+    """
+
+    def __init__(self: Self, max_entries: int, ttl: int):
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._max_entries: int = max_entries
+        self._ttl: int = ttl
+
+    def get(self: Self, key: str) -> Union[None, bytes]:
+        entry: Union[None, Tuple[float, bytes]] = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expiration, value = entry
+
+        if expiration <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def set(self: Self, key: str, value: bytes, ttl: Union[int, None] = None) -> None:
+        entry_ttl: int = self._ttl if ttl is None else min(ttl, self._ttl)
+
+        self._entries[key] = (time.monotonic() + entry_ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self: Self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self: Self) -> None:
+        self._entries.clear()
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
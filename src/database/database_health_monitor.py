@@ -0,0 +1,151 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import asyncio
+import logging
+import time
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Union
+from typing import Self
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Any
+
+# ** info: databases connection managers imports
+from src.database.cache_database.connection_manager import connection_manager as cache_connection_manager
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ** info: artifacts imports
+from src.artifacts.datetime.datetime_provider import datetime_provider
+from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["database_health_monitor"]
+
+
+class DatabaseHealthState:
+
+    """database health state
+    this class keeps the last known health of a single database together with its probe history
+    """
+
+    def __init__(self: Self):
+        self.is_healthy: Union[None, bool] = None
+        self.last_probe_latency_ms: Union[None, float] = None
+        self.last_probe_time: Union[None, str] = None
+        self.consecutive_failures: int = 0
+        self.probes: int = 0
+        self.flaps: int = 0
+
+    def update(self: Self, is_healthy: bool, latency_ms: float) -> bool:
+        has_flapped: bool = self.is_healthy is not None and self.is_healthy is not is_healthy
+
+        self.flaps += 1 if has_flapped else 0
+        self.consecutive_failures = 0 if is_healthy else self.consecutive_failures + 1
+        self.last_probe_time = datetime_provider.get_utc_iso_string()
+        self.last_probe_latency_ms = latency_ms
+        self.is_healthy = is_healthy
+        self.probes += 1
+
+        return has_flapped
+
+    def to_dict(self: Self) -> Dict[str, Any]:
+        return {
+            "healthy": self.is_healthy,
+            "lastProbeLatencyMs": self.last_probe_latency_ms,
+            "lastProbeTime": self.last_probe_time,
+            "consecutiveFailures": self.consecutive_failures,
+            "probes": self.probes,
+            "flaps": self.flaps,
+        }
+
+
+class DatabaseHealthMonitor(metaclass=Singleton):
+
+    """database health monitor
+    this class probes the databases on a background task and keeps their last known health in
+    memory, so the requests only read a flag instead of probing the databases themselves
+    """
+
+    def __init__(self: Self, probes: Dict[str, Callable[[], Awaitable[bool]]], interval: int, timeout: int):
+        self._probes: Dict[str, Callable[[], Awaitable[bool]]] = probes
+        self._interval: int = interval
+        self._timeout: int = timeout
+
+        self._states: Dict[str, DatabaseHealthState] = {database: DatabaseHealthState() for database in probes}
+        self._monitor: Union[None, asyncio.Task] = None
+
+    @property
+    def is_healthy(self: Self) -> bool:
+        # ** info: the databases that weren't probed yet are considered healthy, so a request is only rejected on a known bad state
+        return all(state.is_healthy is not False for state in self._states.values())
+
+    def get_unhealthy_databases(self: Self, databases: Union[None, Set[str]] = None) -> List[str]:
+        """get unhealthy databases
+        this function returns the databases known to be unhealthy
+        args:
+        - databases (set[str]): the databases to check, all the monitored ones if none
+        returns:
+        - List[str]: the names of the unhealthy databases
+        """
+
+        return [database for database, state in self._states.items() if state.is_healthy is False and (databases is None or database in databases)]
+
+    async def start(self: Self) -> None:
+        if self._monitor is None:
+            await self.probe_databases()
+            self._monitor = asyncio.create_task(self._monitor_databases())
+
+    async def stop(self: Self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+
+    async def probe_databases(self: Self) -> bool:
+        await asyncio.gather(*[self._probe_database(database=database, probe=probe) for database, probe in self._probes.items()])
+        return self.is_healthy
+
+    def get_statistics(self: Self) -> Dict[str, Any]:
+        return {
+            "healthy": self.is_healthy,
+            "databases": {database: state.to_dict() for database, state in self._states.items()},
+        }
+
+    async def _probe_database(self: Self, database: str, probe: Callable[[], Awaitable[bool]]) -> None:
+        probe_start: float = time.perf_counter()
+
+        try:
+            is_healthy: bool = await asyncio.wait_for(probe(), timeout=self._timeout)
+
+        # ! warning: super general exception handling here, a probe that fails or times out means the database isn't healthy
+        except Exception as exception:
+            logging.warning(f"{database} health probe failed: {exception!r}")
+            is_healthy = False
+
+        latency_ms: float = (time.perf_counter() - probe_start) * 1000
+
+        if self._states[database].update(is_healthy=is_healthy, latency_ms=latency_ms) is True:
+            logging.warning(f"{database} is now {'healthy' if is_healthy else 'unhealthy'}")
+
+    async def _monitor_databases(self: Self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.probe_databases()
+
+
+database_health_monitor: DatabaseHealthMonitor = DatabaseHealthMonitor(
+    probes={
+        "cacheDatabase": cache_connection_manager.check_health,
+        "usersDatabase": users_provider.connection_manager.check_health,
+        "tvDatabase": tv_programattion_provider.connection_manager.check_health,
+    },
+    interval=configs.app_database_health_check_interval,
+    timeout=configs.app_database_health_check_timeout,
+)
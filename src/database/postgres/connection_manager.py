@@ -2,29 +2,43 @@
 # type: ignore
 
 # ** info: python imports
+from contextlib import asynccontextmanager
 import logging
+import time
+import sys
 import gc
 
 # ** info: typing imports
+from typing import AsyncContextManager
+from typing import AsyncIterator
 from typing import Union
 from typing import Self
+from typing import Dict
+from typing import Any
 
 # ** info: fastapi imports
 from fastapi import HTTPException
 from fastapi import status
 
-# **info: sqlalchemy engine imports
-from sqlalchemy.engine import Engine
-
 # **info: sqlalchemy imports
-from sqlalchemy import create_engine
 from sqlalchemy import text
 
-# **info: sqlalchemy orm imports
-from sqlalchemy.orm import Session
+# **info: sqlalchemy asyncio imports
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 # **info: sqlalchemy exc imports
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# **info: sqlalchemy pool imports
+from sqlalchemy.pool import QueuePool
+
+# ** info: query instrumentation imports
+from src.database.postgres.query_instrumentation import QueryInstrumentation
+from src.database.postgres.query_instrumentation import QUERY_ORIGIN_KEY
 
 # ** info: artifacts imports
 from src.artifacts.datetime.datetime_provider import datetime_provider
@@ -33,7 +47,7 @@ from src.artifacts.uuid.uuid_provider import uuid_provider
 __all__: list[str] = ["CrudManagedSession"]
 
 
-class QuerySession(Session):
+class QuerySession(AsyncSession):
     def __init__(self: Self, logs: bool, *args, **kwargs):
         self.session_creation: str = datetime_provider.get_utc_iso_string()
         self.session_id: str = uuid_provider.get_str_uuid()
@@ -47,24 +61,24 @@ class QuerySession(Session):
         if self._logs:
             logging.info(f"query session started with id: {self.session_id}")
 
-    def commit_and_close(self: Self) -> None:
+    async def commit_and_close(self: Self) -> None:
         if self._logs:
             logging.info(f"committing and closing query session with id: {self.session_id}")
-        super().commit()
-        super().close()
+        await super().commit()
+        await super().close()
 
-    def commit(self: Self) -> None:
+    async def commit(self: Self) -> None:
         if self._logs:
             logging.info(f"committing query session with id: {self.session_id}")
-        super().commit()
+        await super().commit()
 
-    def close(self: Self) -> None:
+    async def close(self: Self) -> None:
         if self._logs:
             logging.info(f"closing query session with id: {self.session_id}")
-        super().close()
+        await super().close()
 
 
-class CrudSession(Session):
+class CrudSession(AsyncSession):
     def __init__(self: Self, logs: bool, *args, **kwargs):
         self.session_creation: str = datetime_provider.get_utc_iso_string()
         self.session_id: str = uuid_provider.get_str_uuid()
@@ -78,25 +92,44 @@ class CrudSession(Session):
         if self._logs:
             logging.info(f"crud session started with id: {self.session_id}")
 
-    def commit_and_close(self: Self) -> None:
+    async def commit_and_close(self: Self) -> None:
         if self._logs:
             logging.info(f"committing and closing crud session with id: {self.session_id}")
-        super().commit()
-        super().close()
+        await super().commit()
+        await super().close()
 
-    def commit(self: Self) -> None:
+    async def commit(self: Self) -> None:
         if self._logs:
             logging.info(f"committing crud session with id: {self.session_id}")
-        super().commit()
+        await super().commit()
 
-    def close(self: Self) -> None:
+    async def rollback(self: Self) -> None:
+        if self._logs:
+            logging.warning(f"rolling back crud session with id: {self.session_id}")
+        await super().rollback()
+
+    async def close(self: Self) -> None:
         if self._logs:
             logging.info(f"closing crud session with id: {self.session_id}")
-        super().close()
+        await super().close()
 
 
 class ConnectionManager:
-    def __init__(self, user: str, password: str, host: str, port: int, database: str, logs: bool):
+    def __init__(
+        self: Self,
+        user: str,
+        password: str,
+        host: str,
+        port: int,
+        database: str,
+        logs: bool,
+        pool_size: int,
+        pool_max_overflow: int,
+        pool_recycle: int,
+        pool_pre_ping: bool,
+        pool_timeout: int,
+        slow_query_threshold_ms: int,
+    ):
         self._database: str = database
         self._password: str = password
         self._logs: bool = logs
@@ -104,75 +137,171 @@ class ConnectionManager:
         self._host: str = host
         self._port: int = port
 
-        self._query_session: Union[QuerySession, None] = None
-        self._engine: Union[Engine, None] = None
+        self._pool_max_overflow: int = pool_max_overflow
+        self._pool_pre_ping: bool = pool_pre_ping
+        self._pool_recycle: int = pool_recycle
+        self._pool_timeout: int = pool_timeout
+        self._pool_size: int = pool_size
+
+        self._query_session_factory: Union[async_sessionmaker[QuerySession], None] = None
+        self._crud_session_factory: Union[async_sessionmaker[CrudSession], None] = None
+        self._async_engine: Union[AsyncEngine, None] = None
+
+        self._query_instrumentation: QueryInstrumentation = QueryInstrumentation(database=database, slow_query_threshold_ms=slow_query_threshold_ms)
+
+        # ** info: pool acquisition counters, the pool itself only knows about checked in and checked out connections
+        self._acquisitions_wait_time: float = 0.0
+        self._acquisitions_max_wait_time: float = 0.0
+        self._acquisitions_timeouts: int = 0
+        self._acquisitions: int = 0
+        self._waiters: int = 0
+
+    def _start_async_engine(self: Self) -> None:
+        # ** info: psycopg 3 keeps sending python strings as untyped literals so dates and times stored as iso strings still bind
+        if self._async_engine is None:
+            self.use_async_engine(
+                async_engine=create_async_engine(
+                    f"postgresql+psycopg://{self._user}:{self._password}@{self._host}:{self._port}/{self._database}",
+                    max_overflow=self._pool_max_overflow,
+                    pool_pre_ping=self._pool_pre_ping,
+                    pool_recycle=self._pool_recycle,
+                    pool_timeout=self._pool_timeout,
+                    pool_size=self._pool_size,
+                )
+            )
+            if self._logs:
+                logging.info(f"database engine started with a pool of {self._pool_size} connections and {self._pool_max_overflow} overflow")
+
+    def use_async_engine(self: Self, async_engine: AsyncEngine) -> None:
+        """use async engine
+        this function binds the connection manager to an already created engine, the engine of the
+        app is created on the first session but the benchmarks bind a local stand in database here
+        args:
+        - async_engine (AsyncEngine): the engine the sessions connect through
+        """
+
+        self._async_engine = async_engine
+        self._query_instrumentation.attach(engine=self._async_engine.sync_engine)
+        self._query_session_factory = async_sessionmaker(class_=QuerySession, logs=self._logs)
+        self._crud_session_factory = async_sessionmaker(class_=CrudSession, logs=self._logs, expire_on_commit=False)
+
+    async def _end_async_engine(self: Self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            del self._async_engine
+            gc.collect()
+            self._async_engine = None
+            self._query_session_factory = None
+            self._crud_session_factory = None
+
+    def _is_pool_exhausted(self: Self) -> bool:
+        # ** info: the stand in engines use pools without a size, their acquisitions never wait
+        if not isinstance(self._async_engine.pool, QueuePool):
+            return False
 
-    def _start_engine(self: Self) -> None:
-        if self._engine is None:
-            self._engine = create_engine(f"postgresql://{self._user}:{self._password}@{self._host}:{self._port}/{self._database}")
+        return self._async_engine.pool.checkedout() >= self._pool_size + self._pool_max_overflow
 
-    def _end_engine(self: Self) -> None:
-        if self._query_session is not None:
-            self._end_query_session()
-        if self._engine is not None:
-            self._engine.dispose()
-            del self._engine
-            gc.collect()
-            self._engine = None
+    @asynccontextmanager
+    async def _acquire_connection(self: Self, origin: str) -> AsyncIterator[AsyncConnection]:
+        self._start_async_engine()
 
-    def _start_query_session(self: Self) -> None:
-        if self._query_session is None:
-            self._query_session = QuerySession(logs=self._logs, bind=self._engine)
+        # ** info: only the acquisitions that find every pool and overflow connection checked out wait for one
+        is_waiting: bool = self._is_pool_exhausted()
+        if is_waiting is True:
+            self._waiters += 1
+        wait_start: float = time.perf_counter()
 
-    def _end_query_session(self: Self) -> None:
-        if self._query_session is not None:
-            self._query_session.close()
-            del self._query_session
-            gc.collect()
-            self._query_session = None
+        try:
+            connection: AsyncConnection = await self._async_engine.connect()
+
+        except PoolTimeoutError:
+            self._acquisitions_timeouts += 1
+            logging.error(f"unable to acquire a database connection after waiting {self._pool_timeout} seconds")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        finally:
+            wait_time: float = time.perf_counter() - wait_start
+            if is_waiting is True:
+                self._waiters -= 1
+            self._acquisitions += 1
+            self._acquisitions_wait_time += wait_time
+            self._acquisitions_max_wait_time = max(self._acquisitions_max_wait_time, wait_time)
 
-    def _reset_query_session(self: Self) -> None:
-        self._end_query_session()
-        self._start_query_session()
+        # ** info: the origin is read by the query instrumentation events, the connection info lives as long as the pooled connection
+        connection.info[QUERY_ORIGIN_KEY] = origin
 
-    def _check_query_session_health(self: Self) -> bool:
-        self._start_engine()
-        self._start_query_session()
         try:
-            self._query_session.execute(text("select 1"))
+            yield connection
+        finally:
+            await connection.close()
+
+    @asynccontextmanager
+    async def get_query_session(self: Self, origin: str) -> AsyncIterator[QuerySession]:
+        async with self._acquire_connection(origin=origin) as connection:
+            query_session: QuerySession = self._query_session_factory(bind=connection)
             if self._logs:
-                logging.debug(f"query session {self._query_session.session_id} is healthy")
-            return True
-
-        except SQLAlchemyError:
+                logging.info(f"using query session with id: {query_session.session_id}")
+            try:
+                yield query_session
+            finally:
+                await query_session.close()
+
+    @asynccontextmanager
+    async def get_crud_session(self: Self, origin: str) -> AsyncIterator[CrudSession]:
+        async with self._acquire_connection(origin=origin) as connection:
+            crud_session: CrudSession = self._crud_session_factory(bind=connection)
             if self._logs:
-                logging.exception(f"query session {self._query_session.session_id} isn't healthy")
-                logging.warning("creating a new query session")
-            self._reset_query_session()
-            return False
-
-    def get_crud_session(self: Self) -> CrudSession:
-        self._start_engine()
-        crud_session: CrudSession = CrudSession(logs=self._logs, bind=self._engine)
-        if self._logs:
-            logging.info(f"crud session started with id: {crud_session.session_id}")
-            logging.info(f"using crud session with id: {crud_session.session_id}")
-            logging.info(f"session healthy since: {crud_session.session_creation}")
-        return crud_session
-
-    def get_query_session(self: Self) -> QuerySession:
-        self._start_engine()
-        self._start_query_session()
-        if self._check_query_session_health() is False:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        if self._logs:
-            logging.info(f"using query session with id: {self._query_session.session_id}")
-            logging.info(f"session healthy since: {self._query_session.session_creation}")
-        return self._query_session
+                logging.info(f"using crud session with id: {crud_session.session_id}")
+            try:
+                yield crud_session
+                await crud_session.commit()
+            except Exception:
+                await crud_session.rollback()
+                raise
+            finally:
+                await crud_session.close()
+
+    def get_pool_statistics(self: Self) -> Dict[str, Any]:
+        pool_statistics: Dict[str, Any] = {
+            "poolSize": self._pool_size,
+            "maxOverflow": self._pool_max_overflow,
+            "checkedOut": 0,
+            "checkedIn": 0,
+            "overflow": 0,
+            "waiters": self._waiters,
+            "acquisitions": self._acquisitions,
+            "timeouts": self._acquisitions_timeouts,
+            "averageWaitMs": 0.0,
+            "maxWaitMs": self._acquisitions_max_wait_time * 1000,
+        }
+
+        if self._acquisitions > 0:
+            pool_statistics["averageWaitMs"] = self._acquisitions_wait_time / self._acquisitions * 1000
+
+        if self._async_engine is not None:
+            pool_statistics["checkedOut"] = self._async_engine.pool.checkedout()
+            pool_statistics["checkedIn"] = self._async_engine.pool.checkedin()
+            pool_statistics["overflow"] = max(self._async_engine.pool.overflow(), 0)
+
+        return pool_statistics
 
 
 class CrudManagedSession:
-    def __init__(self: Self, password: str, database: str, user: str, host: str, port: int, logs: bool):
+    def __init__(
+        self: Self,
+        password: str,
+        database: str,
+        user: str,
+        host: str,
+        port: int,
+        logs: bool,
+        pool_size: int,
+        pool_max_overflow: int,
+        pool_recycle: int,
+        pool_pre_ping: bool,
+        pool_timeout: int,
+        slow_query_threshold_ms: int,
+    ):
         self.connection_manager: ConnectionManager = ConnectionManager(
             password=password,
             database=database,
@@ -180,13 +309,42 @@ class CrudManagedSession:
             host=host,
             port=port,
             logs=logs,
+            pool_size=pool_size,
+            pool_max_overflow=pool_max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            pool_timeout=pool_timeout,
+            slow_query_threshold_ms=slow_query_threshold_ms,
         )
 
-        self.query_session: QuerySession = self.connection_manager.get_query_session()
-        self.crud_session: CrudSession = self.connection_manager.get_crud_session()
+    def query_session(self: Self) -> AsyncContextManager[QuerySession]:
+        """query session
+        this function hands a new pooled query session to each caller, the sessions aren't safe
+        to share between concurrent coroutines so each one is closed as soon as the caller ends,
+        the caller function is kept as the origin of the session statements
+        """
+
+        return self.connection_manager.get_query_session(origin=sys._getframe(1).f_code.co_qualname)
 
-    def __enter__(self: Self) -> CrudSession:
-        return self.crud_session
+    def crud_session(self: Self) -> AsyncContextManager[CrudSession]:
+        """crud session
+        this function hands a new pooled crud session to each caller, the session is committed
+        and closed when the caller ends or rolled back if the caller raises an exception, the caller
+        function is kept as the origin of the session statements
+        """
 
-    def __exit__(self: Self, exc_type, exc_val, exc_tb):
-        self.crud_session.commit_and_close()
+        return self.connection_manager.get_crud_session(origin=sys._getframe(1).f_code.co_qualname)
+
+    def get_pool_statistics(self: Self) -> Dict[str, Any]:
+        return self.connection_manager.get_pool_statistics()
+
+    async def check_health(self: Self) -> bool:
+        try:
+            async with self.query_session() as query_session:
+                await query_session.execute(statement=text("SELECT 1"))
+            return True
+
+        # ! warning: super general exception handling here, any failure running the probe means the database isn't healthy
+        except Exception as exception:
+            logging.warning(f"database health probe failed: {exception}")
+            return False
@@ -0,0 +1,129 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import argparse
+import asyncio
+import logging
+import sys
+
+# ** info: typing imports
+from typing import Tuple
+from typing import List
+from typing import Self
+from typing import Set
+
+# **info: sqlalchemy imports
+from sqlalchemy import inspect
+from sqlalchemy import Index
+from sqlalchemy import Table
+
+# **info: sqlalchemy asyncio imports
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# ** info: entities imports
+from src.entities.programmation_entity import TvProgramation
+from src.entities.users_entity import Users
+
+# ** info: providers imports
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ** info: postgres connection manager imports
+from src.database.postgres.connection_manager import CrudManagedSession
+
+# ** info: artifacts imports
+from src.artifacts.logging.custom_logger import custom_logger
+from src.artifacts.pattern.singleton import Singleton
+
+__all__: list[str] = ["indexes_checker"]
+
+
+class IndexesChecker(metaclass=Singleton):
+
+    """indexes checker
+    this class compares the indexes declared on the entities against the indexes that really exist
+    on each database, so the provider filter paths never silently fall back to sequential scans
+    """
+
+    def __init__(self: Self, checked_tables: List[Tuple[CrudManagedSession, Table]]):
+        self._checked_tables: List[Tuple[CrudManagedSession, Table]] = checked_tables
+
+    async def get_missing_indexes(self: Self, crud_managed_session: CrudManagedSession, table: Table) -> List[Index]:
+        async with crud_managed_session.query_session() as query_session:
+            connection: AsyncConnection = await query_session.connection()
+            existing_indexes: Set[str] = await connection.run_sync(
+                lambda sync_connection: {index["name"] for index in inspect(sync_connection).get_indexes(table.name)}
+            )
+
+        missing_indexes: List[Index] = [index for index in table.indexes if index.name not in existing_indexes]
+
+        return sorted(missing_indexes, key=lambda index: index.name)
+
+    async def create_missing_indexes(self: Self, crud_managed_session: CrudManagedSession, table: Table) -> List[Index]:
+        missing_indexes: List[Index] = await self.get_missing_indexes(crud_managed_session=crud_managed_session, table=table)
+
+        async with crud_managed_session.crud_session() as crud_session:
+            connection: AsyncConnection = await crud_session.connection()
+            for index in missing_indexes:
+                logging.info(f"creating index {index.name} on table {table.name}")
+                await connection.run_sync(index.create)
+
+        return missing_indexes
+
+    async def check_indexes(self: Self, create_missing: bool = False) -> bool:
+        """check indexes
+        this function reports every declared index that is missing on its database together with
+        the query shape that would run as a sequential scan, optionally creating the missing ones
+        args:
+        - create_missing (bool): create the missing indexes instead of only reporting them
+        returns:
+        - bool: true if all the declared indexes exist after the check
+        """
+
+        are_indexes_complete: bool = True
+
+        for crud_managed_session, table in self._checked_tables:
+            if create_missing is True:
+                await self.create_missing_indexes(crud_managed_session=crud_managed_session, table=table)
+
+            missing_indexes: List[Index] = await self.get_missing_indexes(crud_managed_session=crud_managed_session, table=table)
+
+            for index in missing_indexes:
+                are_indexes_complete = False
+                logging.warning(
+                    f"missing index {index.name} on table {table.name}, this query falls back to a sequential scan: {index.info['query_shape']}"
+                )
+
+        if are_indexes_complete is True:
+            logging.info("all the declared database indexes exist")
+
+        return are_indexes_complete
+
+    async def check_indexes_on_startup(self: Self) -> None:
+        try:
+            await self.check_indexes()
+
+        # ! warning: super general exception handling here, a failed check must never stop the app startup
+        except Exception as exception:
+            logging.exception(f"unable to check the database indexes: {exception!r}")
+
+
+indexes_checker: IndexesChecker = IndexesChecker(
+    checked_tables=[
+        (users_provider.connection_manager, Users.__table__),
+        (tv_programattion_provider.connection_manager, TvProgramation.__table__),
+    ]
+)
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="checks the database indexes declared on the entities")
+    argument_parser.add_argument("--create", action="store_true", help="create the missing indexes instead of only reporting them")
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    custom_logger.setup_pretty_logging()
+
+    are_indexes_complete: bool = asyncio.run(indexes_checker.check_indexes(create_missing=arguments.create))
+
+    sys.exit(0 if are_indexes_complete is True else 1)
@@ -0,0 +1,125 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import logging
+import hashlib
+import time
+
+# ** info: typing imports
+from typing import Union
+from typing import Tuple
+from typing import Self
+from typing import Dict
+from typing import List
+from typing import Any
+
+# **info: sqlalchemy imports
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine import Engine
+from sqlalchemy import event
+
+# ** info: artifacts imports
+from src.artifacts.metrics.metrics_registry import metrics_registry
+from src.artifacts.metrics.metrics_registry import MetricFamily
+
+__all__: list[str] = ["QueryInstrumentation", "QUERY_ORIGIN_KEY"]
+
+QUERY_ORIGIN_KEY: str = "query_origin"
+QUERY_START_ATTRIBUTE: str = "_query_instrumentation_start"
+
+STATEMENT_LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_ROWS_BUCKETS: Tuple[float, ...] = (0.0, 1.0, 10.0, 100.0, 1000.0, 10000.0, 100000.0)
+MAX_TRACKED_STATEMENTS: int = 256
+UNKNOWN_ORIGIN: str = "unknown"
+
+
+class QueryInstrumentation:
+
+    """query instrumentation
+    this class attaches to the sqlalchemy engine events, timing every statement and counting its rows,
+    the statements are aggregated per origin provider method and per statement text hash on the
+    metrics registry and the statements slower than the threshold are logged with redacted parameters
+    """
+
+    def __init__(self: Self, database: str, slow_query_threshold_ms: int):
+        self._database: str = database
+        self._slow_query_threshold: float = slow_query_threshold_ms / 1000
+        self._statements_hashes: Dict[str, str] = dict()
+
+        self._statements_latency: MetricFamily = metrics_registry.histogram(
+            name="db_statement_duration_seconds",
+            description="database statements latency in seconds",
+            label_names=("database", "origin", "statement"),
+            bounds=STATEMENT_LATENCY_BUCKETS_SECONDS,
+        )
+        self._statements_rows: MetricFamily = metrics_registry.histogram(
+            name="db_statement_rows",
+            description="rows returned or affected by the database statements",
+            label_names=("database", "origin", "statement"),
+            bounds=STATEMENT_ROWS_BUCKETS,
+        )
+        self._slow_statements: MetricFamily = metrics_registry.counter(
+            name="db_slow_statements_total",
+            description="database statements slower than the slow query threshold",
+            label_names=("database", "origin", "statement"),
+        )
+
+    def attach(self: Self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self: Self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        # ** info: the start is kept on the statement execution context, so a failed statement leaves nothing behind on the connection
+        setattr(context, QUERY_START_ATTRIBUTE, time.perf_counter())
+
+    def _after_cursor_execute(self: Self, conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        latency: float = time.perf_counter() - getattr(context, QUERY_START_ATTRIBUTE)
+        origin: str = conn.info.get(QUERY_ORIGIN_KEY, UNKNOWN_ORIGIN)
+        statement_hash: str = self._get_statement_hash(statement=statement)
+        rows: int = max(cursor.rowcount, 0)
+        labels: Tuple[str, str, str] = (self._database, origin, statement_hash)
+
+        self._statements_latency.observe(labels=labels, value=latency)
+        self._statements_rows.observe(labels=labels, value=rows)
+
+        if latency >= self._slow_query_threshold:
+            self._slow_statements.increment(labels=labels)
+            logging.warning(
+                f"slow statement {statement_hash} from {origin} on {self._database} took {latency * 1000:.2f} ms with {rows} rows: "
+                f"{' '.join(statement.split())} parameters: {redact_parameters(parameters=parameters)}"
+            )
+
+    def _get_statement_hash(self: Self, statement: str) -> str:
+        # ** info: each filters combination renders a different statement text, the hash keeps them apart without huge labels
+        statement_hash: Union[None, str] = self._statements_hashes.get(statement)
+
+        if statement_hash is None:
+            if len(self._statements_hashes) >= MAX_TRACKED_STATEMENTS:
+                return "other"
+
+            statement_hash = hashlib.sha1(statement.encode()).hexdigest()[:12]
+            self._statements_hashes[statement] = statement_hash
+
+        return statement_hash
+
+
+def redact_parameters(parameters: Any) -> Union[str, Dict[str, str], List[Any]]:
+    """redact parameters
+    this function replaces the statement parameters values by their types, so the slow statements
+    logs never leak the users data
+    args:
+    - parameters (any): the statement parameters, a mapping, a sequence or a batch of them
+    returns:
+    - Union[str, dict, list]: the redacted parameters
+    """
+
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 0 and isinstance(parameters[0], (dict, list, tuple)):
+            return [redact_parameters(parameters=parameters[0]), f"<{len(parameters)} parameters sets>"]
+        return [f"<{type(value).__name__}>" for value in parameters]
+
+    return f"<{type(parameters).__name__}>"
@@ -4,10 +4,12 @@
 # ** info: typing imports
 from typing import Union
 from typing import List
+from typing import Dict
 from typing import Self
 from typing import Any
 
 # **info: sqlalchemy imports
+from sqlalchemy import insert
 from sqlalchemy import select
 
 # ** info: users entity
@@ -35,9 +37,15 @@ class TvProgramattionProvider(metaclass=Singleton):
             host=configs.tv_database_host,
             port=configs.tv_database_port,
             logs=configs.tv_database_logs,
+            pool_size=configs.tv_database_pool_size,
+            pool_max_overflow=configs.tv_database_pool_max_overflow,
+            pool_recycle=configs.tv_database_pool_recycle,
+            pool_pre_ping=configs.tv_database_pool_pre_ping,
+            pool_timeout=configs.tv_database_pool_timeout,
+            slow_query_threshold_ms=configs.tv_database_slow_query_threshold_ms,
         )
 
-    def search_tv_programattion(
+    async def search_tv_programattion(
         self: Self,
         channel_id: Union[None, str],
         channel_name: Union[None, str],
@@ -79,21 +87,22 @@ class TvProgramattionProvider(metaclass=Singleton):
         if year is not None:
             query = query.where(TvProgramation.year == year)
 
-        query = query.order_by(TvProgramation.creation.desc())
-
-        results: List[TvProgrammationResponseDto] = self.connection_manager.query_session.execute(statement=query)
-
         if days is not None:
-            results = filter((lambda result: self._have_at_least_one_common_element(days, result.days)), results)
+            query = query.where(TvProgramation.days.overlap(days))
 
         if weeks is not None:
-            results = filter((lambda result: self._have_at_least_one_common_element(weeks, result.weeks)), results)
+            query = query.where(TvProgramation.weeks.overlap(weeks))
+
+        query = query.order_by(TvProgramation.creation.desc())
+
+        async with self.connection_manager.query_session() as query_session:
+            results: List[TvProgrammationResponseDto] = (await query_session.execute(statement=query)).all()
 
         search_tv_programmation_data = list(map(self._tv_programation_entity_to_tv_programation_public_dto, results))
 
         return search_tv_programmation_data
 
-    def add_tv_programattion(
+    async def add_tv_programattion(
         self: Self,
         programation_id: str,
         channel_id: int,
@@ -127,11 +136,29 @@ class TvProgramattionProvider(metaclass=Singleton):
             tv_programation=new_tv_programation
         )
 
-        with self.connection_manager as crud_session:
+        async with self.connection_manager.crud_session() as crud_session:
             crud_session.add(new_tv_programation)
 
         return new_tv_programmation_data
 
+    async def add_tv_programattions(self: Self, tv_programations: List[Dict[str, Any]]) -> int:
+        """add tv programattions
+        this function inserts all the received tv programations in a single transaction using
+        batched multi row inserts
+        args:
+        - tv_programations (list[dict[str, any]]): the tv programation rows keyed by the entity column names
+        returns:
+        - int: the number of inserted tv programations
+        """
+
+        if len(tv_programations) == 0:
+            return 0
+
+        async with self.connection_manager.crud_session() as crud_session:
+            await crud_session.execute(statement=insert(TvProgramation), params=tv_programations)
+
+        return len(tv_programations)
+
     def _tv_programation_entity_to_tv_programation_public_dto(self: Self, tv_programation: TvProgramation) -> TvProgrammationResponseDto:
         tv_programmation_dto: TvProgrammationResponseDto = TvProgrammationResponseDto()
 
@@ -146,11 +173,5 @@ class TvProgramattionProvider(metaclass=Singleton):
 
         return tv_programmation_dto
 
-    def _have_at_least_one_common_element(self: Self, array1: List[any], array2: List[any]) -> bool:
-        for element in array1:
-            if element in array2:
-                return True
-        return False
-
 
 tv_programattion_provider: TvProgramattionProvider = TvProgramattionProvider()
@@ -1,25 +1,36 @@
 # !/usr/bin/python3
 # type: ignore
 
+# ** info: python imports
+from datetime import datetime
+
 # ** info: typing imports
 from typing import Union
+from typing import Tuple
 from typing import List
+from typing import Dict
+from typing import Set
 from typing import Self
 from typing import Any
 
 # **info: sqlalchemy imports
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy import select
+from sqlalchemy import tuple_
 
 # ** info: users entity
 from src.entities.users_entity import Users
 
 # ** info: users dtos imports
+from src.dtos.users_dtos import UsersPageDto
+from src.dtos.users_dtos import PageInfoDto
 from src.dtos.users_dtos import UserDto
 
 # ** info: users database connection manager import
 from src.database.postgres.connection_manager import CrudManagedSession
 
 # ** info: artifacts imports
+from src.artifacts.pagination.cursor_provider import cursor_provider
 from src.artifacts.pattern.singleton import Singleton
 from src.artifacts.env.configs import configs
 
@@ -35,9 +46,15 @@ class UsersProvider(metaclass=Singleton):
             host=configs.database_host,
             port=configs.database_port,
             logs=configs.database_logs,
+            pool_size=configs.database_pool_size,
+            pool_max_overflow=configs.database_pool_max_overflow,
+            pool_recycle=configs.database_pool_recycle,
+            pool_pre_ping=configs.database_pool_pre_ping,
+            pool_timeout=configs.database_pool_timeout,
+            slow_query_threshold_ms=configs.database_slow_query_threshold_ms,
         )
 
-    def add_user(
+    async def add_user(
         self: Self,
         internal_id: str,
         estatal_id: int,
@@ -69,12 +86,39 @@ class UsersProvider(metaclass=Singleton):
 
         user_dto: UserDto = self._users_entity_to_users_public_dto(user=new_user)
 
-        with self.connection_manager as crud_session:
+        async with self.connection_manager.crud_session() as crud_session:
             crud_session.add(new_user)
 
         return user_dto
 
-    def fetch_users_data(
+    async def add_users(self: Self, users: List[Dict[str, Any]]) -> List[UserDto]:
+        """add users
+        this function inserts all the received users in a single transaction using batched multi
+        row inserts, the users whose estatal id already exists are skipped and left out of the
+        returned users
+        args:
+        - users (list[dict[str, any]]): the users rows keyed by the users entity column names
+        returns:
+        - list[UserDto]: the inserted users
+        """
+
+        if len(users) == 0:
+            return list()
+
+        query: Any = insert(Users).on_conflict_do_nothing(index_elements=[Users.estatal_id]).returning(Users.estatal_id)
+
+        async with self.connection_manager.crud_session() as crud_session:
+            results: List[Any] = (await crud_session.execute(statement=query, params=users)).all()
+
+        inserted_estatal_ids: Set[int] = {result.estatal_id for result in results}
+
+        inserted_users: List[UserDto] = [
+            self._users_entity_to_users_public_dto(user=Users(**user)) for user in users if user["estatal_id"] in inserted_estatal_ids
+        ]
+
+        return inserted_users
+
+    async def fetch_users_data(
         self: Self,
         limit: int,
         offset: int,
@@ -100,6 +144,120 @@ class UsersProvider(metaclass=Singleton):
             Users.birthday,
         )
 
+        query = self._filter_users_query(
+            query=query,
+            internal_id=internal_id,
+            estatal_id=estatal_id,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number,
+            email=email,
+            gender=gender,
+            birthday=birthday,
+        )
+
+        query = query.order_by(Users.creation.desc()).limit(limit).offset(offset)
+
+        async with self.connection_manager.query_session() as query_session:
+            results: List[Users] = (await query_session.execute(statement=query)).all()
+
+        users_data = list(map(self._users_entity_to_users_public_dto, results))
+
+        return users_data
+
+    async def fetch_users_page(
+        self: Self,
+        first: int,
+        after: Union[None, str],
+        before: Union[None, str],
+        internal_id: Union[None, str],
+        estatal_id: Union[None, int],
+        first_name: Union[None, str],
+        last_name: Union[None, str],
+        phone_number: Union[None, int],
+        email: Union[None, str],
+        gender: Union[None, str],
+        birthday: Union[None, str],
+    ) -> UsersPageDto:
+        users_page: UsersPageDto = UsersPageDto()
+        page_info: PageInfoDto = PageInfoDto()
+
+        query: Any = select(
+            Users.internal_id,
+            Users.estatal_id,
+            Users.first_name,
+            Users.last_name,
+            Users.phone_number,
+            Users.email,
+            Users.gender,
+            Users.birthday,
+            Users.creation,
+        )
+
+        query = self._filter_users_query(
+            query=query,
+            internal_id=internal_id,
+            estatal_id=estatal_id,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone_number,
+            email=email,
+            gender=gender,
+            birthday=birthday,
+        )
+
+        page_key: Any = tuple_(Users.creation, Users.internal_id)
+        next_row_query: Union[None, Any] = None
+
+        # ** info: the pages are always walked over the (creation, internal_id) index, one extra row tells if there are more rows
+        if before is not None:
+            before_key: Any = tuple_(*self._decode_users_cursor(cursor=before))
+            # ** info: the rows of the next page start at the before anchor, so a single row at or past it tells if there is one
+            next_row_query = query.with_only_columns(Users.internal_id).where(page_key <= before_key).limit(1)
+            query = query.where(page_key > before_key)
+            query = query.order_by(Users.creation.asc(), Users.internal_id.asc())
+        else:
+            if after is not None:
+                query = query.where(page_key < tuple_(*self._decode_users_cursor(cursor=after)))
+            query = query.order_by(Users.creation.desc(), Users.internal_id.desc())
+
+        query = query.limit(first + 1)
+
+        async with self.connection_manager.query_session() as query_session:
+            results: List[Users] = (await query_session.execute(statement=query)).all()
+            has_next_row: bool = next_row_query is not None and (await query_session.execute(statement=next_row_query)).first() is not None
+
+        has_more_rows: bool = len(results) > first
+        results = results[:first]
+
+        if before is not None:
+            results.reverse()
+            page_info.hasPreviousPage = has_more_rows
+            page_info.hasNextPage = has_next_row
+        else:
+            page_info.hasPreviousPage = after is not None
+            page_info.hasNextPage = has_more_rows
+
+        page_info.startCursor = self._encode_users_cursor(user=results[0]) if len(results) > 0 else None
+        page_info.endCursor = self._encode_users_cursor(user=results[-1]) if len(results) > 0 else None
+
+        users_page.users = list(map(self._users_entity_to_users_public_dto, results))
+        users_page.pageInfo = page_info
+
+        return users_page
+
+    def _filter_users_query(
+        self: Self,
+        query: Any,
+        internal_id: Union[None, str],
+        estatal_id: Union[None, int],
+        first_name: Union[None, str],
+        last_name: Union[None, str],
+        phone_number: Union[None, int],
+        email: Union[None, str],
+        gender: Union[None, str],
+        birthday: Union[None, str],
+    ) -> Any:
         if internal_id is not None:
             query = query.where(Users.internal_id.like(f"{internal_id}%"))
 
@@ -124,13 +282,14 @@ class UsersProvider(metaclass=Singleton):
         if birthday is not None:
             query = query.where(Users.birthday == birthday)
 
-        query = query.order_by(Users.creation.desc()).limit(limit).offset(offset)
-
-        results: List[Users] = self.connection_manager.query_session.execute(statement=query)
+        return query
 
-        users_data = list(map(self._users_entity_to_users_public_dto, results))
+    def _encode_users_cursor(self: Self, user: Users) -> str:
+        return cursor_provider.encode_cursor(user.creation.isoformat(), str(user.internal_id))
 
-        return users_data
+    def _decode_users_cursor(self: Self, cursor: str) -> Tuple[datetime, str]:
+        creation, internal_id = cursor_provider.decode_cursor(cursor=cursor, size=2)
+        return datetime.fromisoformat(creation), internal_id
 
     def _users_entity_to_users_public_dto(self: Self, user: Users) -> UserDto:
         user_dto: UserDto = UserDto()
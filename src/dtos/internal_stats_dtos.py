@@ -0,0 +1,105 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: pydantic imports
+from pydantic import BaseModel
+
+# ** info: typing imports
+from typing import Optional
+from typing import List
+from typing import Dict
+
+__all__: list[str] = [
+    "DatabasesHealthStatsResponseDto",
+    "DatabasePoolsStatsResponseDto",
+    "DatabaseHealthStatsDto",
+    "FunctionCacheStatsDto",
+    "DatabasePoolStatsDto",
+    "CacheStatsResponseDto",
+    "CacheCodecStatsDto",
+    "HistogramBucketDto",
+    "HistogramDto",
+]
+
+
+class DatabasePoolStatsDto(BaseModel):
+    poolSize: Optional[int] = None
+    maxOverflow: Optional[int] = None
+    checkedOut: Optional[int] = None
+    checkedIn: Optional[int] = None
+    overflow: Optional[int] = None
+    waiters: Optional[int] = None
+    acquisitions: Optional[int] = None
+    timeouts: Optional[int] = None
+    averageWaitMs: Optional[float] = None
+    maxWaitMs: Optional[float] = None
+
+
+class DatabasePoolsStatsResponseDto(BaseModel):
+    usersDatabase: Optional[DatabasePoolStatsDto] = None
+    tvDatabase: Optional[DatabasePoolStatsDto] = None
+
+
+class HistogramBucketDto(BaseModel):
+    le: Optional[float] = None
+    count: Optional[int] = None
+
+
+class HistogramDto(BaseModel):
+    count: Optional[int] = None
+    sum: Optional[float] = None
+    buckets: Optional[List[HistogramBucketDto]] = None
+
+
+class FunctionCacheStatsDto(BaseModel):
+    l1Hits: Optional[int] = None
+    l2Hits: Optional[int] = None
+    staleHits: Optional[int] = None
+    misses: Optional[int] = None
+    errors: Optional[int] = None
+    bypasses: Optional[int] = None
+    refreshes: Optional[int] = None
+    hitRatio: Optional[float] = None
+    redisLatencyMs: Optional[HistogramDto] = None
+    computeLatencyMs: Optional[HistogramDto] = None
+    valueSizeBytes: Optional[HistogramDto] = None
+
+
+class CacheCodecStatsDto(BaseModel):
+    encodedCount: Optional[int] = None
+    decodedCount: Optional[int] = None
+    compressedCount: Optional[int] = None
+    staleCount: Optional[int] = None
+    averageEncodeMs: Optional[float] = None
+    averageDecodeMs: Optional[float] = None
+    averagePayloadBytes: Optional[float] = None
+    maxPayloadBytes: Optional[int] = None
+
+
+class CacheStatsResponseDto(BaseModel):
+    functions: Optional[Dict[str, FunctionCacheStatsDto]] = None
+    codec: Optional[CacheCodecStatsDto] = None
+
+
+class DatabaseHealthStatsDto(BaseModel):
+    healthy: Optional[bool] = None
+    lastProbeLatencyMs: Optional[float] = None
+    lastProbeTime: Optional[str] = None
+    consecutiveFailures: Optional[int] = None
+    probes: Optional[int] = None
+    flaps: Optional[int] = None
+
+
+class DatabasesHealthStatsResponseDto(BaseModel):
+    healthy: Optional[bool] = None
+    databases: Optional[Dict[str, DatabaseHealthStatsDto]] = None
+
+
+class LoggingStatsResponseDto(BaseModel):
+    queueFullPolicy: Optional[str] = None
+    maxQueueSize: Optional[int] = None
+    queueDepth: Optional[int] = None
+    droppedRecords: Optional[int] = None
+    failedRecords: Optional[int] = None
+    writtenRecords: Optional[int] = None
+    writtenBatches: Optional[int] = None
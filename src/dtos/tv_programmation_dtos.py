@@ -11,6 +11,8 @@ from typing import List
 
 __all__: list[str] = [
     "TvProgrammationSearchResponseRawReturnDto",
+    "TvProgrammationBulkAddResponseDto",
+    "TvProgrammationBulkAddErrorDto",
     "TvProgrammationSearchRequestDto",
     "TvProgrammationAddRequestDto",
     "TvProgrammationResponseDto",
@@ -57,3 +59,14 @@ class TvProgrammationSearchResponsePrettyReturnDto(BaseModel):
 
 class TvProgrammationSearchResponseRawReturnDto(BaseModel):
     data: Optional[List[TvProgrammationResponseDto]] = None
+
+
+class TvProgrammationBulkAddErrorDto(BaseModel):
+    index: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class TvProgrammationBulkAddResponseDto(BaseModel):
+    insertedCount: Optional[int] = None
+    failedCount: Optional[int] = None
+    errors: Optional[List[TvProgrammationBulkAddErrorDto]] = None
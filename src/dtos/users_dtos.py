@@ -1,7 +1,11 @@
 # !/usr/bin/python3
 # type: ignore
 
-__all__: list[str] = ["UserDto"]
+# ** info: typing imports
+from typing import Union
+from typing import List
+
+__all__: list[str] = ["AddUserFailureDto", "AddUsersResultDto", "UsersPageDto", "PageInfoDto", "UserDto"]
 
 
 class UserDto:
@@ -13,3 +17,27 @@ class UserDto:
     email: str
     gender: str
     birthday: str
+
+
+class PageInfoDto:
+    hasNextPage: bool
+    hasPreviousPage: bool
+    startCursor: Union[None, str]
+    endCursor: Union[None, str]
+
+
+class UsersPageDto:
+    users: List[UserDto]
+    pageInfo: PageInfoDto
+
+
+class AddUserFailureDto:
+    index: int
+    estatalId: Union[None, int]
+    reason: str
+
+
+class AddUsersResultDto:
+    insertedCount: int
+    users: List[UserDto]
+    failures: List[AddUserFailureDto]
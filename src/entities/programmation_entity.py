@@ -7,6 +7,7 @@ from sqlalchemy import DateTime
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Time
 
 
@@ -32,3 +33,48 @@ class TvProgramation(Base):
     year: Column = Column(Integer, nullable=False)
     creation: Column = Column(DateTime(timezone=True))
     modification: Column = Column(DateTime(timezone=True))
+
+    # ** info: each index info carries the query shape that falls back to a sequential scan without it
+    __table_args__: tuple = (
+        Index(
+            "tv_programation_creation_idx",
+            creation.desc(),
+            info={"query_shape": "select ... from tv_programation order by creation desc"},
+        ),
+        Index(
+            "tv_programation_channel_id_creation_idx",
+            channel_id,
+            creation.desc(),
+            info={"query_shape": "select ... from tv_programation where channel_id = ... order by creation desc"},
+        ),
+        Index(
+            "tv_programation_channel_name_pattern_idx",
+            channel_name,
+            postgresql_ops={"channel_name": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from tv_programation where channel_name like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "tv_programation_channel_content_type_pattern_idx",
+            channel_content_type,
+            postgresql_ops={"channel_content_type": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from tv_programation where channel_content_type like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "tv_programation_year_creation_idx",
+            year,
+            creation.desc(),
+            info={"query_shape": "select ... from tv_programation where year = ... order by creation desc"},
+        ),
+        Index(
+            "tv_programation_days_gin_idx",
+            days,
+            postgresql_using="gin",
+            info={"query_shape": "select ... from tv_programation where days && array[...]"},
+        ),
+        Index(
+            "tv_programation_weeks_gin_idx",
+            weeks,
+            postgresql_using="gin",
+            info={"query_shape": "select ... from tv_programation where weeks && array[...]"},
+        ),
+    )
@@ -6,6 +6,7 @@ from sqlalchemy import DateTime
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Date
 
 # ** info: sqlalchemy declarative imports
@@ -30,3 +31,55 @@ class Users(Base):
     creation: Column = Column(DateTime(timezone=True))
     modification: Column = Column(DateTime(timezone=True))
     password: Column = Column(String(64))
+
+    # ** info: each index info carries the query shape that falls back to a sequential scan without it
+    __table_args__: tuple = (
+        Index(
+            "users_creation_internal_id_idx",
+            creation.desc(),
+            internal_id.desc(),
+            info={"query_shape": "select ... from users order by creation desc, internal_id desc limit ..."},
+        ),
+        Index(
+            "users_internal_id_pattern_idx",
+            internal_id,
+            postgresql_ops={"internal_id": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from users where internal_id like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "users_first_name_pattern_idx",
+            first_name,
+            postgresql_ops={"first_name": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from users where first_name like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "users_last_name_pattern_idx",
+            last_name,
+            postgresql_ops={"last_name": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from users where last_name like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "users_email_pattern_idx",
+            email,
+            postgresql_ops={"email": "varchar_pattern_ops"},
+            info={"query_shape": "select ... from users where email like 'prefix%' order by creation desc"},
+        ),
+        Index(
+            "users_phone_number_creation_idx",
+            phone_number,
+            creation.desc(),
+            info={"query_shape": "select ... from users where phone_number = ... order by creation desc"},
+        ),
+        Index(
+            "users_gender_creation_idx",
+            gender,
+            creation.desc(),
+            info={"query_shape": "select ... from users where gender = ... order by creation desc"},
+        ),
+        Index(
+            "users_birthday_creation_idx",
+            birthday,
+            creation.desc(),
+            info={"query_shape": "select ... from users where birthday = ... order by creation desc"},
+        ),
+    )
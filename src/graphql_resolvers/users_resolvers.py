@@ -2,25 +2,38 @@
 # type: ignore
 
 # ** info: python imports
+from datetime import date
 import logging
 
 # ** info: graphql imports
-# from graphql import GraphQLErrorExtensions
-# from graphql import GraphQLError
-# extensions: GraphQLErrorExtensions = {"code": "E001", "confirmation": "G"}
-# raise GraphQLError(message="aaaa", extensions=extensions)
+from graphql import GraphQLErrorExtensions
+from graphql import GraphQLError
 
 # ** info: typing imports
 from typing import Union
+from typing import Tuple
 from typing import List
 from typing import Self
+from typing import Dict
+from typing import Set
+from typing import Any
 
 # ** info: users dtos imports
+from src.dtos.users_dtos import AddUsersResultDto
+from src.dtos.users_dtos import AddUserFailureDto
+from src.dtos.users_dtos import UsersPageDto
 from src.dtos.users_dtos import UserDto
 
 # ** info: users provider import
 from src.database.postgres.users_provider import users_provider
 
+# ** info: entities imports
+from src.entities.users_entity import Users
+
+# **info: sqlalchemy imports
+from sqlalchemy import Integer
+from sqlalchemy import String
+
 # ** info: resolvers cache
 from src.database.cache_database.cache_provider import cache_provider
 
@@ -31,6 +44,9 @@ from src.artifacts.pattern.singleton import Singleton
 
 __all__: list[str] = ["users_resolvers"]
 
+USERS_CACHE_TAG: str = "users"
+INTEGER_COLUMN_RANGE: Tuple[int, int] = (-(2**31), 2**31 - 1)
+
 
 class UsersResolvers(metaclass=Singleton):
     async def add_user_resolver(
@@ -59,7 +75,7 @@ class UsersResolvers(metaclass=Singleton):
         first_name = first_name.lower()
         last_name = last_name.lower()
 
-        response: UserDto = users_provider.add_user(
+        response: UserDto = await users_provider.add_user(
             internal_id=internal_id,
             estatal_id=estatal_id,
             first_name=first_name,
@@ -73,11 +89,74 @@ class UsersResolvers(metaclass=Singleton):
             password=password,
         )
 
+        await cache_provider.invalidate_tags(tags=[USERS_CACHE_TAG])
+
         logging.debug("ending usersFullData resolver method")
 
         return response
 
-    @cache_provider.ttl_cache(ttl=120)
+    async def add_users_resolver(self: Self, users: List[Dict[str, Any]]) -> AddUsersResultDto:
+        """add_users_resolver
+
+        addUsers root resolver
+
+        """
+
+        logging.debug("starting addUsers resolver method")
+
+        modification: str = datetime_provider.get_utc_iso_string()
+        creation: str = datetime_provider.get_utc_iso_string()
+
+        failures: List[AddUserFailureDto] = list()
+        new_users: List[Dict[str, Any]] = list()
+        new_users_indexes: Dict[int, int] = dict()
+
+        for index, user in enumerate(users):
+            failure_reason: Union[None, str] = self._validate_new_user(user=user, batch_estatal_ids=new_users_indexes)
+
+            if failure_reason is not None:
+                failures.append(self._build_add_user_failure(index=index, estatal_id=user["estatal_id"], reason=failure_reason))
+                continue
+
+            new_users_indexes[user["estatal_id"]] = index
+            new_users.append(
+                {
+                    "internal_id": uuid_provider.get_str_uuid(),
+                    "estatal_id": user["estatal_id"],
+                    "first_name": user["first_name"].lower(),
+                    "last_name": user["last_name"].lower(),
+                    "phone_number": user["phone_number"],
+                    "email": user["email"],
+                    "gender": user["gender"],
+                    "birthday": user["birthday"],
+                    "creation": creation,
+                    "modification": modification,
+                    "password": user["password"],
+                }
+            )
+
+        inserted_users: List[UserDto] = await users_provider.add_users(users=new_users)
+        inserted_estatal_ids: Set[str] = {user.estatalId for user in inserted_users}
+
+        for new_user in new_users:
+            if str(new_user["estatal_id"]) not in inserted_estatal_ids:
+                index: int = new_users_indexes[new_user["estatal_id"]]
+                failures.append(self._build_add_user_failure(index=index, estatal_id=new_user["estatal_id"], reason="estatalId already exists"))
+
+        if len(inserted_users) > 0:
+            await cache_provider.invalidate_tags(tags=[USERS_CACHE_TAG])
+
+        response: AddUsersResultDto = AddUsersResultDto()
+        response.insertedCount = len(inserted_users)
+        response.users = inserted_users
+        response.failures = sorted(failures, key=lambda failure: failure.index)
+
+        logging.info(f"{response.insertedCount} users added, {len(response.failures)} users rejected")
+        logging.debug("ending addUsers resolver method")
+
+        return response
+
+    @cache_provider.ttl_cache(ttl=600, soft_ttl=60, l1_ttl=5, l1_max_entries=512, distributed_lock=True, tags=[USERS_CACHE_TAG])
     async def users_resolver(
         self: Self,
         limit: int,
@@ -99,7 +178,7 @@ class UsersResolvers(metaclass=Singleton):
 
         logging.debug("starting users resolver method")
 
-        response: List[UserDto] = users_provider.fetch_users_data(
+        response: List[UserDto] = await users_provider.fetch_users_data(
             limit=limit,
             offset=offset,
             internal_id=internal_id,
@@ -116,5 +195,107 @@ class UsersResolvers(metaclass=Singleton):
 
         return response
 
+    @cache_provider.ttl_cache(ttl=600, soft_ttl=60, l1_ttl=5, l1_max_entries=512, tags=[USERS_CACHE_TAG])
+    async def users_page_resolver(
+        self: Self,
+        first: int,
+        after: Union[None, str],
+        before: Union[None, str],
+        internal_id: Union[None, str],
+        estatal_id: Union[None, int],
+        first_name: Union[None, str],
+        last_name: Union[None, str],
+        phone_number: Union[None, int],
+        email: Union[None, str],
+        gender: Union[None, str],
+        birthday: Union[None, str],
+    ) -> UsersPageDto:
+        """users_page_resolver
+
+        usersPage root resolver
+
+        """
+
+        logging.debug("starting usersPage resolver method")
+
+        extensions: GraphQLErrorExtensions = {"code": "BAD_USER_INPUT"}
+
+        if first < 1:
+            raise GraphQLError(message="first must be greater than zero", extensions=extensions)
+
+        if after is not None and before is not None:
+            raise GraphQLError(message="after and before can't be used at the same time", extensions=extensions)
+
+        try:
+            response: UsersPageDto = await users_provider.fetch_users_page(
+                first=first,
+                after=after,
+                before=before,
+                internal_id=internal_id,
+                estatal_id=estatal_id,
+                first_name=first_name,
+                last_name=last_name,
+                phone_number=phone_number,
+                email=email,
+                gender=gender,
+                birthday=birthday,
+            )
+        except ValueError as error:
+            raise GraphQLError(message=f"invalid pagination cursor: {error.args[0]}", extensions=extensions)
+
+        logging.debug("ending usersPage resolver method")
+
+        return response
+
+    def _validate_new_user(self: Self, user: Dict[str, Any], batch_estatal_ids: Dict[int, int]) -> Union[None, str]:
+        if user["estatal_id"] in batch_estatal_ids:
+            return f"estatalId duplicated in the batch at index {batch_estatal_ids[user['estatal_id']]}"
+
+        column_limits_failure: Union[None, str] = self._validate_column_limits(user=user)
+
+        if column_limits_failure is not None:
+            return column_limits_failure
+
+        if "@" not in user["email"]:
+            return "email is not valid"
+
+        try:
+            date.fromisoformat(user["birthday"])
+        except ValueError:
+            return "birthday is not a valid yyyy-mm-dd date"
+
+        return None
+
+    def _validate_column_limits(self: Self, user: Dict[str, Any]) -> Union[None, str]:
+        # ** info: a single value over the users columns limits fails the whole bulk insert, so it's rejected here for its row only
+        for column_name, value in user.items():
+            column: Any = Users.__table__.columns.get(column_name)
+            field_name: str = _to_camel_case(name=column_name)
+
+            if column is None or value is None:
+                continue
+
+            if isinstance(column.type, String) and column.type.length is not None and len(value) > column.type.length:
+                return f"{field_name} is longer than {column.type.length} characters"
+
+            if isinstance(column.type, Integer) and not INTEGER_COLUMN_RANGE[0] <= value <= INTEGER_COLUMN_RANGE[1]:
+                return f"{field_name} is out of the {INTEGER_COLUMN_RANGE[0]} to {INTEGER_COLUMN_RANGE[1]} range"
+
+        return None
+
+    def _build_add_user_failure(self: Self, index: int, estatal_id: int, reason: str) -> AddUserFailureDto:
+        failure: AddUserFailureDto = AddUserFailureDto()
+
+        failure.index = index
+        failure.estatalId = estatal_id
+        failure.reason = reason
+
+        return failure
+
+
+def _to_camel_case(name: str) -> str:
+    first_word, *other_words = name.split("_")
+    return first_word + "".join(word.title() for word in other_words)
+
 
 users_resolvers: UsersResolvers = UsersResolvers()
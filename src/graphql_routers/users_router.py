@@ -8,6 +8,7 @@ import logging
 # ** info: typing imports
 from typing import Union
 from typing import List
+from typing import Dict
 from typing import Any
 
 # ** info: starlette imports
@@ -31,6 +32,8 @@ from src.artifacts.path.generator import generator
 from src.artifacts.env.configs import configs
 
 # ** info: users dtos imports
+from src.dtos.users_dtos import AddUsersResultDto
+from src.dtos.users_dtos import UsersPageDto
 from src.dtos.users_dtos import UserDto
 
 # ** info: resolvers imports
@@ -91,6 +94,37 @@ async def add_user_facade(
     return response
 
 
+@mutation.field("addUsers")
+async def add_users_facade(*_: Any, users: List[Dict[str, Any]]) -> AddUsersResultDto:
+    """add_users_facade
+
+    addUsers resolver facade
+
+    """
+
+    logging.debug("starting addUsers resolver facade")
+
+    response: AddUsersResultDto = await users_resolvers.add_users_resolver(
+        users=[
+            {
+                "estatal_id": user["estatalId"],
+                "first_name": user["firstName"],
+                "last_name": user["lastName"],
+                "phone_number": user["phoneNumber"],
+                "email": user["email"],
+                "gender": user["gender"],
+                "birthday": user["birthday"],
+                "password": user["password"],
+            }
+            for user in users
+        ]
+    )
+
+    logging.debug("ending addUsers resolver facade")
+
+    return response
+
+
 @query.field("listUsers")
 async def users_public_data_facade(
     *_: Any,
@@ -131,6 +165,48 @@ async def users_public_data_facade(
     return response
 
 
+@query.field("listUsersPage")
+async def users_page_facade(
+    *_: Any,
+    first: int,
+    after: Union[None, str] = None,
+    before: Union[None, str] = None,
+    internalId: Union[None, str] = None,
+    estatalId: Union[None, int] = None,
+    firstName: Union[None, str] = None,
+    lastName: Union[None, str] = None,
+    phoneNumber: Union[None, int] = None,
+    email: Union[None, str] = None,
+    gender: Union[None, str] = None,
+    birthday: Union[None, str] = None,
+) -> UsersPageDto:
+    """users_page_facade
+
+    users page resolver facade
+
+    """
+
+    logging.debug("starting users page resolver facade")
+
+    response: UsersPageDto = await users_resolvers.users_page_resolver(
+        first=first,
+        after=after,
+        before=before,
+        internal_id=internalId,
+        estatal_id=estatalId,
+        first_name=firstName,
+        last_name=lastName,
+        phone_number=phoneNumber,
+        email=email,
+        gender=gender,
+        birthday=birthday,
+    )
+
+    logging.debug("ending users page resolver facade")
+
+    return response
+
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: assembling schema literal with schema executable
 # ---------------------------------------------------------------------------------------------------------------------
@@ -25,11 +25,11 @@ from fastapi import APIRouter
 from fastapi import FastAPI
 
 # ** info: starlette imports
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.routing import BaseRoute
 from starlette.routing import Mount
 
 # ** info: rest based routers imports
+from src.rest_routers.internal_stats_router import internal_stats_router
 from src.rest_routers.tv_channel_router import tv_channel_router
 
 # ** info: graphql based routers imports
@@ -41,16 +41,24 @@ from src.artifacts.path.generator import generator
 from src.artifacts.env.configs import configs
 
 # ** info: middlewares imports
-from src.middlewares.authentication_handler import authentication_handler
-from src.middlewares.database_health_check import database_health_check
-from src.middlewares.logger_contextualizer import logger_contextualizer
-from src.middlewares.error_handler import error_handler
+from src.middlewares.authentication_handler import AuthenticationHandler
+from src.middlewares.logger_contextualizer import LoggerContextualizer
+from src.middlewares.database_health_check import DatabaseHealthCheck
+from src.middlewares.request_profiler import RequestProfiler
+from src.middlewares.request_metrics import RequestMetrics
+from src.middlewares.error_handler import ErrorHandler
 
 # ** info: databases connection managers imports
 from src.database.cache_database.connection_manager import (
     connection_manager as cache_connection_manager,
 )
 
+# ** info: databases health monitor imports
+from src.database.database_health_monitor import database_health_monitor
+
+# ** info: databases indexes checker imports
+from src.database.postgres.indexes_checker import indexes_checker
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: initializing app graphql based routers
@@ -70,6 +78,7 @@ app: FastAPI = FastAPI(routes=routers)
 
 rest_router: APIRouter = APIRouter(prefix=generator.build_posix_path("rest"))
 
+rest_router.include_router(internal_stats_router)
 rest_router.include_router(tv_channel_router)
 
 app.include_router(rest_router)
@@ -91,19 +100,31 @@ else:
 
 if configs.app_use_database_health_check_middleware is True:
     logging.info("databases health check middleware active")
-    app.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=database_health_check)
+    app.add_middleware(middleware_class=DatabaseHealthCheck)
 else:
     logging.warn("databases health check middleware inactive")
 
 if configs.app_use_database_health_check_middleware is True:
     logging.info("authentication middleware active")
-    app.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=authentication_handler)
+    app.add_middleware(middleware_class=AuthenticationHandler)
 else:
     logging.warn("authentication middleware inactive")
 
-app.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=error_handler)
+app.add_middleware(middleware_class=ErrorHandler)
 
-app.add_middleware(middleware_class=BaseHTTPMiddleware, dispatch=logger_contextualizer)
+app.add_middleware(middleware_class=LoggerContextualizer)
+
+if configs.app_use_metrics_middleware is True:
+    logging.info("request metrics middleware active")
+    app.add_middleware(middleware_class=RequestMetrics)
+else:
+    logging.warn("request metrics middleware inactive")
+
+if configs.app_use_request_profiler_middleware is True:
+    logging.info("request profiler middleware active")
+    app.add_middleware(middleware_class=RequestProfiler)
+else:
+    logging.warn("request profiler middleware inactive")
 
 app.add_middleware(CORSMiddleware, allow_credentials=True, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
@@ -134,6 +155,23 @@ if __name__ != "__main__":
 cache_connection_manager._download_connection._start_connection()
 cache_connection_manager._upload_connection._start_connection()
 
+app.add_event_handler("startup", database_health_monitor.start)
+app.add_event_handler("shutdown", database_health_monitor.stop)
+
+if configs.app_check_database_indexes_on_startup is True:
+    logging.info("database indexes check on startup active")
+    app.add_event_handler("startup", indexes_checker.check_indexes_on_startup)
+else:
+    logging.warning("database indexes check on startup inactive")
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: flushing app logging on shutdown
+# ---------------------------------------------------------------------------------------------------------------------
+
+# ** info: the shutdown handlers run in registration order, so the log sink is stopped after every handler that logs
+if configs.app_logging_mode == "structured":
+    app.add_event_handler("shutdown", custom_logger.stop_structured_logging)
+
 # ---------------------------------------------------------------------------------------------------------------------
 # ** info: setting up uvicorn asgi server with fast api app
 # ---------------------------------------------------------------------------------------------------------------------
@@ -2,62 +2,50 @@
 # type: ignore
 
 # ** info: python imports
-from contextvars import Context
-from typing import Callable
-import contextvars
 import logging
 
 # ** info: typing imports
 from typing import Self
-from typing import Dict
 
 # ** info: starlette imports
-from starlette.responses import StreamingResponse
-from starlette.responses import ContentStream
-from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
 
 # ** info: fastapi imports
 from fastapi import status
 
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
+
 # ** info: artifacts imports
-from src.artifacts.pattern.singleton import Singleton
 from src.artifacts.env.configs import configs
 
-__all__: list[str] = ["authentication_handler"]
+__all__: list[str] = ["AuthenticationHandler"]
 
 
-class AuthenticationHandler(metaclass=Singleton):
+class AuthenticationHandler:
 
     """authentication handler
-    this class provides a custom authentication middleware for fastapi based applications
+    this class provides a custom authentication asgi middleware for fastapi based applications
     """
 
-    def __init__(self: Self):
-        pass
-
-    async def __set_body__(self: Self, request: Request):
-        receive_ = await request._receive()
-
-        async def receive():
-            return receive_
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
 
-        request._receive = receive
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def __call__(
-        self: Self,
-        request: Request,
-        call_next: Callable,
-    ) -> StreamingResponse:
-        await self.__set_body__(request=request)
-
-        base_url: str = str(request.base_url)
-        full_url: str = str(request.url)
-
-        endpoint_url: str = full_url.replace(base_url, "").strip().lower()
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
 
         is_authenticated: bool = False
 
-        if endpoint_url in configs.app_database_health_check_middleware_exclude:
+        if request_state.endpoint_url in configs.app_database_health_check_middleware_exclude:
             logging.info("jumping authentication middleware validations")
             is_authenticated = True
 
@@ -65,30 +53,11 @@ class AuthenticationHandler(metaclass=Singleton):
             # todo: create a real authentication logic here
             is_authenticated = True
 
-        request_context: Context = contextvars.copy_context()
-        logger_kwargs: Dict = dict()
-
-        for item in request_context.items():
-            if item[0].name == "loguru_context":
-                logger_kwargs = item[1]
-                break
-
-        internal_id: str = logger_kwargs["internalId"]
-
         if is_authenticated:
-            logging.info(f"the request with id {internal_id} was successfully authorized")
-            response: StreamingResponse = await call_next(request)
+            logging.info(f"the request with id {request_state.internal_id} was successfully authorized")
+            await self.app(scope, request_state.receive, send)
 
         else:
-            logging.error(f"the request with id {internal_id} was not successfully authorized")
-            response_stream: ContentStream = iter(["Not Authorized"])
-
-            response: StreamingResponse = StreamingResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content=response_stream,
-            )
-
-        return response
-
-
-authentication_handler: AuthenticationHandler = AuthenticationHandler()
+            logging.error(f"the request with id {request_state.internal_id} was not successfully authorized")
+            response: PlainTextResponse = PlainTextResponse(content="Not Authorized", status_code=status.HTTP_401_UNAUTHORIZED)
+            await response(scope, request_state.receive, send)
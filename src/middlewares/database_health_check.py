@@ -2,102 +2,80 @@
 # type: ignore
 
 # ** info: python imports
-from asyncio import gather
 import logging
 
 # ** info: typing imports
-from typing import Callable
-from typing import Tuple
 from typing import Self
+from typing import List
+from typing import Set
 
 # ** info: starlette imports
-from starlette.responses import StreamingResponse
-from starlette.responses import ContentStream
-from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
 
 # ** info: fastapi imports
 from fastapi import status
 
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
+
 # ** info: artifacts imports
-from src.artifacts.pattern.singleton import Singleton
 from src.artifacts.env.configs import configs
 
-# ** info: databases connection managers imports
-from src.database.cache_database.connection_manager import (
-    connection_manager as cache_connection_manager,
-)
+# ** info: databases health monitor imports
+from src.database.database_health_monitor import database_health_monitor
 
-__all__: list[str] = ["database_health_check"]
+__all__: list[str] = ["DatabaseHealthCheck"]
 
 
-class DatabaseHealthCheck(metaclass=Singleton):
+class DatabaseHealthCheck:
 
     """database health check
-    this class provides a databases health check middleware for fastapi based applications
+    this class provides a databases health check asgi middleware for fastapi based applications,
+    failing fast while the databases health monitor knows a database needed by the route is unhealthy
     """
 
-    def __init__(self: Self):
-        pass
-
-    async def _get_internal_server_error_stream(self: Self) -> StreamingResponse:
-        response_stream: ContentStream = iter(["Internal Server Error"])
-        response: StreamingResponse = StreamingResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=response_stream,
-        )
-        return response
-
-    async def __set_body__(self: Self, request: Request):
-        receive_ = await request._receive()
-
-        async def receive():
-            return receive_
-
-        request._receive = receive
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
 
-    async def __call__(
-        self: Self,
-        request: Request,
-        call_next: Callable,
-    ) -> StreamingResponse:
-        await self.__set_body__(request=request)
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        base_url: str = str(request.base_url)
-        full_url: str = str(request.url)
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
 
-        endpoint_url: str = full_url.replace(base_url, "").strip().lower()
-
-        if endpoint_url in configs.app_database_health_check_middleware_exclude:
+        if request_state.endpoint_url in configs.app_database_health_check_middleware_exclude:
             logging.info("jumping databases health check middleware validations")
-            response: StreamingResponse = await call_next(request)
-            return response
-
-        are_databses_healty: bool = True
+            await self.app(scope, request_state.receive, send)
+            return
 
-        cache_connections_health: Tuple[bool, bool] = await gather(
-            cache_connection_manager._download_connection._check_connection_health(),
-            cache_connection_manager._upload_connection._check_connection_health(),
+        # ** info: the databases health is probed by a background monitor, the requests only read its last known state
+        unhealthy_databases: List[str] = database_health_monitor.get_unhealthy_databases(
+            databases=self._get_route_databases(endpoint_url=request_state.endpoint_url)
         )
 
-        is_download_connection_healthy: bool = cache_connections_health[0]
-        is_upload_connection_healthy: bool = cache_connections_health[1]
-
-        if is_download_connection_healthy is False:
-            logging.warning("cache download connection isn't healthy")
-            are_databses_healty = False
-
-        if is_upload_connection_healthy is False:
-            logging.warning("cache upload connection isn't healthy")
-            are_databses_healty = False
-
-        if are_databses_healty is False:
-            return await self._get_internal_server_error_stream()
+        if len(unhealthy_databases) > 0:
+            logging.warning(f"rejecting request, unhealthy databases: {', '.join(unhealthy_databases)}")
+            response: PlainTextResponse = PlainTextResponse(content="Service Unavailable", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+            await response(scope, request_state.receive, send)
+            return
 
-        logging.info("all databases are healthy")
+        logging.debug("the route databases are healthy")
 
-        response: StreamingResponse = await call_next(request)
+        await self.app(scope, request_state.receive, send)
 
-        return response
+    @staticmethod
+    def _get_route_databases(endpoint_url: str) -> Set[str]:
+        route: str = endpoint_url.split("?")[0]
+        route_databases: Set[str] = set()
 
+        for route_prefix, databases in configs.app_database_health_check_routes_databases.items():
+            if route == route_prefix or route.startswith(f"{route_prefix}/"):
+                route_databases.update(databases)
 
-database_health_check: DatabaseHealthCheck = DatabaseHealthCheck()
+        return route_databases
@@ -2,82 +2,67 @@
 # type: ignore
 
 # ** info: python imports
-from contextvars import Context
-from typing import Callable
-import contextvars
 import logging
 
 # ** info: typing imports
 from typing import Self
-from typing import Dict
 
 # ** info: starlette imports
-from starlette.responses import StreamingResponse
-from starlette.responses import ContentStream
-from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
 
 # ** info: fastapi imports
 from fastapi import status
 
-# ** info: artifacts imports
-from src.artifacts.pattern.singleton import Singleton
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
 
-__all__: list[str] = ["error_handler"]
+__all__: list[str] = ["ErrorHandler"]
 
 
-class ErrorHandler(metaclass=Singleton):
+class ErrorHandler:
 
     """error handler
-    this class provides a custom error handler middleware for fastapi based applications
+    this class provides a custom error handler asgi middleware for fastapi based applications
     """
 
-    def __init__(self: Self):
-        pass
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
 
-    async def __set_body__(self: Self, request: Request):
-        receive_ = await request._receive()
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        async def receive():
-            return receive_
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
+        is_response_started: bool = False
 
-        request._receive = receive
-
-    async def __call__(
-        self: Self,
-        request: Request,
-        call_next: Callable,
-    ) -> StreamingResponse:
-        request_context: Context = contextvars.copy_context()
-        logger_kwargs: Dict = dict()
-
-        for item in request_context.items():
-            if item[0].name == "loguru_context":
-                logger_kwargs = item[1]
-                break
-
-        internal_id: str = logger_kwargs["internalId"]
+        async def send_wrapper(message: Message) -> None:
+            nonlocal is_response_started
+            is_response_started = True
+            await send(message)
 
         try:
-            response: StreamingResponse = await call_next(request)
-            logging.info(f"request with id {internal_id} successfully processed")
+            await self.app(scope, request_state.receive, send_wrapper)
+            logging.info(f"request with id {request_state.internal_id} successfully processed")
 
         except Exception as exception:
-            if str(exception.args[0]).strip() == "":
-                logging.exception(f"a handled error has occurred on the api while processing the request with id {internal_id}")
+            if len(exception.args) == 0 or str(exception.args[0]).strip() == "":
+                logging.exception(f"a handled error has occurred on the api while processing the request with id {request_state.internal_id}")
 
             else:
                 logging.exception(
-                    f"a not handled error has occurred on the api while processing the request with id {internal_id}: {exception.args[0]}"  # noqa: E501
+                    f"a not handled error has occurred on the api while processing the request with id {request_state.internal_id}: {exception.args[0]}"  # noqa: E501
                 )
 
-            response_stream: ContentStream = iter(["Internal Server Error"])
-
-            response: StreamingResponse = StreamingResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content=response_stream,
-            )
-
-        return response
-
+            # ** info: once the response started the error can't be turned into a new response, the server closes the connection
+            if is_response_started is True:
+                raise
 
-error_handler: ErrorHandler = ErrorHandler()
+            response: PlainTextResponse = PlainTextResponse(content="Internal Server Error", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            await response(scope, request_state.receive, send)
@@ -3,115 +3,132 @@
 
 # ** info: python imports
 import logging
+import random
 import json
+import re
 
 # ** info: typing imports
-from typing import Callable
-from typing import Dict
 from typing import Self
+from typing import Set
+from typing import Dict
+from typing import List
 from typing import Any
 
 # ** info: loguru imports
 from loguru import logger
 
 # ** info: starlette imports
-from starlette.datastructures import MutableHeaders
-from starlette.responses import StreamingResponse
-from starlette.responses import ContentStream
-from starlette.datastructures import Headers
-from starlette.responses import Response
-from starlette.requests import Request
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
+
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
 
 # ** info: artifacts imports
 from src.artifacts.datetime.datetime_provider import datetime_provider
-from src.artifacts.uuid.uuid_provider import uuid_provider
-from src.artifacts.pattern.singleton import Singleton
+from src.artifacts.env.configs import configs
 
-__all__: list[str] = ["logger_contextualizer"]
+__all__: list[str] = ["LoggerContextualizer", "ResponseBodyCapture"]
 
+REDACTED_BODY_FIELDS: Set[str] = {"password"}
+REDACTED_BODY_VALUE: str = "[redacted]"
 
-class LoggerContextualizer(metaclass=Singleton):
+# ** info: the graphql arguments can be sent as literals inside the query text instead of as variables
+REDACTED_QUERY_ARGUMENT_PATTERN: re.Pattern = re.compile(rf'\b({"|".join(REDACTED_BODY_FIELDS)})(\s*:\s*)"(?:[^"\\]|\\.)*"')
 
-    """logger contextualizer
-    this class provides a custom loguru contextualizer middleware for fastapi based applications
-    """
 
-    def __init__(self: Self):
-        pass
+class ResponseBodyCapture:
 
-    async def __set_body__(self: Self, request: Request):
-        receive_ = await request._receive()
+    """response body capture
+    this class keeps at most max bytes of the response body chunks for logging, the chunks past the
+    limit are only counted so a large response never gets copied in memory
+    """
 
-        async def receive():
-            return receive_
+    def __init__(self: Self, max_bytes: int):
+        self._max_bytes: int = max_bytes
+        self._chunks: List[bytes] = list()
+        self._captured_bytes: int = 0
+        self.body_bytes: int = 0
 
-        request._receive = receive
+    @property
+    def is_truncated(self: Self) -> bool:
+        return self.body_bytes > self._captured_bytes
 
-    async def __call__(
-        self: Self,
-        request: Request,
-        call_next: Callable,
-    ) -> StreamingResponse:
-        start_time: str = datetime_provider.get_utc_pretty_string()
+    def write(self: Self, chunk: bytes) -> None:
+        self.body_bytes += len(chunk)
 
-        await self.__set_body__(request=request)
+        if self._captured_bytes < self._max_bytes:
+            captured_chunk: bytes = chunk[: self._max_bytes - self._captured_bytes]
+            self._captured_bytes += len(captured_chunk)
+            self._chunks.append(captured_chunk)
 
-        base_url: str = str(request.base_url)
-        full_url: str = str(request.url)
+    def to_dict(self: Self) -> Dict[str, Any]:
+        # ** info: a truncated body isn't valid json anymore, so only its size is logged
+        if self.is_truncated:
+            return {"truncated": True, "bodyBytes": self.body_bytes, "capturedBytes": self._captured_bytes}
 
-        endpoint_url: str = full_url.replace(base_url, "").strip().lower()
+        try:
+            return dict(json.loads(b"".join(self._chunks).decode()))
+        except (ValueError, TypeError):
+            logging.debug("response body isn't a json object, setting default one in logging contextualizer")
+            return {"default": "dictionary"}
 
-        request_headers: Headers = request.headers
-        headers_rep: Dict[str, Any] = dict()
-        for key in request_headers.keys():
-            headers_rep[key] = str(request_headers[key])
 
-        request_body: Dict[str, str]
+class LoggerContextualizer:
 
-        if await request.body():
-            request_body = dict(await request.json())
-        else:
-            request_body = dict()
+    """logger contextualizer
+    this class provides a custom loguru contextualizer asgi middleware for fastapi based applications,
+    the response chunks are forwarded to the client as they come and only a capped, sampled copy of
+    the body is kept for logging, the request body is capped too and its sensitive fields are redacted
+    """
 
-        internal_id: str = uuid_provider.get_str_uuid()
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
 
-        if "requestId" in headers_rep:
-            external_id: str = headers_rep["requestId"]
-        else:
-            external_id: str = internal_id
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response: Response
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
 
-        with logger.contextualize(
-            requestHeaders=headers_rep,
-            requestBody=request_body,
-            endpointUrl=endpoint_url,
-            internalId=internal_id,
-            externalId=external_id,
-            startTime=start_time,
-            fullUrl=full_url,
-        ):
-            router_response: StreamingResponse = await call_next(request)
+        response_capture: ResponseBodyCapture = ResponseBodyCapture(max_bytes=configs.app_logging_response_body_max_bytes)
+        is_route_captured: bool = self._is_route_captured(endpoint_url=request_state.endpoint_url)
+        is_body_captured: bool = False
+        response_headers_rep: Dict[str, Any] = dict()
+        response_status: int = 500
 
-            end_time: str = datetime_provider.get_utc_pretty_string()
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_status, is_body_captured
 
-            response_headers: MutableHeaders = router_response.headers
-            response_headers_rep: Dict[str, Any] = dict()
-            for key in response_headers.keys():
-                response_headers_rep[key] = str(response_headers[key])
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                for key, value in message.get("headers", list()):
+                    response_headers_rep[key.decode("latin-1")] = value.decode("latin-1")
+                is_body_captured = is_route_captured and self._is_content_type_captured(content_type=response_headers_rep.get("content-type", ""))
 
-            response_content: bytes = b""
-            async for chunk in router_response.body_iterator:
-                if isinstance(chunk, bytes):
-                    response_content += chunk
+            elif message["type"] == "http.response.body" and is_body_captured:
+                response_capture.write(chunk=message.get("body", b""))
 
-            try:
-                response_body_rep: Dict[str, str] = dict(json.loads(response_content.decode()))
-            except Exception:
-                logging.error("unable to fetch response body in logging contextualizer, setting default one")
-                response_body_rep: Dict[str, str] = {"default": "dictionary"}
+            await send(message)
 
-            response_status: int = router_response.status_code
+        with logger.contextualize(
+            requestHeaders=request_state.headers,
+            requestBody=self._get_request_body_rep(request_state=request_state),
+            endpointUrl=request_state.endpoint_url,
+            internalId=request_state.internal_id,
+            externalId=request_state.external_id,
+            startTime=request_state.start_time,
+            fullUrl=request_state.full_url,
+        ):
+            await self.app(scope, request_state.receive, send_wrapper)
+
+            end_time: str = datetime_provider.get_utc_pretty_string()
+            response_body_rep: Dict[str, Any] = response_capture.to_dict() if is_body_captured else {"default": "dictionary"}
 
             with logger.contextualize(
                 responseHeaders=response_headers_rep,
@@ -119,18 +136,37 @@ class LoggerContextualizer(metaclass=Singleton):
                 responseCode=response_status,
                 endTime=end_time,
             ):
-                logging.info(f"response details to request {internal_id}")
-
-            content_literal: ContentStream = iter([response_content])
-
-            response = StreamingResponse(
-                media_type=router_response.media_type,
-                headers=dict(response_headers),
-                status_code=response_status,
-                content=content_literal,
-            )
-
-        return response
-
-
-logger_contextualizer: LoggerContextualizer = LoggerContextualizer()
+                logging.info(f"response details to request {request_state.internal_id}")
+
+    @classmethod
+    def _get_request_body_rep(cls: type, request_state: RequestState) -> Dict[str, Any]:
+        # ** info: the request body is added to every log of the request, so the streamed and the big bodies are left out
+        if request_state.is_body_streamed is True:
+            return {"streamed": True}
+
+        if len(request_state.body) > configs.app_logging_request_body_max_bytes:
+            return {"truncated": True, "bodyBytes": len(request_state.body)}
+
+        return cls._redact(value=request_state.json_body)
+
+    @classmethod
+    def _redact(cls: type, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: REDACTED_BODY_VALUE if key in REDACTED_BODY_FIELDS else cls._redact(value=item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls._redact(value=item) for item in value]
+        if isinstance(value, str):
+            return REDACTED_QUERY_ARGUMENT_PATTERN.sub(rf'\1\2"{REDACTED_BODY_VALUE}"', value)
+        return value
+
+    @staticmethod
+    def _is_route_captured(endpoint_url: str) -> bool:
+        # ** info: the sampling is decided before the app runs, so a skipped request doesn't pay for the capture at all
+        if endpoint_url.split("?")[0] in configs.app_logging_response_body_exclude:
+            return False
+
+        return random.random() < configs.app_logging_response_body_sample_rate
+
+    @staticmethod
+    def _is_content_type_captured(content_type: str) -> bool:
+        return content_type.split(";")[0].strip().lower() in configs.app_logging_response_body_content_types
@@ -0,0 +1,168 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import time
+import re
+
+# ** info: typing imports
+from typing import Union
+from typing import Tuple
+from typing import Self
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Any
+
+# ** info: starlette imports
+from starlette.routing import BaseRoute
+from starlette.routing import Mount
+from starlette.routing import Match
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
+
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
+
+# ** info: artifacts imports
+from src.artifacts.metrics.metrics_registry import metrics_registry
+from src.artifacts.metrics.metrics_registry import MetricFamily
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["RequestMetrics"]
+
+REQUEST_LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+GRAPHQL_ROOT_FIELD_PATTERN: re.Pattern = re.compile(r"^\s*(?:(query|mutation|subscription)\b[^{]*)?{\s*(\w+)")
+MAX_GRAPHQL_OPERATIONS: int = 128
+MAX_CACHED_ROUTES: int = 1024
+UNMATCHED_ROUTE: str = "unmatched"
+
+
+class RequestMetrics:
+
+    """request metrics
+    this class provides a request metrics asgi middleware for fastapi based applications, it counts
+    the requests, their statuses and latencies per route and per graphql operation, and keeps the
+    in flight requests gauges on the metrics registry
+    """
+
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+        self._routes_cache: Dict[str, str] = dict()
+        self._graphql_operations: Set[str] = set()
+
+        self._requests: MetricFamily = metrics_registry.counter(
+            name="http_requests_total", description="handled http requests", label_names=("route", "method", "status")
+        )
+        self._requests_latency: MetricFamily = metrics_registry.histogram(
+            name="http_request_duration_seconds",
+            description="http requests latency in seconds",
+            label_names=("route", "method"),
+            bounds=REQUEST_LATENCY_BUCKETS_SECONDS,
+        )
+        self._requests_in_flight: MetricFamily = metrics_registry.gauge(
+            name="http_requests_in_flight", description="http requests being handled", label_names=("route",)
+        )
+        self._graphql_operations_requests: MetricFamily = metrics_registry.counter(
+            name="graphql_operations_total", description="handled graphql operations", label_names=("operation", "status")
+        )
+        self._graphql_operations_latency: MetricFamily = metrics_registry.histogram(
+            name="graphql_operation_duration_seconds",
+            description="graphql operations latency in seconds",
+            label_names=("operation",),
+            bounds=REQUEST_LATENCY_BUCKETS_SECONDS,
+        )
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
+
+        if request_state.endpoint_url in configs.app_metrics_middleware_exclude:
+            await self.app(scope, request_state.receive, send)
+            return
+
+        route: str = self._resolve_route(scope=scope)
+        graphql_operation: Union[None, str] = self._resolve_graphql_operation(request_state=request_state)
+        response_status: int = 500
+        request_start: float = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        self._requests_in_flight.increment(labels=(route,))
+
+        try:
+            await self.app(scope, request_state.receive, send_wrapper)
+
+        finally:
+            latency: float = time.perf_counter() - request_start
+
+            self._requests_in_flight.increment(labels=(route,), value=-1.0)
+            self._requests.increment(labels=(route, scope["method"], str(response_status)))
+            self._requests_latency.observe(labels=(route, scope["method"]), value=latency)
+
+            if graphql_operation is not None:
+                self._graphql_operations_requests.increment(labels=(graphql_operation, str(response_status)))
+                self._graphql_operations_latency.observe(labels=(graphql_operation,), value=latency)
+
+    def _resolve_route(self: Self, scope: Scope) -> str:
+        # ** info: the requests are labeled with the route path template instead of the raw path, so the metrics series stay bounded
+        route: Union[None, str] = self._routes_cache.get(scope["path"])
+
+        if route is None:
+            route = _match_route(routes=scope["app"].router.routes, scope=scope) if "app" in scope else None
+
+            if route is None:
+                return UNMATCHED_ROUTE
+
+            if len(self._routes_cache) < MAX_CACHED_ROUTES:
+                self._routes_cache[scope["path"]] = route
+
+        return route
+
+    def _resolve_graphql_operation(self: Self, request_state: RequestState) -> Union[None, str]:
+        body: Dict[str, Any] = request_state.json_body
+
+        if not isinstance(body.get("query"), str):
+            return None
+
+        operation: Union[None, str] = body.get("operationName")
+
+        if not isinstance(operation, str):
+            operation_match: Union[None, re.Match] = GRAPHQL_ROOT_FIELD_PATTERN.match(body["query"])
+            operation = f"{operation_match.group(1) or 'query'} {operation_match.group(2)}" if operation_match else "unknown"
+
+        # ** info: the operations names come from the clients, so only a bounded number of them gets its own series
+        if operation not in self._graphql_operations:
+            if len(self._graphql_operations) >= MAX_GRAPHQL_OPERATIONS:
+                return "other"
+            self._graphql_operations.add(operation)
+
+        return operation
+
+
+def _match_route(routes: List[BaseRoute], scope: Scope) -> Union[None, str]:
+    for route in routes:
+        match, child_scope = route.matches(scope)
+
+        if match == Match.NONE:
+            continue
+
+        if isinstance(route, Mount):
+            mounted_route: Union[None, str] = _match_route(routes=route.routes, scope={**scope, **child_scope})
+            return f"{route.path}{mounted_route}" if mounted_route is not None else None
+
+        return getattr(route, "path_format", None)
+
+    return None
@@ -0,0 +1,146 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import logging
+import cProfile
+import asyncio
+import random
+import hmac
+import time
+
+# ** info: typing imports
+from typing import Union
+from typing import Self
+from typing import Dict
+from typing import Set
+
+# ** info: starlette imports
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+from starlette.types import ASGIApp
+
+# ** info: middlewares imports
+from src.middlewares.request_state import get_request_state
+from src.middlewares.request_state import RequestState
+
+# ** info: artifacts imports
+from src.artifacts.profiling.profiles_store import profiles_store
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["RequestProfiler"]
+
+PROFILE_REQUEST_HEADER: str = "x-profile-request"
+PROFILE_NAME_HEADER: bytes = b"x-profile-name"
+
+MAX_TRACKED_ROUTES: int = 256
+
+
+class RequestProfiler:
+
+    """request profiler
+    this class provides a request profiling asgi middleware for fastapi based applications, the
+    requests that send the profiling token header are always profiled, the other requests are only
+    timed and a request slower than the slow request threshold arms its route, so the next request
+    to that route is profiled and kept when it is slow too, a sample of the requests can also be
+    profiled, the profiler traces the whole event loop thread, so a single request is profiled at a time
+    """
+
+    def __init__(self: Self, app: ASGIApp):
+        self.app: ASGIApp = app
+        self._is_profiling: bool = False
+        self._armed_routes: Set[str] = set()
+        self._last_captures: Dict[str, float] = dict()
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_state: RequestState = await get_request_state(scope=scope, receive=receive)
+        is_profile_requested: bool = self._is_profile_requested(request_state=request_state)
+        route: str = request_state.endpoint_url.split("?")[0]
+
+        if self._is_profiling is True or (is_profile_requested is False and self._is_profile_triggered(route=route) is False):
+            if is_profile_requested is True:
+                logging.warning(f"request with id {request_state.internal_id} not profiled, another request is being profiled")
+            await self._run_timed(scope=scope, request_state=request_state, send=send, route=route)
+            return
+
+        self._armed_routes.discard(route)
+
+        profile_name: str = profiles_store.get_profile_name(internal_id=request_state.internal_id)
+        profiler: cProfile.Profile = cProfile.Profile()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and is_profile_requested is True:
+                message = {**message, "headers": [*message.get("headers", list()), (PROFILE_NAME_HEADER, profile_name.encode("latin-1"))]}
+            await send(message)
+
+        self._is_profiling = True
+        request_start: float = time.perf_counter()
+        profiler.enable()
+
+        try:
+            await self.app(scope, request_state.receive, send_wrapper)
+
+        finally:
+            profiler.disable()
+            self._is_profiling = False
+            latency_ms: float = (time.perf_counter() - request_start) * 1000
+
+            if is_profile_requested is False and latency_ms >= configs.app_request_profiler_slow_request_threshold_ms:
+                self._record_capture(route=route)
+
+            if is_profile_requested is True or latency_ms >= configs.app_request_profiler_slow_request_threshold_ms:
+                await self._save_profile(profiler=profiler, request_state=request_state, latency_ms=latency_ms)
+
+    async def _run_timed(self: Self, scope: Scope, request_state: RequestState, send: Send, route: str) -> None:
+        # ** info: the unprofiled requests only pay for two clock reads, a slow one arms its route for the next request
+        request_start: float = time.perf_counter()
+
+        try:
+            await self.app(scope, request_state.receive, send)
+
+        finally:
+            if (time.perf_counter() - request_start) * 1000 >= configs.app_request_profiler_slow_request_threshold_ms:
+                self._arm_route(route=route)
+
+    def _arm_route(self: Self, route: str) -> None:
+        # ** info: a route stays quiet for the cooldown after a captured profile, so a route that is always slow isn't always profiled
+        if time.monotonic() - self._last_captures.get(route, float("-inf")) < configs.app_request_profiler_slow_request_cooldown:
+            return
+
+        if route in self._armed_routes or len(self._armed_routes) >= MAX_TRACKED_ROUTES:
+            return
+
+        logging.info(f"slow request on {route}, its next request will be profiled")
+        self._armed_routes.add(route)
+
+    def _record_capture(self: Self, route: str) -> None:
+        if route in self._last_captures or len(self._last_captures) < MAX_TRACKED_ROUTES:
+            self._last_captures[route] = time.monotonic()
+
+    def _is_profile_triggered(self: Self, route: str) -> bool:
+        return route in self._armed_routes or random.random() < configs.app_request_profiler_sample_rate
+
+    async def _save_profile(self: Self, profiler: cProfile.Profile, request_state: RequestState, latency_ms: float) -> None:
+        try:
+            # ** info: the profile is written on a worker thread, so the event loop doesn't wait for the disk
+            await asyncio.to_thread(profiles_store.save_profile, profiler=profiler, internal_id=request_state.internal_id)
+            logging.warning(f"request with id {request_state.internal_id} profiled, it took {latency_ms:.2f} ms")
+
+        except OSError as exception:
+            logging.error(f"unable to save the profile of the request with id {request_state.internal_id}: {exception!r}")
+
+    @staticmethod
+    def _is_profile_requested(request_state: RequestState) -> bool:
+        profile_token: Union[None, str] = request_state.headers.get(PROFILE_REQUEST_HEADER)
+
+        # ** info: the profiling on demand stays disabled while no token is configured
+        if profile_token is None or configs.app_request_profiler_token == "":
+            return False
+
+        return hmac.compare_digest(profile_token.encode("latin-1"), configs.app_request_profiler_token.encode("latin-1"))
@@ -0,0 +1,128 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: python imports
+import logging
+import json
+
+# ** info: typing imports
+from typing import MutableMapping
+from typing import Union
+from typing import Self
+from typing import Dict
+from typing import Any
+
+# ** info: starlette imports
+from starlette.types import Receive
+from starlette.types import Message
+from starlette.types import Scope
+
+# ** info: artifacts imports
+from src.artifacts.datetime.datetime_provider import datetime_provider
+from src.artifacts.uuid.uuid_provider import uuid_provider
+from src.artifacts.env.configs import configs
+
+__all__: list[str] = ["get_request_state", "RequestState"]
+
+REQUEST_STATE_KEY: str = "request_state"
+
+
+class RequestState:
+
+    """request state
+    this class keeps the per request data shared by the middlewares, including the request body
+    that is read once from the server and replayed to the next middlewares and to the app, the
+    streamed bodies aren't buffered and are received straight from the server by the app
+    """
+
+    def __init__(self: Self, scope: Scope, body: bytes, receive: Receive, is_body_streamed: bool = False):
+        # ** info: the streamed bodies have nothing to replay, all their messages come from the server
+        self._receive: Receive = receive
+        self._is_body_replayed: bool = is_body_streamed
+
+        self.is_body_streamed: bool = is_body_streamed
+
+        self.start_time: str = datetime_provider.get_utc_pretty_string()
+        self.internal_id: str = uuid_provider.get_str_uuid()
+        self.body: bytes = body
+
+        self.headers: Dict[str, str] = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        self.external_id: str = self.headers.get("requestid", self.internal_id)
+
+        self.full_url: str = self._build_full_url(scope=scope)
+        self.endpoint_url: str = scope["path"].strip().lstrip("/").lower()
+
+        if scope.get("query_string"):
+            self.endpoint_url = f"{self.endpoint_url}?{scope['query_string'].decode('latin-1').lower()}"
+
+        self._json_body: Union[None, Dict[str, Any]] = None
+
+    @property
+    def json_body(self: Self) -> Dict[str, Any]:
+        if self._json_body is None:
+            try:
+                self._json_body = dict(json.loads(self.body)) if self.body else dict()
+            except (ValueError, TypeError):
+                logging.debug("request body isn't a json object, setting default one in request state")
+                self._json_body = {"default": "dictionary"}
+
+        return self._json_body
+
+    async def receive(self: Self) -> Message:
+        # ** info: the buffered body is handed once to each middleware chain, the next messages come from the server
+        if self._is_body_replayed is False:
+            self._is_body_replayed = True
+            return {"type": "http.request", "body": self.body, "more_body": False}
+
+        return await self._receive()
+
+    @staticmethod
+    def _build_full_url(scope: Scope) -> str:
+        host: str = next((value.decode("latin-1") for key, value in scope["headers"] if key == b"host"), "")
+
+        if host == "" and scope.get("server") is not None:
+            host = f"{scope['server'][0]}:{scope['server'][1]}"
+
+        full_url: str = f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}{scope['path']}"
+
+        if scope.get("query_string"):
+            full_url = f"{full_url}?{scope['query_string'].decode('latin-1')}"
+
+        return full_url
+
+
+async def get_request_state(scope: Scope, receive: Receive) -> RequestState:
+    """get request state
+    this function returns the state of the request, creating it and buffering the request body
+    the first time a middleware asks for it
+    args:
+    - scope (scope): the asgi connection scope
+    - receive (receive): the asgi receive callable of the calling middleware
+    returns:
+    - RequestState: the shared request state
+    """
+
+    scope_state: MutableMapping[str, Any] = scope.setdefault("state", dict())
+
+    if REQUEST_STATE_KEY not in scope_state and _is_body_streamed(scope=scope) is True:
+        scope_state[REQUEST_STATE_KEY] = RequestState(scope=scope, body=b"", receive=receive, is_body_streamed=True)
+
+    elif REQUEST_STATE_KEY not in scope_state:
+        body_chunks: list[bytes] = list()
+        more_body: bool = True
+
+        while more_body:
+            message: Message = await receive()
+            if message["type"] != "http.request":
+                break
+            body_chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        scope_state[REQUEST_STATE_KEY] = RequestState(scope=scope, body=b"".join(body_chunks), receive=receive)
+
+    return scope_state[REQUEST_STATE_KEY]
+
+
+def _is_body_streamed(scope: Scope) -> bool:
+    # ** info: the streamed routes bodies can be bigger than the memory the app should hold per request
+    return scope["path"].strip().lstrip("/").lower() in configs.app_streamed_request_body_routes
@@ -0,0 +1,58 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: typing imports
+from typing import Self
+
+# ** info: artifacts imports
+from src.artifacts.metrics.metrics_registry import metrics_registry
+from src.artifacts.logging.custom_logger import custom_logger
+from src.artifacts.pattern.singleton import Singleton
+
+# ** info: databases health monitor imports
+from src.database.database_health_monitor import database_health_monitor
+
+# ** info: cache provider imports
+from src.database.cache_database.cache_provider import cache_provider
+
+# ** info: providers imports
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ** info: internal stats dtos imports
+from src.dtos.internal_stats_dtos import DatabasesHealthStatsResponseDto
+from src.dtos.internal_stats_dtos import DatabasePoolsStatsResponseDto
+from src.dtos.internal_stats_dtos import DatabasePoolStatsDto
+from src.dtos.internal_stats_dtos import LoggingStatsResponseDto
+from src.dtos.internal_stats_dtos import CacheStatsResponseDto
+
+__all__: list[str] = ["internal_stats_controller"]
+
+
+class InternalStatsController(metaclass=Singleton):
+    async def get_database_pools_stats(self: Self) -> DatabasePoolsStatsResponseDto:
+        database_pools_stats: DatabasePoolsStatsResponseDto = DatabasePoolsStatsResponseDto(
+            usersDatabase=DatabasePoolStatsDto(**users_provider.connection_manager.get_pool_statistics()),
+            tvDatabase=DatabasePoolStatsDto(**tv_programattion_provider.connection_manager.get_pool_statistics()),
+        )
+
+        return database_pools_stats
+
+    async def get_cache_stats(self: Self) -> CacheStatsResponseDto:
+        cache_stats: CacheStatsResponseDto = CacheStatsResponseDto(**cache_provider.get_statistics())
+        return cache_stats
+
+    async def get_databases_health_stats(self: Self) -> DatabasesHealthStatsResponseDto:
+        databases_health_stats: DatabasesHealthStatsResponseDto = DatabasesHealthStatsResponseDto(**database_health_monitor.get_statistics())
+        return databases_health_stats
+
+    async def get_logging_stats(self: Self) -> LoggingStatsResponseDto:
+        logging_stats: LoggingStatsResponseDto = LoggingStatsResponseDto(**custom_logger.get_statistics())
+        return logging_stats
+
+    async def get_metrics(self: Self) -> str:
+        metrics: str = metrics_registry.render()
+        return metrics
+
+
+internal_stats_controller: InternalStatsController = InternalStatsController()
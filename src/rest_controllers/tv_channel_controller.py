@@ -1,9 +1,24 @@
 # !/usr/bin/python3
 # type: ignore
 
+# ** info: python imports
+from datetime import datetime
+import logging
+
 # ** info: typing imports
+from typing import AsyncIterator
+from typing import Tuple
 from typing import Self
 from typing import List
+from typing import Dict
+from typing import Set
+from typing import Any
+
+# ** info: pydantic imports
+from pydantic import ValidationError
+
+# **info: sqlalchemy exc imports
+from sqlalchemy.exc import SQLAlchemyError
 
 # ** info: artifacts imports
 from src.artifacts.datetime.datetime_provider import datetime_provider
@@ -17,21 +32,36 @@ from src.database.cache_database.cache_provider import cache_provider
 from src.database.postgres.tv_channel_provider import tv_programattion_provider
 
 # ** info: health check dtos imports
+from src.dtos.tv_programmation_dtos import TvProgrammationBulkAddResponseDto
+from src.dtos.tv_programmation_dtos import TvProgrammationBulkAddErrorDto
 from src.dtos.tv_programmation_dtos import TvProgrammationSearchRequestDto
 from src.dtos.tv_programmation_dtos import TvProgrammationAddRequestDto
 from src.dtos.tv_programmation_dtos import TvProgrammationResponseDto
 
 __all__: list[str] = ["tv_channel_controller"]
 
+TV_PROGRAMATION_CACHE_TAG: str = "tv_programation"
+
+
+def _tv_programattion_channel_cache_tag(channel_id: int) -> str:
+    return f"{TV_PROGRAMATION_CACHE_TAG}:channel:{channel_id}"
+
+
+def _tv_programattion_search_cache_tags(self: Any, tv_programmation_search_request: TvProgrammationSearchRequestDto) -> List[str]:
+    # ** info: the searches filtered by channel only depend on that channel programmation
+    if tv_programmation_search_request.channelId is not None:
+        return [_tv_programattion_channel_cache_tag(channel_id=tv_programmation_search_request.channelId)]
+    return [TV_PROGRAMATION_CACHE_TAG]
+
 
 class HealthCheckController(metaclass=Singleton):
-    @cache_provider.ttl_cache(ttl=30)
+    @cache_provider.ttl_cache(ttl=300, soft_ttl=30, l1_ttl=5, l1_max_entries=512, tags=_tv_programattion_search_cache_tags)
     async def search_tv_programattion(
         self: Self, tv_programmation_search_request: TvProgrammationSearchRequestDto
     ) -> List[TvProgrammationResponseDto]:
         search_tv_programmation_data: List[TvProgrammationResponseDto]
 
-        search_tv_programmation_data = tv_programattion_provider.search_tv_programattion(
+        search_tv_programmation_data = await tv_programattion_provider.search_tv_programattion(
             channel_id=tv_programmation_search_request.channelId,
             channel_name=tv_programmation_search_request.channelName,
             channel_content_type=tv_programmation_search_request.channelContentType,
@@ -54,7 +84,7 @@ class HealthCheckController(metaclass=Singleton):
         channel_name = tv_programmation_add_request.channelName.lower()
         channel_content_type = tv_programmation_add_request.channelContentType.lower()
 
-        new_tv_programmation_data = tv_programattion_provider.add_tv_programattion(
+        new_tv_programmation_data = await tv_programattion_provider.add_tv_programattion(
             programation_id=programation_id,
             channel_id=tv_programmation_add_request.channelId,
             channel_name=channel_name,
@@ -68,7 +98,114 @@ class HealthCheckController(metaclass=Singleton):
             creation=creation,
         )
 
+        await cache_provider.invalidate_tags(
+            tags=[TV_PROGRAMATION_CACHE_TAG, _tv_programattion_channel_cache_tag(channel_id=tv_programmation_add_request.channelId)]
+        )
+
         return new_tv_programmation_data
 
+    async def add_tv_programattion_bulk(
+        self: Self, tv_programmation_add_requests: AsyncIterator[Tuple[int, Any]], chunk_size: int
+    ) -> TvProgrammationBulkAddResponseDto:
+        """add tv programattion bulk
+        this function validates the received programmation items one by one and inserts the valid
+        ones in batched transactions of chunk size items, so a failed item or chunk never stops the
+        rest of the ingestion
+        args:
+        - tv_programmation_add_requests (async iterator[tuple[int, any]]): the item indexes with their raw json text or parsed json
+        - chunk_size (int): the number of programmations inserted per transaction
+        returns:
+        - TvProgrammationBulkAddResponseDto: the inserted and failed counts and the per item errors
+        """
+
+        errors: List[TvProgrammationBulkAddErrorDto] = list()
+        channel_ids: Set[int] = set()
+        chunk_indexes: List[int] = list()
+        chunk: List[Dict[str, Any]] = list()
+        inserted_count: int = 0
+
+        modification: str = datetime_provider.get_utc_iso_string()
+        creation: str = datetime_provider.get_utc_iso_string()
+
+        async for index, raw_tv_programmation_add_request in tv_programmation_add_requests:
+            try:
+                tv_programmation_add_request: TvProgrammationAddRequestDto = self._validate_tv_programattion(raw_tv_programmation_add_request)
+            except ValueError as error:
+                errors.append(TvProgrammationBulkAddErrorDto(index=index, detail=self._describe_validation_error(error)))
+                continue
+
+            chunk.append(self._build_tv_programation_row(tv_programmation_add_request, creation=creation, modification=modification))
+            chunk_indexes.append(index)
+            channel_ids.add(tv_programmation_add_request.channelId)
+
+            if len(chunk) >= chunk_size:
+                inserted_count += await self._add_tv_programattion_chunk(chunk=chunk, chunk_indexes=chunk_indexes, errors=errors)
+                chunk_indexes = list()
+                chunk = list()
+
+        inserted_count += await self._add_tv_programattion_chunk(chunk=chunk, chunk_indexes=chunk_indexes, errors=errors)
+
+        logging.info(f"{inserted_count} tv programmations added, {len(errors)} tv programmations rejected")
+
+        if inserted_count > 0:
+            channel_tags: List[str] = [_tv_programattion_channel_cache_tag(channel_id=channel_id) for channel_id in sorted(channel_ids)]
+            await cache_provider.invalidate_tags(tags=[TV_PROGRAMATION_CACHE_TAG, *channel_tags])
+
+        return TvProgrammationBulkAddResponseDto(
+            insertedCount=inserted_count,
+            failedCount=len(errors),
+            errors=sorted(errors, key=lambda error: error.index),
+        )
+
+    async def _add_tv_programattion_chunk(
+        self: Self, chunk: List[Dict[str, Any]], chunk_indexes: List[int], errors: List[TvProgrammationBulkAddErrorDto]
+    ) -> int:
+        try:
+            return await tv_programattion_provider.add_tv_programattions(tv_programations=chunk)
+        except SQLAlchemyError:
+            logging.exception(f"unable to insert a chunk of {len(chunk)} tv programmations")
+            errors.extend(
+                TvProgrammationBulkAddErrorDto(index=index, detail="the chunk containing this item couldn't be inserted") for index in chunk_indexes
+            )
+            return 0
+
+    def _validate_tv_programattion(self: Self, raw_tv_programmation_add_request: Any) -> TvProgrammationAddRequestDto:
+        tv_programmation_add_request: TvProgrammationAddRequestDto
+
+        if isinstance(raw_tv_programmation_add_request, (bytes, str)):
+            tv_programmation_add_request = TvProgrammationAddRequestDto.model_validate_json(raw_tv_programmation_add_request)
+        else:
+            tv_programmation_add_request = TvProgrammationAddRequestDto.model_validate(raw_tv_programmation_add_request)
+
+        for houre in (tv_programmation_add_request.startHoure, tv_programmation_add_request.endHoure):
+            try:
+                datetime.strptime(houre, "%H:%M:%S")
+            except ValueError:
+                raise ValueError(f"houre {houre} doesn't match the hh:mm:ss format")
+
+        return tv_programmation_add_request
+
+    def _describe_validation_error(self: Self, error: ValueError) -> str:
+        if isinstance(error, ValidationError):
+            return "; ".join(f"{'.'.join(map(str, detail['loc'])) or 'item'}: {detail['msg']}" for detail in error.errors())
+        return str(error.args[0])
+
+    def _build_tv_programation_row(
+        self: Self, tv_programmation_add_request: TvProgrammationAddRequestDto, creation: str, modification: str
+    ) -> Dict[str, Any]:
+        return {
+            "programation_id": uuid_provider.get_str_uuid(),
+            "channel_id": tv_programmation_add_request.channelId,
+            "channel_name": tv_programmation_add_request.channelName.lower(),
+            "channel_content_type": tv_programmation_add_request.channelContentType.lower(),
+            "start_houre": tv_programmation_add_request.startHoure,
+            "end_houre": tv_programmation_add_request.endHoure,
+            "weeks": tv_programmation_add_request.weeks,
+            "days": tv_programmation_add_request.days,
+            "year": tv_programmation_add_request.year,
+            "modification": modification,
+            "creation": creation,
+        }
+
 
 tv_channel_controller: HealthCheckController = HealthCheckController()
@@ -0,0 +1,73 @@
+# !/usr/bin/python3
+# type: ignore
+
+# ** info: fastapi imports
+from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter
+from fastapi import status
+
+# ** info: artifacts imports
+from src.artifacts.path.generator import generator
+
+# ** info: internal stats dtos imports
+from src.dtos.internal_stats_dtos import DatabasesHealthStatsResponseDto
+from src.dtos.internal_stats_dtos import DatabasePoolsStatsResponseDto
+from src.dtos.internal_stats_dtos import LoggingStatsResponseDto
+from src.dtos.internal_stats_dtos import CacheStatsResponseDto
+
+# ** info: rest controllers imports
+from src.rest_controllers.internal_stats_controller import internal_stats_controller
+
+__all__: list[str] = ["internal_stats_router"]
+
+internal_stats_router: APIRouter = APIRouter(prefix=generator.build_posix_path("internal", "stats"))
+
+
+@internal_stats_router.get(
+    path=generator.build_posix_path("database-pools"),
+    response_model=DatabasePoolsStatsResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def get_database_pools_stats() -> DatabasePoolsStatsResponseDto:
+    database_pools_stats: DatabasePoolsStatsResponseDto = await internal_stats_controller.get_database_pools_stats()
+    return database_pools_stats
+
+
+@internal_stats_router.get(
+    path=generator.build_posix_path("cache"),
+    response_model=CacheStatsResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_stats() -> CacheStatsResponseDto:
+    cache_stats: CacheStatsResponseDto = await internal_stats_controller.get_cache_stats()
+    return cache_stats
+
+
+@internal_stats_router.get(
+    path=generator.build_posix_path("database-health"),
+    response_model=DatabasesHealthStatsResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def get_databases_health_stats() -> DatabasesHealthStatsResponseDto:
+    databases_health_stats: DatabasesHealthStatsResponseDto = await internal_stats_controller.get_databases_health_stats()
+    return databases_health_stats
+
+
+@internal_stats_router.get(
+    path=generator.build_posix_path("logging"),
+    response_model=LoggingStatsResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def get_logging_stats() -> LoggingStatsResponseDto:
+    logging_stats: LoggingStatsResponseDto = await internal_stats_controller.get_logging_stats()
+    return logging_stats
+
+
+@internal_stats_router.get(
+    path=generator.build_posix_path("metrics"),
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_metrics() -> PlainTextResponse:
+    metrics: str = await internal_stats_controller.get_metrics()
+    return PlainTextResponse(content=metrics, media_type="text/plain; version=0.0.4; charset=utf-8")
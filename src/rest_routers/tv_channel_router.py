@@ -1,26 +1,37 @@
 # !/usr/bin/python3
 # type: ignore
 
+# ** info: python imports
+import json
+
 # ** info: typing imports
+from typing import AsyncIterator
+from typing import Tuple
 from typing import List
+from typing import Any
 
 # ** info: fastapi imports
+from fastapi import HTTPException
 from fastapi import APIRouter
+from fastapi import Request
 from fastapi import status
+from fastapi import Query
 from fastapi import Body
 
 # ** info: artifacts imports
 from src.artifacts.path.generator import generator
+from src.artifacts.env.configs import configs
 
 # ** info: health check dtos imports
 from src.dtos.tv_programmation_dtos import TvProgrammationSearchResponsePrettyReturnDto
 from src.dtos.tv_programmation_dtos import TvProgrammationSearchResponseRawReturnDto
+from src.dtos.tv_programmation_dtos import TvProgrammationBulkAddResponseDto
 from src.dtos.tv_programmation_dtos import TvProgrammationSearchRequestDto
 from src.dtos.tv_programmation_dtos import TvProgrammationAddRequestDto
 from src.dtos.tv_programmation_dtos import TvProgrammationResponseDto
 
 # ** info: rest controllers imports
-from rest_controllers.tv_channel_controller import tv_channel_controller
+from src.rest_controllers.tv_channel_controller import tv_channel_controller
 
 __all__: list[str] = ["tv_channel_router"]
 
@@ -65,6 +76,51 @@ async def add_tv_programattion(tv_programmation_add_request: TvProgrammationAddR
     return tv_programmation_response
 
 
+@tv_channel_router.post(
+    path=generator.build_posix_path("add-programmation-bulk"),
+    response_model=TvProgrammationBulkAddResponseDto,
+    status_code=status.HTTP_200_OK,
+)
+async def add_tv_programattion_bulk(
+    request: Request,
+    chunkSize: int = Query(default=configs.tv_database_bulk_chunk_size, ge=1),
+) -> TvProgrammationBulkAddResponseDto:
+    tv_programmation_response: TvProgrammationBulkAddResponseDto = await tv_channel_controller.add_tv_programattion_bulk(
+        tv_programmation_add_requests=_read_bulk_items(request=request),
+        chunk_size=chunkSize,
+    )
+    return tv_programmation_response
+
+
+async def _read_bulk_items(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    # ** info: ndjson bodies are split line by line while they arrive from the server, the middlewares don't buffer them since
+    # ** info: the route is listed on the streamed request body routes, json bodies must be a single array of items
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        pending_line: bytes = b""
+        index: int = 0
+        async for chunk in request.stream():
+            lines: List[bytes] = (pending_line + chunk).split(b"\n")
+            pending_line = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if pending_line.strip():
+            yield index, pending_line
+        return
+
+    try:
+        items: Any = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="the request body isn't valid json")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="the request body must be a json array")
+
+    for index, item in enumerate(items):
+        yield index, item
+
+
 def _minutos_entre_horas(hora1, hora2):
     hh1, mm1, ss1 = map(int, hora1.split(":"))
     hh2, mm2, ss2 = map(int, hora2.split(":"))
@@ -0,0 +1,136 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import argparse
+import json
+import time
+
+# ** info: typing imports
+from typing import Callable
+from typing import List
+from typing import Dict
+from typing import Any
+
+# ** info: loguru imports
+from loguru import logger
+
+# ** info: artifacts imports
+from src.artifacts.datetime.datetime_provider import datetime_provider
+from src.artifacts.logging.record_encoder import RecordEncoder
+from src.artifacts.uuid.uuid_provider import uuid_provider
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: log serializer benchmark, compares the records per second of the former structured logs serializer and the
+# ** info: record encoder on the same loguru records, run it with python test/benchmark_log_serializer.py
+# ---------------------------------------------------------------------------------------------------------------------
+
+APP_INSTANCE_ID: str = uuid_provider.get_str_uuid()
+
+
+def legacy_serializer(record: Dict[str, Any]) -> str:
+    # ** info: the former serializer, it builds every field and the timestamp again for each record and dumps them with json
+    subset: Dict[str, Any] = {
+        "loggId": uuid_provider.get_str_uuid(),
+        "severity": record["level"].name,
+        "timestamp": datetime_provider.get_utc_pretty_string(),
+        "message": record["message"],
+        "execution": {
+            "group": record["extra"]["group"],
+            "function": record["function"],
+            "module": record["module"],
+            "line": record["line"],
+            "processName": record["process"].name,
+            "processId": record["process"].id,
+            "threadName": record["thread"].name,
+            "threadId": record["thread"].id,
+            "filePath": record["file"].path,
+            "fileName": record["file"].name,
+        },
+        "request": {
+            "externalId": record["extra"]["externalId"],
+            "internalId": record["extra"]["internalId"],
+            "body": record["extra"]["requestBody"],
+            "headers": record["extra"]["requestHeaders"],
+            "endpointUrl": record["extra"]["endpointUrl"],
+            "fullUrl": record["extra"]["fullUrl"],
+            "startTime": record["extra"]["startTime"],
+        },
+        "response": {
+            "body": record["extra"]["responseBody"],
+            "headers": record["extra"]["responseHeaders"],
+            "status": record["extra"]["responseCode"],
+            "endTime": record["extra"]["endTime"],
+        },
+        "app": {
+            "name": record["extra"]["appName"],
+            "id": record["extra"]["appInstanceId"],
+            "aliveTime": datetime_provider.prettify_time_delta_obj(record["elapsed"]),
+        },
+    }
+
+    return json.dumps(subset)
+
+
+def build_records(count: int) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = list()
+    handler_id: int = logger.add(lambda message: records.append(message.record), level="INFO")
+
+    with logger.contextualize(
+        internalId=uuid_provider.get_str_uuid(),
+        externalId=uuid_provider.get_str_uuid(),
+        appInstanceId=APP_INSTANCE_ID,
+        appName="users_crud_api_python",
+        responseHeaders={"content-type": "application/json", "content-length": "1024"},
+        requestHeaders={"host": "localhost:10048", "accept": "*/*", "user-agent": "benchmark"},
+        responseBody={"data": {"searchUsers": [{"uuid": uuid_provider.get_str_uuid(), "email": "user@mail.com"}]}},
+        responseCode=200,
+        requestBody={"query": "query { searchUsers(userData: {limit: 10, offset: 0}) { uuid email } }"},
+        endpointUrl="graphql/users",
+        startTime=datetime_provider.get_utc_pretty_string(),
+        endTime=datetime_provider.get_utc_pretty_string(),
+        fullUrl="http://localhost:10048/graphql/users",
+        group="undefined",
+    ):
+        for index in range(count):
+            logger.info(f"response details to request {index}")
+
+    logger.remove(handler_id)
+
+    return records
+
+
+def measure_records_per_second(serializer: Callable[[Dict[str, Any]], str], records: List[Dict[str, Any]]) -> float:
+    for record in records[:100]:
+        serializer(record)
+
+    start: float = time.perf_counter()
+
+    for record in records:
+        serializer(record)
+
+    return len(records) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="structured logs serializer records per second benchmark")
+    argument_parser.add_argument("--records", type=int, default=50000, help="number of measured records per serializer")
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    logger.remove()
+
+    records: List[Dict[str, Any]] = build_records(count=arguments.records)
+    record_encoder: RecordEncoder = RecordEncoder(app_name="users_crud_api_python", app_instance_id=APP_INSTANCE_ID)
+
+    serializers: Dict[str, Callable[[Dict[str, Any]], str]] = {
+        "json serializer (before)": legacy_serializer,
+        "record encoder (after)": record_encoder.encode,
+    }
+
+    for name, serializer in serializers.items():
+        print(f"{name:<32} {measure_records_per_second(serializer=serializer, records=records):>10.0f} records/second")
@@ -0,0 +1,150 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import argparse
+import asyncio
+import logging
+import time
+
+# ** info: typing imports
+from typing import Callable
+from typing import List
+from typing import Dict
+from typing import Any
+
+# ** info: starlette imports
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.types import ASGIApp
+from starlette.types import Message
+
+# ** info: middlewares imports
+from src.middlewares.authentication_handler import AuthenticationHandler
+from src.middlewares.logger_contextualizer import LoggerContextualizer
+from src.middlewares.database_health_check import DatabaseHealthCheck
+from src.middlewares.request_metrics import RequestMetrics
+from src.middlewares.error_handler import ErrorHandler
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: middlewares benchmark, compares the requests per second of a trivial endpoint behind the former four
+# ** info: base http middlewares chain, behind the asgi middlewares chain and behind the asgi middlewares chain with the
+# ** info: request metrics middleware, run it with python test/benchmark_middlewares.py
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+async def ping(request: Request) -> Response:
+    return PlainTextResponse(content='{"ping": "pong"}', media_type="application/json")
+
+
+async def legacy_dispatch(request: Request, call_next: Callable) -> Response:
+    # ** info: the former middlewares pattern, each dispatcher buffers the body again and runs the next ones through call_next
+    body: bytes = await request.body()
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request._receive = receive
+
+    return await call_next(request)
+
+
+def build_app(middlewares: List[Middleware]) -> ASGIApp:
+    return Starlette(routes=[Route(path="/ping", endpoint=ping, methods=["POST"])], middleware=middlewares)
+
+
+def build_scope() -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json")],
+        "server": ("benchmark", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+async def call_app(app: ASGIApp) -> None:
+    body_chunks: List[Message] = [
+        {"type": "http.request", "body": b'{"search": ', "more_body": True},
+        {"type": "http.request", "body": b'"value"}', "more_body": False},
+    ]
+
+    async def receive() -> Message:
+        if len(body_chunks) > 0:
+            return body_chunks.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(build_scope(), receive, send)
+
+
+async def measure_requests_per_second(app: ASGIApp, requests: int, concurrency: int) -> float:
+    for _ in range(min(requests, 100)):
+        await call_app(app=app)
+
+    start: float = time.perf_counter()
+
+    for _ in range(requests // concurrency):
+        await asyncio.gather(*[call_app(app=app) for _ in range(concurrency)])
+
+    return (requests // concurrency) * concurrency / (time.perf_counter() - start)
+
+
+async def run_benchmark(requests: int, concurrency: int) -> Dict[str, float]:
+    apps: Dict[str, ASGIApp] = {
+        "no middlewares": build_app(middlewares=list()),
+        "base http middlewares (before)": build_app(middlewares=[Middleware(BaseHTTPMiddleware, dispatch=legacy_dispatch) for _ in range(4)]),
+        "asgi middlewares (after)": build_app(
+            middlewares=[
+                Middleware(LoggerContextualizer),
+                Middleware(ErrorHandler),
+                Middleware(AuthenticationHandler),
+                Middleware(DatabaseHealthCheck),
+            ]
+        ),
+        "asgi middlewares with metrics": build_app(
+            middlewares=[
+                Middleware(RequestMetrics),
+                Middleware(LoggerContextualizer),
+                Middleware(ErrorHandler),
+                Middleware(AuthenticationHandler),
+                Middleware(DatabaseHealthCheck),
+            ]
+        ),
+    }
+
+    return {name: await measure_requests_per_second(app=app, requests=requests, concurrency=concurrency) for name, app in apps.items()}
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="middlewares chain requests per second benchmark")
+    argument_parser.add_argument("--requests", type=int, default=5000, help="number of measured requests per chain")
+    argument_parser.add_argument("--concurrency", type=int, default=1, help="number of concurrent requests")
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    # ** info: the logs are disabled so the benchmark only measures the middlewares overhead
+    logging.disable(logging.CRITICAL)
+
+    results: Dict[str, float] = asyncio.run(run_benchmark(requests=arguments.requests, concurrency=arguments.concurrency))
+
+    for name, requests_per_second in results.items():
+        print(f"{name:<32} {requests_per_second:>10.0f} requests/second")
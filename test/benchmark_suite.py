@@ -0,0 +1,274 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import argparse
+import platform
+import asyncio
+import logging
+import json
+import time
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Union
+from typing import List
+from typing import Dict
+from typing import Any
+
+# ** info: starlette imports
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp
+
+# ** info: dtos imports
+from src.dtos.users_dtos import UsersPageDto
+from src.dtos.users_dtos import PageInfoDto
+from src.dtos.users_dtos import UserDto
+
+# ** info: cache database imports
+from src.database.cache_database.cache_provider import cache_provider
+from src.database.cache_database.cache_codec import cache_codec
+
+# ** info: providers imports
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ** info: middlewares imports
+from src.middlewares.authentication_handler import AuthenticationHandler
+from src.middlewares.logger_contextualizer import LoggerContextualizer
+from src.middlewares.database_health_check import DatabaseHealthCheck
+from src.middlewares.request_metrics import RequestMetrics
+from src.middlewares.error_handler import ErrorHandler
+
+# ** info: stand ins and benchmarks helpers imports
+from benchmark_middlewares import build_app
+from benchmark_middlewares import call_app
+from stand_ins import use_redis_stand_in
+from stand_ins import SqliteStandIn
+from stand_ins import RedisStandIn
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: benchmark suite, measures the operations per second of the providers, the cache and the middlewares chain
+# ** info: against local stand ins and compares them with the saved baseline, run it with python test/benchmark_suite.py
+# ---------------------------------------------------------------------------------------------------------------------
+
+BASELINE_PATH: str = join(path.dirname(path.realpath(__file__)), "benchmark_baseline.json")
+
+
+def build_users_page(size: int) -> UsersPageDto:
+    users_page: UsersPageDto = UsersPageDto()
+    users_page.users = list()
+
+    for index in range(size):
+        user_dto: UserDto = UserDto()
+        user_dto.internalId = f"{index:08d}-0000-4000-8000-000000000000"
+        user_dto.estatalId = 100000000 + index
+        user_dto.firstName = "Jose"
+        user_dto.lastName = "Escobar"
+        user_dto.phoneNumber = 300000000 + index
+        user_dto.email = f"user{index}@mail.com"
+        user_dto.gender = "male"
+        user_dto.birthday = "1990-01-01"
+        users_page.users.append(user_dto)
+
+    users_page.pageInfo = PageInfoDto()
+    users_page.pageInfo.hasNextPage = True
+    users_page.pageInfo.hasPreviousPage = False
+    users_page.pageInfo.startCursor = "start"
+    users_page.pageInfo.endCursor = "end"
+
+    return users_page
+
+
+USERS_PAGE: UsersPageDto = build_users_page(size=10)
+
+
+@cache_provider.ttl_cache(ttl=600)
+async def cached_users_page(page: int) -> UsersPageDto:
+    return USERS_PAGE
+
+
+def build_benchmarks() -> Dict[str, Callable[[int], Awaitable[None]]]:
+    middlewares_app: ASGIApp = build_app(
+        middlewares=[
+            Middleware(RequestMetrics),
+            Middleware(LoggerContextualizer),
+            Middleware(ErrorHandler),
+            Middleware(AuthenticationHandler),
+            Middleware(DatabaseHealthCheck),
+        ]
+    )
+    encoded_users_page: bytes = cache_codec.encode(value=USERS_PAGE)
+
+    async def fetch_users_data(iteration: int) -> None:
+        await users_provider.fetch_users_data(
+            limit=10,
+            offset=iteration % 50,
+            internal_id=None,
+            estatal_id=None,
+            first_name="Jo",
+            last_name=None,
+            phone_number=None,
+            email=None,
+            gender="male",
+            birthday=None,
+        )
+
+    async def search_tv_programattion(iteration: int) -> None:
+        await tv_programattion_provider.search_tv_programattion(
+            channel_id=1 + 4 * (iteration % 5),
+            channel_name="spo",
+            channel_content_type=None,
+            start_houre=None,
+            end_houre=None,
+            days=None,
+            weeks=None,
+            year=2024,
+        )
+
+    async def ttl_cache_hit(iteration: int) -> None:
+        await cached_users_page(page=0)
+
+    async def ttl_cache_miss(iteration: int) -> None:
+        await cached_users_page(page=time.perf_counter_ns())
+
+    async def cache_codec_encode(iteration: int) -> None:
+        cache_codec.encode(value=USERS_PAGE)
+
+    async def cache_codec_decode(iteration: int) -> None:
+        cache_codec.decode(payload=encoded_users_page)
+
+    async def middlewares_round_trip(iteration: int) -> None:
+        await call_app(app=middlewares_app)
+
+    return {
+        "fetch_users_data": fetch_users_data,
+        "search_tv_programattion": search_tv_programattion,
+        "ttl_cache_hit": ttl_cache_hit,
+        "ttl_cache_miss": ttl_cache_miss,
+        "cache_codec_encode": cache_codec_encode,
+        "cache_codec_decode": cache_codec_decode,
+        "middlewares_round_trip": middlewares_round_trip,
+    }
+
+
+async def measure_operations_per_second(benchmark: Callable[[int], Awaitable[None]], iterations: int, rounds: int) -> float:
+    # ** info: the best round is kept, the slower rounds measure the noise of the machine instead of the code
+    best_operations_per_second: float = 0.0
+
+    for iteration in range(min(iterations, 50)):
+        await benchmark(iteration)
+
+    for _ in range(rounds):
+        start: float = time.perf_counter()
+
+        for iteration in range(iterations):
+            await benchmark(iteration)
+
+        best_operations_per_second = max(best_operations_per_second, iterations / (time.perf_counter() - start))
+
+    return best_operations_per_second
+
+
+async def run_benchmarks(iterations: int, rounds: int, selected: Union[None, List[str]] = None) -> Dict[str, float]:
+    sqlite_stand_in: SqliteStandIn = SqliteStandIn(users=5000, programmations=5000)
+    use_redis_stand_in(stand_in=RedisStandIn())
+
+    await sqlite_stand_in.start()
+
+    try:
+        return {
+            name: await measure_operations_per_second(benchmark=benchmark, iterations=iterations, rounds=rounds)
+            for name, benchmark in build_benchmarks().items()
+            if selected is None or name in selected
+        }
+
+    finally:
+        await sqlite_stand_in.stop()
+
+
+def find_regressions(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """find regressions
+    this function compares the measured operations per second with the baseline ones
+    args:
+    - results (dict): the measured operations per second by benchmark
+    - baseline (dict): the baseline operations per second by benchmark
+    - tolerance (float): the allowed slowdown ratio, 0.2 allows runs up to 20% slower than the baseline
+    returns:
+    - List[str]: the names of the benchmarks slower than the tolerance allows
+    """
+
+    return [name for name, operations_per_second in results.items() if name in baseline and operations_per_second < baseline[name] * (1 - tolerance)]
+
+
+def load_baseline() -> Dict[str, Any]:
+    if not path.exists(BASELINE_PATH):
+        return dict()
+
+    with open(BASELINE_PATH, "r") as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(results: Dict[str, float]) -> None:
+    baseline: Dict[str, Any] = {"python": platform.python_version(), "machine": platform.machine(), "benchmarks": results}
+
+    with open(BASELINE_PATH, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=4)
+        baseline_file.write("\n")
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="providers, cache and middlewares benchmark suite")
+    argument_parser.add_argument("--iterations", type=int, default=2000, help="number of measured operations per round")
+    argument_parser.add_argument("--rounds", type=int, default=3, help="number of measured rounds, the best one is kept")
+    argument_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown ratio against the baseline")
+    argument_parser.add_argument("--benchmark", action="append", help="run only the given benchmark, can be repeated")
+    argument_parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    # ** info: a missing baseline fails the run, otherwise a fresh checkout would pass without comparing anything
+    baseline: Dict[str, Any] = load_baseline()
+
+    if arguments.save_baseline is False and len(baseline) == 0:
+        print(f"no baseline found on {BASELINE_PATH}, save one with the --save-baseline flag first", file=sys.stderr)
+        sys.exit(2)
+
+    if arguments.save_baseline is False and (baseline["python"], baseline["machine"]) != (platform.python_version(), platform.machine()):
+        print(
+            f"warning: the baseline was saved with python {baseline['python']} on {baseline['machine']}, "
+            f"this run uses python {platform.python_version()} on {platform.machine()}, the comparison may be meaningless",
+            file=sys.stderr,
+        )
+
+    # ** info: the logs are disabled so the benchmarks only measure the code under test
+    logging.disable(logging.CRITICAL)
+
+    results: Dict[str, float] = asyncio.run(run_benchmarks(iterations=arguments.iterations, rounds=arguments.rounds, selected=arguments.benchmark))
+    baseline_results: Dict[str, float] = baseline.get("benchmarks", dict())
+
+    for name, operations_per_second in results.items():
+        baseline_rep: str = f"{operations_per_second / baseline_results[name] - 1:>+8.1%} vs baseline" if name in baseline_results else "no baseline"
+        print(f"{name:<28} {operations_per_second:>10.0f} operations/second {baseline_rep}")
+
+    if arguments.save_baseline is True:
+        save_baseline(results=results)
+        print(f"baseline saved on {BASELINE_PATH}")
+        sys.exit(0)
+
+    regressions: List[str] = find_regressions(results=results, baseline=baseline_results, tolerance=arguments.tolerance)
+    missing: List[str] = [name for name in results if name not in baseline_results]
+
+    if len(missing) > 0:
+        print(f"benchmarks without baseline, save a new one with the --save-baseline flag: {', '.join(missing)}", file=sys.stderr)
+
+    if len(regressions) > 0:
+        print(f"regressions beyond the {arguments.tolerance:.0%} tolerance: {', '.join(regressions)}")
+
+    if len(regressions) > 0 or len(missing) > 0:
+        sys.exit(1)
@@ -0,0 +1,322 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+from datetime import timedelta
+from datetime import timezone
+from datetime import datetime
+from datetime import date
+import hashlib
+import sqlite3
+import json
+
+# ** info: typing imports
+from typing import Callable
+from typing import Union
+from typing import List
+from typing import Dict
+from typing import Set
+from typing import Any
+
+# **info: sqlalchemy imports
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects import sqlite
+from sqlalchemy import DateTime
+from sqlalchemy import insert
+from sqlalchemy import Date
+from sqlalchemy import Time
+from sqlalchemy import text
+
+# **info: sqlalchemy asyncio imports
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import StaticPool
+
+# **info: redis exceptions imports
+from redis.exceptions import ConnectionError as AsyncConnectionError
+from redis.exceptions import NoScriptError
+
+# ** info: entities imports
+from src.entities.programmation_entity import TvProgramation
+from src.entities.users_entity import Users
+
+# ** info: cache database imports
+from src.database.cache_database.connection_manager import INVALIDATE_TAG_SCRIPT
+from src.database.cache_database.connection_manager import DELETE_IF_EQUAL_SCRIPT
+from src.database.cache_database.connection_manager import STORE_TAGGED_SCRIPT
+from src.database.cache_database.connection_manager import GET_WITH_TTL_SCRIPT
+from src.database.cache_database.connection_manager import connection_manager
+from src.database.cache_database.connection_manager import LUA_SCRIPTS
+from src.database.cache_database.connection_manager import LuaScript
+
+# ** info: providers imports
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: local databases stand ins, shared by the tests and the benchmarks so both run offline
+# ---------------------------------------------------------------------------------------------------------------------
+
+# ** info: sqlite has no array type, the tv programmation weeks and days are stored as json and parsed back into lists
+sqlite3.register_converter("INTEGER_ARRAY", json.loads)
+# ** info: the declared types parsing is only needed for the arrays, the dates are kept as text so sqlalchemy parses them itself
+sqlite3.register_converter("DATE", bytes.decode)
+
+TV_PROGRAMATION_TABLE_DDL: str = """
+CREATE TABLE tv_programation (
+    programation_id TEXT PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    channel_name TEXT NOT NULL,
+    channel_content_type TEXT NOT NULL,
+    start_houre TEXT NOT NULL,
+    end_houre TEXT NOT NULL,
+    weeks INTEGER_ARRAY NOT NULL,
+    days INTEGER_ARRAY NOT NULL,
+    year INTEGER NOT NULL,
+    creation TEXT,
+    modification TEXT
+)
+"""
+
+
+def _accepting_text(type_class: type) -> type:
+    # ** info: the providers send the dates and hours as iso strings, postgres parses them but sqlite only takes python objects
+    class TextAcceptingType(type_class):
+        def bind_processor(self, dialect: Any) -> Callable[[Any], Any]:
+            process: Union[None, Callable[[Any], Any]] = super().bind_processor(dialect)
+            return lambda value: value if isinstance(value, str) or process is None else process(value)
+
+    return TextAcceptingType
+
+
+class SqliteIntegerArray(ARRAY):
+    def bind_processor(self, dialect: Any) -> Callable[[Any], Any]:
+        return lambda value: value if value is None else json.dumps(value)
+
+
+SQLITE_COLSPECS: Dict[type, type] = {
+    Date: _accepting_text(type_class=sqlite.DATE),
+    DateTime: _accepting_text(type_class=sqlite.DATETIME),
+    Time: _accepting_text(type_class=sqlite.TIME),
+    ARRAY: SqliteIntegerArray,
+}
+
+
+class RedisStandIn:
+
+    """redis stand in
+    this class emulates the redis commands used by the cache connections, recording every round trip,
+    the lua scripts are emulated by name and are only known by their sha once an eval ran them, the
+    time to live of the keys only passes when the tests advance it
+    """
+
+    def __init__(self, is_broken: bool = False):
+        self._connection_creation: str = "stand-in"
+        self._connection_id: str = "stand-in"
+        self.values: Dict[str, Any] = dict()
+        self.expirations: Dict[str, int] = dict()
+        self.round_trips: list[str] = list()
+        self.scripts: Set[str] = set()
+        self.is_broken: bool = is_broken
+        self.is_closed: bool = False
+
+    def _round_trip(self, command: str) -> None:
+        self.round_trips.append(command)
+        if self.is_broken is True:
+            raise AsyncConnectionError("redis stand in is broken")
+
+    def advance(self, seconds: int) -> None:
+        for key, ttl in list(self.expirations.items()):
+            if ttl <= seconds:
+                self._delete(key=key)
+            else:
+                self.expirations[key] = ttl - seconds
+
+    def _delete(self, key: str) -> None:
+        self.values.pop(key, None)
+        self.expirations.pop(key, None)
+
+    def _expire(self, key: str, ttl: int) -> None:
+        self.expirations[key] = ttl
+
+    async def ping(self) -> bool:
+        self._round_trip(command="PING")
+        return True
+
+    async def get(self, name: str) -> Union[None, bytes]:
+        self._round_trip(command="GET")
+        return self.values.get(name)
+
+    async def set(self, name: str, value: Any, ex: Any = None, nx: bool = False) -> Union[None, bool]:
+        self._round_trip(command="SET")
+        if nx is True and name in self.values:
+            return None
+        self.values[name] = value
+        # ** info: a plain set drops the time to live of the key, as redis does
+        self.expirations.pop(name, None)
+        if ex is not None:
+            self._expire(key=name, ttl=int(ex.total_seconds()))
+        return True
+
+    async def mget(self, keys: list[str]) -> list[Union[None, bytes]]:
+        self._round_trip(command="MGET")
+        return [self.values.get(key) for key in keys]
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self._round_trip(command="EVAL")
+        sha: str = hashlib.sha1(script.encode()).hexdigest()
+        if sha not in LUA_SCRIPTS:
+            raise NotImplementedError("unknown script")
+        self.scripts.add(sha)
+        return self._run_script(script=LUA_SCRIPTS[sha], keys=keys_and_args[:numkeys], arguments=keys_and_args[numkeys:])
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self._round_trip(command="EVALSHA")
+        if sha not in self.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        return self._run_script(script=LUA_SCRIPTS[sha], keys=keys_and_args[:numkeys], arguments=keys_and_args[numkeys:])
+
+    def _run_script(self, script: LuaScript, keys: tuple[str, ...], arguments: tuple[Any, ...]) -> Any:
+        if script.name == DELETE_IF_EQUAL_SCRIPT.name:
+            return self._delete_if_equal(key=keys[0], value=arguments[0])
+        if script.name == STORE_TAGGED_SCRIPT.name:
+            return self._store_tagged(keys=keys, arguments=arguments)
+        if script.name == GET_WITH_TTL_SCRIPT.name:
+            return self._get_with_ttl(key=keys[0])
+        if script.name == INVALIDATE_TAG_SCRIPT.name:
+            return self._invalidate_tag(keys_key=keys[0], version_key=keys[1])
+        raise NotImplementedError("unknown script")
+
+    def _get_with_ttl(self, key: str) -> List[Any]:
+        ttl: int = self.expirations.get(key, -1) * 1000 if key in self.values else -2
+        # ** info: the script turns a missing value into false, so the reply keeps the time to live after it
+        return _lua_array_reply(values=[self.values.get(key, False), ttl])
+
+    def _delete_if_equal(self, key: str, value: Any) -> int:
+        if self.values.get(key) == value:
+            self._delete(key=key)
+            return 1
+        return 0
+
+    def _store_tagged(self, keys: tuple[str, ...], arguments: tuple[Any, ...]) -> int:
+        tags: int = (len(keys) - 1) // 2
+        if [self.values.get(key, b"0").decode() for key in keys[1 + tags :]] != list(arguments[2:]):
+            return 0
+        ttl: int = int(arguments[1])
+        self.values[keys[0]] = arguments[0]
+        self._expire(key=keys[0], ttl=ttl)
+        for tag_key in keys[1 : 1 + tags]:
+            self.values.setdefault(tag_key, set()).add(keys[0])
+            # ** info: a tag set lives as long as its longest lived key, a set without time to live has a ttl of -1
+            if self.expirations.get(tag_key, -1) < ttl:
+                self._expire(key=tag_key, ttl=ttl)
+        return 1
+
+    def _invalidate_tag(self, keys_key: str, version_key: str) -> int:
+        for key in self.values.get(keys_key, set()):
+            self._delete(key=key)
+        self._delete(key=keys_key)
+        version: int = int(self.values.get(version_key, b"0")) + 1
+        self.values[version_key] = str(version).encode()
+        return version
+
+    async def close(self, close_connection_pool: Union[None, bool] = None) -> None:
+        self.is_closed = True
+
+
+def _lua_array_reply(values: List[Any]) -> List[Any]:
+    # ** info: redis cuts a lua array reply off at its first nil and replies the lua false values as nil, the same is done here
+    reply: List[Any] = list()
+    for value in values:
+        if value is None:
+            break
+        reply.append(None if value is False else value)
+    return reply
+
+
+def use_redis_stand_in(stand_in: RedisStandIn) -> None:
+    connection_manager._download_connection._connection = stand_in
+    connection_manager._upload_connection._connection = stand_in
+
+
+class SqliteStandIn:
+
+    """sqlite stand in
+    this class creates an in memory sqlite database with the users and the tv programmation tables,
+    fills them with generated rows and binds the users and tv programmation providers to it
+    """
+
+    def __init__(self, users: int, programmations: int):
+        self.users: int = users
+        self.programmations: int = programmations
+        self.async_engine: Union[None, AsyncEngine] = None
+
+    async def start(self) -> None:
+        self.async_engine = create_async_engine(
+            "sqlite+aiosqlite://",
+            poolclass=StaticPool,
+            connect_args={"detect_types": sqlite3.PARSE_DECLTYPES},
+        )
+        dialect: Any = self.async_engine.sync_engine.dialect
+        dialect.colspecs = {**dialect.colspecs, **SQLITE_COLSPECS}
+
+        async with self.async_engine.begin() as connection:
+            await connection.run_sync(Users.__table__.create)
+            await connection.execute(text(TV_PROGRAMATION_TABLE_DDL))
+            await connection.execute(insert(Users), self._build_users())
+            await connection.execute(text(self._build_tv_programations_insert()), self._build_tv_programations())
+
+        users_provider.connection_manager.connection_manager.use_async_engine(async_engine=self.async_engine)
+        tv_programattion_provider.connection_manager.connection_manager.use_async_engine(async_engine=self.async_engine)
+
+    async def stop(self) -> None:
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+
+    def _build_users(self) -> List[Dict[str, Any]]:
+        creation: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        return [
+            {
+                "internal_id": f"{index:08d}-0000-4000-8000-000000000000",
+                "estatal_id": 100000000 + index,
+                "first_name": ["Jose", "Maria", "Juan", "Ana"][index % 4],
+                "last_name": ["Escobar", "Garcia", "Lopez", "Perez"][index % 4],
+                "phone_number": 300000000 + index,
+                "email": f"user{index}@mail.com",
+                "gender": ["male", "female"][index % 2],
+                "birthday": date(1990, 1, 1) + timedelta(days=index % 3650),
+                "creation": creation + timedelta(minutes=index),
+                "modification": creation + timedelta(minutes=index),
+                "password": "0" * 64,
+            }
+            for index in range(self.users)
+        ]
+
+    def _build_tv_programations(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "programation_id": f"{index:08d}-0000-4000-8000-000000000000",
+                "channel_id": index % 20,
+                "channel_name": ["news", "sports", "movies", "kids"][index % 4],
+                "channel_content_type": ["live", "recorded"][index % 2],
+                "start_houre": f"{index % 24:02d}:00:00",
+                "end_houre": f"{(index + 1) % 24:02d}:00:00",
+                "weeks": json.dumps([index % 52 + 1]),
+                "days": json.dumps([index % 7 + 1]),
+                "year": 2024,
+                "creation": (datetime(2024, 1, 1) + timedelta(minutes=index)).isoformat(sep=" "),
+                "modification": (datetime(2024, 1, 1) + timedelta(minutes=index)).isoformat(sep=" "),
+            }
+            for index in range(self.programmations)
+        ]
+
+    @staticmethod
+    def _build_tv_programations_insert() -> str:
+        columns: List[str] = [column.name for column in TvProgramation.__table__.columns]
+        return f"INSERT INTO tv_programation ({', '.join(columns)}) VALUES ({', '.join(f':{column}' for column in columns)})"
@@ -1,12 +1,29 @@
 # ** info: python imports
+from types import SimpleNamespace
+from datetime import timezone
 from os.path import join
 from os import path
+import json
+import io
 import sys
 
+# ** info: typing imports
+from typing import List
+
+# ** info: pytest imports
+import pytest
+
+# ** info: loguru imports
+from loguru import logger
+
 # **info: appending src path to the system paths for absolute imports from src path
 sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
 
 # ** info: artifacts imports
+from src.artifacts.pagination.cursor_provider import cursor_provider
+from src.artifacts.logging.batched_log_sink import BatchedLogSink
+from src.artifacts.logging.record_encoder import RecordEncoder
+from src.artifacts.env.configs import LoggingQueueFullPolicy
 from src.artifacts.path.generator import generator
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -18,3 +35,113 @@ def test_build_posix_path() -> None:
     generated_path: str = generator.build_posix_path("reports", "generate")
     expected_path: str = "/reports/generate"
     assert generated_path == expected_path
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: pagination.cursor_provider tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_cursor_round_trip() -> None:
+    cursor: str = cursor_provider.encode_cursor("2024-02-01T10:00:00+00:00", "397d4343-2855-4c92-b64b-58ee82006e0b")
+    decoded_values: List[str] = cursor_provider.decode_cursor(cursor=cursor, size=2)
+    expected_values: List[str] = ["2024-02-01T10:00:00+00:00", "397d4343-2855-4c92-b64b-58ee82006e0b"]
+    assert decoded_values == expected_values
+
+
+def test_cursor_rejects_malformed_values() -> None:
+    for cursor in ["not a cursor", cursor_provider.encode_cursor("only-one-value")]:
+        with pytest.raises(ValueError):
+            cursor_provider.decode_cursor(cursor=cursor, size=2)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: logging.batched_log_sink tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_batched_log_sink_writes_the_queued_records_in_batches() -> None:
+    stream: io.StringIO = io.StringIO()
+    log_sink: BatchedLogSink = BatchedLogSink(
+        serializer=lambda record: record["message"],
+        max_queue_size=100,
+        batch_size=10,
+        queue_full_policy=LoggingQueueFullPolicy.drop,
+        block_timeout_ms=0,
+        stream=stream,
+    )
+
+    for index in range(25):
+        log_sink(SimpleNamespace(record={"message": f"record {index}"}))
+
+    log_sink.start()
+    log_sink.stop()
+
+    assert stream.getvalue().splitlines() == [f"record {index}" for index in range(25)]
+    assert log_sink.get_statistics()["writtenRecords"] == 25
+    assert log_sink.get_statistics()["writtenBatches"] == 3
+
+
+def test_batched_log_sink_drops_the_records_when_the_queue_is_full() -> None:
+    stream: io.StringIO = io.StringIO()
+    log_sink: BatchedLogSink = BatchedLogSink(
+        serializer=lambda record: record["message"],
+        max_queue_size=2,
+        batch_size=1,
+        queue_full_policy=LoggingQueueFullPolicy.drop,
+        block_timeout_ms=0,
+        stream=stream,
+    )
+
+    for index in range(5):
+        log_sink(SimpleNamespace(record={"message": f"record {index}"}))
+
+    assert log_sink.get_statistics()["droppedRecords"] == 3
+    assert log_sink.get_statistics()["queueDepth"] == 2
+
+    log_sink.start()
+    log_sink.stop()
+
+    assert stream.getvalue().splitlines() == ["record 0", "record 1"]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: logging.record_encoder tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_record_encoder_writes_the_structured_log_fields() -> None:
+    records: List[dict] = list()
+    handler_id: int = logger.add(lambda message: records.append(message.record), level="INFO")
+    record_encoder: RecordEncoder = RecordEncoder(app_name="users_crud_api_python", app_instance_id="app-instance-id")
+    request_context: dict = {"requestBody": {"query": "users"}, "requestHeaders": dict(), "endpointUrl": "graphql/users", "fullUrl": "undefined"}
+    response_context: dict = {
+        "responseBody": dict(),
+        "responseHeaders": dict(),
+        "responseCode": 200,
+        "startTime": "undefined",
+        "endTime": "undefined",
+    }
+
+    try:
+        with logger.contextualize(internalId="internal-id", externalId="external-id", group="undefined", **request_context, **response_context):
+            logger.info("first record")
+            logger.info("second record")
+            try:
+                raise KeyboardInterrupt()
+            except KeyboardInterrupt:
+                logger.exception("record without exception args")
+    finally:
+        logger.remove(handler_id)
+
+    first_log: dict = json.loads(record_encoder.encode(records[0]))
+    second_log: dict = json.loads(record_encoder.encode(records[1]))
+
+    assert first_log["message"] == "first record"
+    assert first_log["timestamp"] == records[0]["time"].astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    assert first_log["request"]["body"] == {"query": "users"}
+    assert first_log["response"]["status"] == 200
+    assert first_log["app"]["id"] == "app-instance-id"
+    assert len(first_log["loggId"]) == 36 and first_log["loggId"] != second_log["loggId"]
+    error_log: dict = json.loads(record_encoder.encode(records[2]))["error"]
+    assert (error_log["type"], error_log["message"]) == ("KeyboardInterrupt", "")
@@ -0,0 +1,353 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import asyncio
+
+# ** info: typing imports
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Any
+
+# ** info: pytest imports
+import pytest
+
+# ** info: fastapi imports
+from fastapi import HTTPException
+
+# ** info: dtos imports
+from src.dtos.tv_programmation_dtos import TvProgrammationResponseDto
+from src.dtos.users_dtos import UsersPageDto
+from src.dtos.users_dtos import PageInfoDto
+from src.dtos.users_dtos import UserDto
+
+# ** info: cache database imports
+from src.database.cache_database import memory_cache as memory_cache_module
+from src.database.cache_database.cache_codec import CACHE_CODEC_VERSION
+from src.database.cache_database.cache_codec import CacheCodec
+from src.database.cache_database.cache_codec import HEADER
+from src.database.cache_database.cache_codec import cache_codec
+from src.database.cache_database.connection_manager import connection_manager
+from src.database.cache_database.cache_provider import cache_provider
+
+# ** info: stand ins imports
+from stand_ins import RedisStandIn
+
+# ** info: artifacts imports
+from src.artifacts.metrics.histogram import Histogram
+from src.artifacts.env.configs import configs
+from src.database.cache_database.memory_cache import MemoryCache
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: local redis stand in
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+@pytest.fixture
+def redis_stand_in(monkeypatch: pytest.MonkeyPatch) -> RedisStandIn:
+    stand_in: RedisStandIn = RedisStandIn()
+    monkeypatch.setattr(connection_manager._download_connection, "_connection", stand_in)
+    monkeypatch.setattr(connection_manager._upload_connection, "_connection", stand_in)
+    return stand_in
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: cache_database.memory_cache tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_memory_cache_evicts_least_recently_used_entry() -> None:
+    memory_cache: MemoryCache = MemoryCache(max_entries=2, ttl=60)
+    memory_cache.set(key="first", value=b"1")
+    memory_cache.set(key="second", value=b"2")
+    assert memory_cache.get(key="first") == b"1"
+    memory_cache.set(key="third", value=b"3")
+    assert memory_cache.get(key="second") is None
+    assert memory_cache.get(key="first") == b"1"
+    assert memory_cache.get(key="third") == b"3"
+    assert len(memory_cache) == 2
+
+
+def test_memory_cache_expires_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    current_time: list[float] = [1000.0]
+    monkeypatch.setattr(memory_cache_module.time, "monotonic", lambda: current_time[0])
+    memory_cache: MemoryCache = MemoryCache(max_entries=10, ttl=5)
+    memory_cache.set(key="key", value=b"value")
+    memory_cache.set(key="short", value=b"value", ttl=1)
+    current_time[0] += 2
+    assert memory_cache.get(key="key") == b"value"
+    assert memory_cache.get(key="short") is None
+    current_time[0] += 4
+    assert memory_cache.get(key="key") is None
+    assert len(memory_cache) == 0
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: cache_database.cache_codec tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_cache_codec_round_trips_registered_dtos() -> None:
+    cache_codec: CacheCodec = CacheCodec()
+    user: UserDto = UserDto()
+    user.internalId = "internal"
+    user.estatalId = "1"
+    user.firstName = "first"
+    user.lastName = "last"
+    user.phoneNumber = 300000000
+    user.email = "user@mail.com"
+    user.gender = "male"
+    user.birthday = "2000-01-01"
+    page_info: PageInfoDto = PageInfoDto()
+    page_info.hasNextPage = True
+    page_info.hasPreviousPage = False
+    page_info.startCursor = "start"
+    page_info.endCursor = None
+    users_page: UsersPageDto = UsersPageDto()
+    users_page.users = [user]
+    users_page.pageInfo = page_info
+    decoded_page: UsersPageDto = cache_codec.decode(payload=cache_codec.encode(value=users_page))
+    assert isinstance(decoded_page, UsersPageDto)
+    assert vars(decoded_page.users[0]) == vars(user)
+    assert vars(decoded_page.pageInfo) == vars(page_info)
+    programmation: TvProgrammationResponseDto = TvProgrammationResponseDto(channelId=1, weeks=[1, 2], days=[3], duration=60)
+    assert cache_codec.decode(payload=cache_codec.encode(value=[programmation])) == [programmation]
+
+
+def test_cache_codec_compresses_large_payloads() -> None:
+    cache_codec: CacheCodec = CacheCodec()
+    value: list[str] = ["repeated value"] * 1000
+    payload: bytes = cache_codec.encode(value=value)
+    assert len(payload) < len("repeated value") * 1000
+    assert cache_codec.decode(payload=payload) == value
+    assert cache_codec.get_statistics()["compressedCount"] >= 1
+
+
+def test_cache_codec_treats_other_versions_as_stale() -> None:
+    cache_codec: CacheCodec = CacheCodec()
+    payload: bytes = cache_codec.encode(value={"key": "value"})
+    magic, _, flags, fingerprint = HEADER.unpack_from(payload)
+    old_payload: bytes = HEADER.pack(magic, CACHE_CODEC_VERSION - 1, flags, fingerprint) + payload[HEADER.size :]
+    assert cache_codec.is_current(payload=payload) is True
+    assert cache_codec.is_current(payload=old_payload) is False
+    assert cache_codec.is_current(payload=b"\x80\x04pickled") is False
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: cache_database.connection_manager tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_connection_manager_uses_one_round_trip_per_operation(redis_stand_in: RedisStandIn) -> None:
+    asyncio.run(connection_manager.set_with_ttl(key="key", value={"key": "value"}, time=60))
+    assert redis_stand_in.round_trips == ["SET"]
+    assert redis_stand_in.expirations["key"] == 60
+    assert asyncio.run(connection_manager.get(key="key")) == {"key": "value"}
+    assert asyncio.run(connection_manager.get(key="missing")) is None
+    assert redis_stand_in.round_trips == ["SET", "GET", "GET"]
+
+
+def test_connection_manager_reads_missing_values_with_ttl(redis_stand_in: RedisStandIn) -> None:
+    assert asyncio.run(connection_manager.get_raw_with_ttl(key="missing")) == (None, -2)
+    payload: bytes = cache_codec.encode(value="value")
+    asyncio.run(connection_manager.set_raw_with_ttl(key="key", payload=payload, time=60))
+    assert asyncio.run(connection_manager.get_raw_with_ttl(key="key")) == (payload, 60000)
+
+
+def test_connection_manager_lock_round_trips(redis_stand_in: RedisStandIn) -> None:
+    assert asyncio.run(connection_manager.acquire_lock(key="key", token="owner", time=10)) is True
+    assert asyncio.run(connection_manager.acquire_lock(key="key", token="other", time=10)) is False
+    asyncio.run(connection_manager.release_lock(key="key", token="owner"))
+    # ** info: the first call of a script falls back to eval, the next ones only send its sha
+    assert redis_stand_in.round_trips == ["SET", "SET", "EVALSHA", "EVAL"]
+    assert asyncio.run(connection_manager.acquire_lock(key="key", token="other", time=10)) is True
+    asyncio.run(connection_manager.release_lock(key="key", token="other"))
+    assert redis_stand_in.round_trips == ["SET", "SET", "EVALSHA", "EVAL", "SET", "EVALSHA"]
+    assert "key" not in redis_stand_in.values
+    assert redis_stand_in.values == dict()
+
+
+def test_connection_manager_resets_broken_connections(redis_stand_in: RedisStandIn) -> None:
+    redis_stand_in.is_broken = True
+    with pytest.raises(HTTPException):
+        asyncio.run(connection_manager.get(key="key"))
+    assert redis_stand_in.round_trips == ["GET"]
+    assert redis_stand_in.is_closed is True
+    assert connection_manager._download_connection._connection is not redis_stand_in
+
+
+def test_connection_manager_health_check_pings_each_connection(redis_stand_in: RedisStandIn) -> None:
+    assert asyncio.run(connection_manager.check_health()) is True
+    assert redis_stand_in.round_trips == ["PING", "PING"]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: cache_database.cache_provider tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_cache_provider_invalidates_tagged_values(redis_stand_in: RedisStandIn) -> None:
+    computations: list[int] = list()
+
+    @cache_provider.ttl_cache(ttl=60, l1_ttl=5, tags=lambda channel_id: [f"channel:{channel_id}"])
+    async def cached_function(channel_id: int) -> list[int]:
+        computations.append(channel_id)
+        return [channel_id, len(computations)]
+
+    assert asyncio.run(cached_function(channel_id=1)) == [1, 1]
+    assert asyncio.run(cached_function(channel_id=2)) == [2, 2]
+    assert asyncio.run(cached_function(channel_id=1)) == [1, 1]
+    asyncio.run(cache_provider.invalidate_tags(tags=["channel:1"]))
+    assert asyncio.run(cached_function(channel_id=1)) == [1, 3]
+    assert asyncio.run(cached_function(channel_id=2)) == [2, 2]
+
+
+def test_cache_provider_expires_tagged_values_with_their_ttl(redis_stand_in: RedisStandIn) -> None:
+    computations: list[int] = list()
+
+    @cache_provider.ttl_cache(ttl=60, tags=["users"])
+    async def cached_function() -> int:
+        computations.append(len(computations) + 1)
+        return len(computations)
+
+    assert asyncio.run(cached_function()) == 1
+    key: str = next(key for key in redis_stand_in.values if key.startswith("cache:"))
+    assert redis_stand_in.expirations[key] == 60
+    assert all(ttl == 60 for ttl in redis_stand_in.expirations.values())
+    redis_stand_in.advance(seconds=30)
+    assert asyncio.run(cached_function()) == 1
+    redis_stand_in.advance(seconds=30)
+    assert key not in redis_stand_in.values
+    assert asyncio.run(cached_function()) == 2
+    assert computations == [1, 2]
+
+
+def test_cache_provider_invalidates_in_process_values_filled_from_redis(redis_stand_in: RedisStandIn) -> None:
+    computations: list[int] = list()
+
+    # ** info: both functions share the cache key, like the same resolver running on two workers
+    def build_cached_function() -> Callable[[], Awaitable[int]]:
+        @cache_provider.ttl_cache(ttl=60, l1_ttl=5, tags=["users"])
+        async def cached_function() -> int:
+            computations.append(len(computations) + 1)
+            return len(computations)
+
+        return cached_function
+
+    writer_function: Callable[[], Awaitable[int]] = build_cached_function()
+    reader_function: Callable[[], Awaitable[int]] = build_cached_function()
+
+    assert asyncio.run(writer_function()) == 1
+    assert asyncio.run(reader_function()) == 1
+    asyncio.run(cache_provider.invalidate_tags(tags=["users"]))
+    assert asyncio.run(reader_function()) == 2
+    asyncio.run(cache_provider.invalidate_tags(tags=["users"]))
+    assert asyncio.run(reader_function()) == 3
+    assert computations == [1, 2, 3]
+
+
+def test_cache_provider_discards_values_invalidated_while_computing(redis_stand_in: RedisStandIn) -> None:
+    @cache_provider.ttl_cache(ttl=60, tags=["users"])
+    async def cached_function() -> str:
+        await cache_provider.invalidate_tags(tags=["users"])
+        return "value"
+
+    assert asyncio.run(cached_function()) == "value"
+    assert [key for key in redis_stand_in.values if not key.startswith("tag:")] == list()
+
+
+def test_cache_provider_bypasses_the_cache_when_redis_fails_while_computing(redis_stand_in: RedisStandIn, monkeypatch: pytest.MonkeyPatch) -> None:
+    get_raw: Callable[..., Awaitable[Any]] = connection_manager.get_raw
+
+    # ** info: the cache database goes down right after the search misses
+    async def get_raw_then_break(key: str) -> Any:
+        payload: Any = await get_raw(key=key)
+        redis_stand_in.is_broken = True
+        return payload
+
+    @cache_provider.ttl_cache(ttl=60, distributed_lock=True, tags=["users"])
+    async def cached_function(value: int) -> int:
+        if value < 0:
+            raise HTTPException(status_code=404)
+        return value
+
+    monkeypatch.setattr(connection_manager, "get_raw", get_raw_then_break)
+    assert asyncio.run(cached_function(value=1)) == 1
+    statistics: Dict[str, Any] = cache_provider.get_statistics()["functions"][f"{__name__}.{cached_function.__qualname__}"]
+    assert (statistics["misses"], statistics["bypasses"]) == (1, 1)
+
+    redis_stand_in.is_broken = False
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(cached_function(value=-1))
+    assert error.value.status_code == 404
+
+
+def test_cache_provider_builds_canonical_keys() -> None:
+    class CachedController:
+        async def search(self, request: TvProgrammationResponseDto, limit: int = 10, **filters: Any) -> None:
+            pass
+
+    key_builder = cache_provider._get_key_builder(func=CachedController.search)
+    key: str = key_builder(CachedController(), TvProgrammationResponseDto(channelId=1, days=[1]), limit=10, first="a", last="b")
+    assert key == key_builder(CachedController(), request=TvProgrammationResponseDto(days=[1], channelId=1), last="b", first="a")
+    assert key != key_builder(CachedController(), TvProgrammationResponseDto(channelId=2, days=[1]), first="a", last="b")
+    assert key.startswith(f"cache:{configs.cache_database_key_version}:{__name__}.")
+    assert "CachedController.search" in key
+
+
+def test_cache_provider_refreshes_stale_values_in_background(redis_stand_in: RedisStandIn) -> None:
+    computations: list[int] = list()
+
+    @cache_provider.ttl_cache(ttl=60, soft_ttl=10)
+    async def cached_function() -> int:
+        computations.append(len(computations) + 1)
+        await asyncio.sleep(0.01)
+        return len(computations)
+
+    async def run_calls() -> list[int]:
+        results: list[int] = [await cached_function()]
+        key: str = next(key for key in redis_stand_in.values if key.startswith("cache:"))
+        redis_stand_in.advance(seconds=20)
+        assert redis_stand_in.expirations[key] == 40
+        results.extend(await asyncio.gather(*[cached_function() for _ in range(5)]))
+        await asyncio.sleep(0.05)
+        results.append(await cached_function())
+        return results
+
+    assert asyncio.run(run_calls()) == [1, 1, 1, 1, 1, 1, 2]
+    assert computations == [1, 2]
+
+
+def test_cache_provider_counts_hits_misses_and_bypasses(redis_stand_in: RedisStandIn) -> None:
+    @cache_provider.ttl_cache(ttl=60, l1_ttl=5)
+    async def cached_function(value: int) -> int:
+        return value
+
+    assert [asyncio.run(cached_function(value=value)) for value in (1, 1, 2)] == [1, 1, 2]
+    redis_stand_in.is_broken = True
+    assert asyncio.run(cached_function(value=3)) == 3
+    statistics: Dict[str, Any] = cache_provider.get_statistics()["functions"][f"{__name__}.{cached_function.__qualname__}"]
+    assert (statistics["l1Hits"], statistics["misses"], statistics["errors"], statistics["bypasses"]) == (1, 2, 1, 1)
+    assert statistics["valueSizeBytes"]["count"] == 2
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: cache_database.cache_statistics tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_histogram_counts_cumulative_buckets() -> None:
+    histogram: Histogram = Histogram(bounds=(1.0, 10.0))
+    for value in (0.5, 1.0, 5.0, 50.0):
+        histogram.observe(value=value)
+    assert histogram.to_dict() == {
+        "count": 4,
+        "sum": 56.5,
+        "buckets": [{"le": 1.0, "count": 2}, {"le": 10.0, "count": 3}, {"le": None, "count": 4}],
+    }
@@ -0,0 +1,253 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+from datetime import timezone
+from datetime import datetime
+import asyncio
+
+# ** info: typing imports
+from typing import Union
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+
+# ** info: pytest imports
+import pytest
+
+# **info: sqlalchemy imports
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Engine
+from sqlalchemy import text
+
+# ** info: artifacts imports
+from src.artifacts.pagination.cursor_provider import cursor_provider
+from src.artifacts.metrics.metrics_registry import metrics_registry
+
+# ** info: query instrumentation imports
+from src.database.postgres.query_instrumentation import QueryInstrumentation
+from src.database.postgres.query_instrumentation import redact_parameters
+from src.database.postgres.query_instrumentation import QUERY_ORIGIN_KEY
+
+# ** info: connection manager imports
+from src.database.postgres.connection_manager import ConnectionManager
+
+# ** info: providers imports
+from src.database.postgres.tv_channel_provider import tv_programattion_provider
+from src.database.postgres.users_provider import users_provider
+
+# ** info: stand ins imports
+from stand_ins import SqliteStandIn
+
+# ** info: databases health monitor imports
+from src.database.database_health_monitor import database_health_monitor
+from src.database.database_health_monitor import DatabaseHealthState
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: database.database_health_monitor tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_database_health_monitor_tracks_probes_and_flaps(monkeypatch: pytest.MonkeyPatch) -> None:
+    probe_results: Dict[str, list[Any]] = {"healthy": [True, True, True], "flapping": [True, False, True]}
+
+    async def healthy_probe() -> bool:
+        return probe_results["healthy"].pop(0)
+
+    async def flapping_probe() -> bool:
+        if probe_results["flapping"].pop(0) is False:
+            raise ConnectionError("database unreachable")
+        return True
+
+    monkeypatch.setattr(database_health_monitor, "_probes", {"healthy": healthy_probe, "flapping": flapping_probe})
+    monkeypatch.setattr(database_health_monitor, "_states", {"healthy": DatabaseHealthState(), "flapping": DatabaseHealthState()})
+
+    assert database_health_monitor.is_healthy is True
+    assert asyncio.run(database_health_monitor.probe_databases()) is True
+    assert asyncio.run(database_health_monitor.probe_databases()) is False
+    assert database_health_monitor.get_unhealthy_databases() == ["flapping"]
+    assert asyncio.run(database_health_monitor.probe_databases()) is True
+
+    statistics: Dict[str, Any] = database_health_monitor.get_statistics()["databases"]
+    assert (statistics["flapping"]["probes"], statistics["flapping"]["flaps"], statistics["flapping"]["consecutiveFailures"]) == (3, 2, 0)
+    assert (statistics["healthy"]["probes"], statistics["healthy"]["flaps"]) == (3, 0)
+    assert statistics["healthy"]["lastProbeLatencyMs"] >= 0
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: database.postgres.connection_manager tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_connection_manager_counts_only_the_acquisitions_waiting_for_the_pool() -> None:
+    connection_manager: ConnectionManager = ConnectionManager(
+        user="user",
+        password="password",
+        host="localhost",
+        port=5432,
+        database="pool_db",
+        logs=False,
+        pool_size=1,
+        pool_max_overflow=1,
+        pool_recycle=3600,
+        pool_pre_ping=False,
+        pool_timeout=5,
+        slow_query_threshold_ms=1000,
+    )
+    async_engine: AsyncEngine = create_async_engine(
+        "sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=1, pool_timeout=5
+    )
+    connection_manager.use_async_engine(async_engine=async_engine)
+    connecting_waiters: list[int] = list()
+
+    # ** info: opening a new connection takes a while on a real database, the acquisitions doing it aren't waiting for the pool
+    event.listen(async_engine.sync_engine, "connect", lambda *_: connecting_waiters.append(connection_manager._waiters))
+
+    async def acquire_connections() -> list[int]:
+        waiters: list[int] = list()
+        async with connection_manager._acquire_connection(origin="first"):
+            async with connection_manager._acquire_connection(origin="second"):
+                waiters.append(connection_manager.get_pool_statistics()["waiters"])
+                waiting_acquisition: asyncio.Task = asyncio.create_task(acquire_connection(origin="third"))
+                await asyncio.sleep(0.05)
+                waiters.append(connection_manager.get_pool_statistics()["waiters"])
+            await waiting_acquisition
+        waiters.append(connection_manager.get_pool_statistics()["waiters"])
+        await connection_manager._end_async_engine()
+        return waiters
+
+    async def acquire_connection(origin: str) -> None:
+        async with connection_manager._acquire_connection(origin=origin):
+            pass
+
+    assert asyncio.run(acquire_connections()) == [0, 1, 0]
+    assert connecting_waiters == [0, 0]
+    assert connection_manager.get_pool_statistics()["acquisitions"] == 3
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: database.postgres.query_instrumentation tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_query_instrumentation_times_statements_and_logs_slow_ones_redacted(caplog: pytest.LogCaptureFixture) -> None:
+    engine: Engine = create_engine("sqlite://")
+    QueryInstrumentation(database="instrumented_db", slow_query_threshold_ms=0).attach(engine=engine)
+
+    with engine.connect() as connection:
+        connection.info[QUERY_ORIGIN_KEY] = "UsersProvider.fetch_users_data"
+        connection.execute(text("CREATE TABLE users (email TEXT)"))
+        connection.execute(text("INSERT INTO users (email) VALUES (:email)"), [{"email": "first@mail.com"}, {"email": "second@mail.com"}])
+        connection.execute(text("SELECT email FROM users WHERE email = :email"), {"email": "first@mail.com"})
+
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT missing_column FROM users"))
+
+        assert list(connection.info) == [QUERY_ORIGIN_KEY]
+
+    metrics: str = metrics_registry.render()
+
+    assert metrics.count('db_statement_duration_seconds_count{database="instrumented_db",origin="UsersProvider.fetch_users_data"') == 3
+    assert metrics.count('db_slow_statements_total{database="instrumented_db",origin="UsersProvider.fetch_users_data"') == 3
+    assert "first@mail.com" not in caplog.text
+    assert "parameters: ['<str>']" in caplog.text
+
+
+def test_redact_parameters_keeps_only_the_parameters_types() -> None:
+    assert redact_parameters(parameters={"email": "user@mail.com", "limit": 10}) == {"email": "<str>", "limit": "<int>"}
+    assert redact_parameters(parameters=[{"email": "user@mail.com"}, {"email": "other@mail.com"}]) == [{"email": "<str>"}, "<2 parameters sets>"]
+    assert redact_parameters(parameters=("user@mail.com", 10)) == ["<str>", "<int>"]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: database.postgres providers tests over the sqlite stand in
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_providers_search_the_sqlite_stand_in() -> None:
+    async def search() -> Tuple[List[Any], List[Any]]:
+        sqlite_stand_in: SqliteStandIn = SqliteStandIn(users=40, programmations=40)
+        await sqlite_stand_in.start()
+
+        try:
+            users: List[Any] = await users_provider.fetch_users_data(
+                limit=5,
+                offset=0,
+                internal_id=None,
+                estatal_id=None,
+                first_name="Jo",
+                last_name=None,
+                phone_number=None,
+                email=None,
+                gender=None,
+                birthday=None,
+            )
+            programmations: List[Any] = await tv_programattion_provider.search_tv_programattion(
+                channel_id=1, channel_name="spo", channel_content_type=None, start_houre=None, end_houre=None, days=None, weeks=None, year=2024
+            )
+            return users, programmations
+
+        finally:
+            await sqlite_stand_in.stop()
+
+    users, programmations = asyncio.run(search())
+
+    assert [user.firstName for user in users] == ["Jose"] * 5
+    assert [user.estatalId for user in users] == ["100000036", "100000032", "100000028", "100000024", "100000020"]
+    # ** info: the users phone number column is a postgres integer, so the seeded values must fit it
+    assert all(-(2**31) <= int(user.phoneNumber) < 2**31 for user in users)
+    assert [(programmation.channelId, programmation.channelName) for programmation in programmations] == [(1, "sports"), (1, "sports")]
+    assert all(isinstance(programmation.days, list) for programmation in programmations)
+
+
+def test_users_provider_pages_report_the_rows_past_a_before_page() -> None:
+    async def fetch_page(first: int, after: Union[None, str] = None, before: Union[None, str] = None) -> Any:
+        return await users_provider.fetch_users_page(
+            first=first,
+            after=after,
+            before=before,
+            internal_id=None,
+            estatal_id=None,
+            first_name=None,
+            last_name=None,
+            phone_number=None,
+            email=None,
+            gender=None,
+            birthday=None,
+        )
+
+    async def walk_pages() -> List[Any]:
+        sqlite_stand_in: SqliteStandIn = SqliteStandIn(users=10, programmations=1)
+        await sqlite_stand_in.start()
+
+        try:
+            head_page: Any = await fetch_page(first=8)
+            tail_page: Any = await fetch_page(first=5, after=head_page.pageInfo.endCursor)
+            before_tail_page: Any = await fetch_page(first=3, before=tail_page.pageInfo.startCursor)
+            # ** info: an anchor older than every row, the before page is the tail of the users and nothing follows it
+            tail_anchor: str = cursor_provider.encode_cursor(datetime(2023, 1, 1, tzinfo=timezone.utc).isoformat(), "0")
+            at_tail_page: Any = await fetch_page(first=3, before=tail_anchor)
+            return [tail_page, before_tail_page, at_tail_page]
+
+        finally:
+            await sqlite_stand_in.stop()
+
+    tail_page, before_tail_page, at_tail_page = asyncio.run(walk_pages())
+
+    assert [user.estatalId for user in tail_page.users] == ["100000001", "100000000"]
+    assert (tail_page.pageInfo.hasPreviousPage, tail_page.pageInfo.hasNextPage) == (True, False)
+    assert [user.estatalId for user in before_tail_page.users] == ["100000004", "100000003", "100000002"]
+    assert (before_tail_page.pageInfo.hasPreviousPage, before_tail_page.pageInfo.hasNextPage) == (True, True)
+    assert [user.estatalId for user in at_tail_page.users] == ["100000002", "100000001", "100000000"]
+    assert (at_tail_page.pageInfo.hasPreviousPage, at_tail_page.pageInfo.hasNextPage) == (True, False)
@@ -0,0 +1,44 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: typing imports
+from typing import Dict
+from typing import Any
+
+# ** info: resolvers imports
+from src.graphql_resolvers.users_resolvers import users_resolvers
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: graphql_resolvers.users_resolvers tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_validate_new_user_rejects_values_over_the_columns_limits() -> None:
+    user: Dict[str, Any] = {
+        "estatal_id": 100000000,
+        "first_name": "Jose",
+        "last_name": "Escobar",
+        "phone_number": 300000000,
+        "email": "jose@mail.com",
+        "gender": "male",
+        "birthday": "1990-01-01",
+        "password": "password",
+    }
+
+    assert users_resolvers._validate_new_user(user=user, batch_estatal_ids=dict()) is None
+    assert (
+        users_resolvers._validate_new_user(user={**user, "first_name": "J" * 51}, batch_estatal_ids=dict())
+        == "firstName is longer than 50 characters"
+    )
+    assert (
+        users_resolvers._validate_new_user(user={**user, "password": "p" * 65}, batch_estatal_ids=dict()) == "password is longer than 64 characters"
+    )
+    assert (
+        users_resolvers._validate_new_user(user={**user, "phone_number": 3000000000}, batch_estatal_ids=dict())
+        == "phoneNumber is out of the -2147483648 to 2147483647 range"
+    )
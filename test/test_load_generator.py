@@ -0,0 +1,73 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import asyncio
+
+# ** info: typing imports
+from typing import Dict
+from typing import Any
+
+# ** info: pytest imports
+import pytest
+
+# ** info: httpx imports
+import httpx
+
+# ** info: load generator imports
+from tools.load_generator import summarize_latencies
+from tools.load_generator import run_closed_loop
+from tools.load_generator import run_open_loop
+from tools.load_generator import LoadRecorder
+from tools.load_generator import GRAPHQL_PATH
+from tools.load_generator import parse_mix
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: tools.load_generator tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_parse_mix_reads_weights_and_rejects_unknown_operations() -> None:
+    assert parse_mix(mix="listUsers=3, addUser") == {"listUsers": 3.0, "addUser": 1.0}
+
+    with pytest.raises(ValueError):
+        parse_mix(mix="listUsers=1,deleteUser=1")
+
+    with pytest.raises(ValueError):
+        parse_mix(mix="listUsers=0")
+
+
+def test_summarize_latencies_uses_nearest_rank_percentiles() -> None:
+    summary: Dict[str, float] = summarize_latencies(latencies=[index / 1000 for index in range(1, 101)])
+
+    assert (summary["p50"], summary["p90"], summary["p95"], summary["p99"], summary["max"]) == (50.0, 90.0, 95.0, 99.0, 100.0)
+    assert summarize_latencies(latencies=list()) == dict()
+
+
+def test_load_loops_record_statuses_and_graphql_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == GRAPHQL_PATH:
+            return httpx.Response(200, json={"errors": [{"message": "broken"}]})
+        return httpx.Response(200, json={"data": list()})
+
+    async def run() -> Dict[str, Any]:
+        recorder: LoadRecorder = LoadRecorder()
+        weights: Dict[str, float] = {"listUsers": 1.0, "search-programmation-raw-return": 1.0}
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://load-test") as client:
+            await run_open_loop(client, recorder, weights, rate=200.0, duration=0.1, max_in_flight=10, seed=0)
+            elapsed: float = await run_closed_loop(client, recorder, weights, workers=2, duration=0.05, seed=0)
+
+        return recorder.to_dict(elapsed=elapsed)
+
+    report: Dict[str, Any] = asyncio.run(run())
+
+    assert report["requests"] > 20
+    assert report["errors"] == report["operations"]["listUsers"]["requests"]
+    assert report["operations"]["search-programmation-raw-return"]["errors"] == 0
+    assert set(report["latencyMs"]) == {"p50", "p90", "p95", "p99", "mean", "max"}
@@ -0,0 +1,256 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+from pathlib import Path
+import asyncio
+import json
+
+# ** info: typing imports
+from typing import List
+from typing import Dict
+from typing import Any
+
+# ** info: starlette imports
+from starlette.responses import PlainTextResponse
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.routing import Mount
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+# ** info: pytest imports
+import pytest
+
+# ** info: artifacts imports
+from src.artifacts.metrics.metrics_registry import metrics_registry
+from src.artifacts.profiling.profiles_store import profiles_store
+from src.artifacts.env.configs import configs
+
+# ** info: databases health monitor imports
+from src.database.database_health_monitor import database_health_monitor
+from src.database.database_health_monitor import DatabaseHealthState
+
+# ** info: middlewares imports
+from src.middlewares.authentication_handler import AuthenticationHandler
+from src.middlewares.logger_contextualizer import ResponseBodyCapture
+from src.middlewares.logger_contextualizer import LoggerContextualizer
+from src.middlewares.database_health_check import DatabaseHealthCheck
+from src.middlewares.request_profiler import RequestProfiler
+from src.middlewares.request_metrics import RequestMetrics
+from src.middlewares.request_state import RequestState
+from src.middlewares.error_handler import ErrorHandler
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: middlewares chain helpers
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def build_scope(path: str) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"requestid", b"external-id")],
+        "server": ("testserver", 80),
+    }
+
+
+def call_middlewares_chain(app: Any, path: str, body_chunks: List[bytes]) -> List[Message]:
+    chain: Any = LoggerContextualizer(app=ErrorHandler(app=AuthenticationHandler(app=DatabaseHealthCheck(app=app))))
+    messages: List[Message] = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(body_chunks) - 1} for index, chunk in enumerate(body_chunks)
+    ]
+    sent_messages: List[Message] = list()
+
+    async def receive() -> Message:
+        return messages.pop(0) if len(messages) > 0 else {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent_messages.append(message)
+
+    asyncio.run(chain(build_scope(path=path), receive, send))
+
+    return sent_messages
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: middlewares tests
+# ---------------------------------------------------------------------------------------------------------------------
+
+
+def test_middlewares_share_a_single_buffered_body() -> None:
+    received_bodies: List[bytes] = list()
+    request_states: List[RequestState] = list()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        received_bodies.append((await receive())["body"])
+        request_states.append(scope["state"]["request_state"])
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"ok": true}'})
+
+    sent_messages: List[Message] = call_middlewares_chain(app=app, path="/echo", body_chunks=[b'{"first": ', b'"chunk"}'])
+
+    assert received_bodies == [b'{"first": "chunk"}']
+    assert request_states[0].json_body == {"first": "chunk"}
+    assert request_states[0].external_id == "external-id"
+    assert request_states[0].endpoint_url == "echo"
+    assert [message["type"] for message in sent_messages] == ["http.response.start", "http.response.body"]
+
+
+def test_error_handler_turns_unhandled_errors_into_internal_server_errors() -> None:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        raise RuntimeError("unexpected failure")
+
+    sent_messages: List[Message] = call_middlewares_chain(app=app, path="/failing", body_chunks=[b""])
+
+    assert sent_messages[0]["status"] == 500
+    assert sent_messages[1]["body"] == b"Internal Server Error"
+
+
+def test_response_body_capture_keeps_at_most_max_bytes() -> None:
+    response_capture: ResponseBodyCapture = ResponseBodyCapture(max_bytes=8)
+
+    for chunk in [b'{"items": ', b"[1, 2, 3]", b"}"]:
+        response_capture.write(chunk=chunk)
+
+    assert response_capture.is_truncated is True
+    assert response_capture.to_dict() == {"truncated": True, "bodyBytes": 20, "capturedBytes": 8}
+
+
+def test_logger_contextualizer_forwards_every_chunk_and_captures_only_json_content_types() -> None:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"first ", "more_body": True})
+        await send({"type": "http.response.body", "body": b"second"})
+
+    sent_messages: List[Message] = call_middlewares_chain(app=app, path="/text", body_chunks=[b""])
+
+    assert [message.get("body") for message in sent_messages[1:]] == [b"first ", b"second"]
+    assert LoggerContextualizer._is_content_type_captured(content_type="application/json; charset=utf-8") is True
+    assert LoggerContextualizer._is_content_type_captured(content_type="text/plain") is False
+    assert LoggerContextualizer._is_route_captured(endpoint_url="rest/internal/stats/cache?verbose=true") is False
+
+
+def test_request_metrics_are_labeled_by_route_template_and_graphql_operation() -> None:
+    async def graphql(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(content='{"data": {}}', media_type="application/json")
+
+    app: Starlette = Starlette(
+        routes=[Mount(path="/metrics-graphql", routes=[Route(path="/users", endpoint=graphql, methods=["POST"])])],
+        middleware=[Middleware(RequestMetrics)],
+    )
+
+    with TestClient(app) as client:
+        client.post("/metrics-graphql/users", json={"query": "query { listUsers(limit: 10, offset: 0) { uuid } }"})
+        client.post("/metrics-graphql/users", json={"query": "mutation AddUser { addUser { uuid } }", "operationName": "AddUser"})
+        client.get("/metrics-graphql/unknown")
+
+    metrics: str = metrics_registry.render()
+
+    assert 'http_requests_total{route="/metrics-graphql/users",method="POST",status="200"} 2' in metrics
+    assert 'http_requests_total{route="unmatched",method="GET",status="404"} 1' in metrics
+    assert 'http_requests_in_flight{route="/metrics-graphql/users"} 0' in metrics
+    assert 'graphql_operations_total{operation="query listUsers",status="200"} 1' in metrics
+    assert 'graphql_operation_duration_seconds_count{operation="AddUser"} 1' in metrics
+
+
+def test_request_profiler_captures_the_authorized_requests_and_the_requests_after_a_slow_one(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(configs, "app_request_profiler_token", "profile-token")
+    monkeypatch.setattr(configs, "app_request_profiler_sample_rate", 0.0)
+    monkeypatch.setattr(configs, "app_request_profiler_slow_request_threshold_ms", 50)
+    monkeypatch.setattr(configs, "app_request_profiler_slow_request_cooldown", 300)
+    monkeypatch.setattr(profiles_store, "_directory", tmp_path)
+    monkeypatch.setattr(profiles_store, "_max_profiles", 10)
+
+    async def endpoint(request: Request) -> PlainTextResponse:
+        await asyncio.sleep(float(request.query_params.get("sleep", "0")))
+        return PlainTextResponse(content="{}", media_type="application/json")
+
+    app: Starlette = Starlette(routes=[Route(path="/profiled", endpoint=endpoint)], middleware=[Middleware(RequestProfiler)])
+    profiles_count: List[int] = list()
+
+    with TestClient(app) as client:
+        authorized_response = client.get("/profiled", headers={"x-profile-request": "profile-token"})
+        fast_response = client.get("/profiled")
+        forbidden_response = client.get("/profiled", headers={"x-profile-request": "wrong-token"})
+
+        # ** info: the first slow request arms the route, the second one is profiled and the next ones wait for the cooldown
+        for _ in range(4):
+            client.get("/profiled", params={"sleep": "0.06"})
+            profiles_count.append(len(list(tmp_path.glob("*.prof"))))
+
+    assert authorized_response.headers["x-profile-name"].endswith(".prof")
+    assert (tmp_path / authorized_response.headers["x-profile-name"]).exists()
+    assert "x-profile-name" not in fast_response.headers
+    assert "x-profile-name" not in forbidden_response.headers
+    assert profiles_count == [1, 2, 2, 2]
+
+
+def test_middlewares_stream_the_bodies_of_the_streamed_routes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs, "app_streamed_request_body_routes", {"bulk"})
+    received_bodies: List[bytes] = list()
+    request_states: List[RequestState] = list()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        more_body: bool = True
+        while more_body:
+            message: Message = await receive()
+            received_bodies.append(message["body"])
+            more_body = message["more_body"]
+        request_states.append(scope["state"]["request_state"])
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    call_middlewares_chain(app=app, path="/bulk", body_chunks=[b'{"first": 1}\n', b'{"second": 2}\n'])
+
+    assert received_bodies == [b'{"first": 1}\n', b'{"second": 2}\n']
+    assert (request_states[0].body, request_states[0].json_body, request_states[0].is_body_streamed) == (b"", dict(), True)
+
+
+def test_logger_contextualizer_caps_and_redacts_the_request_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs, "app_logging_request_body_max_bytes", 256)
+    query: str = 'mutation { addUsers(users: [{firstName: "Jose", password: "secret \\" value"}]) { errors } }'
+
+    def get_request_body_rep(body: bytes) -> Dict[str, Any]:
+        return LoggerContextualizer._get_request_body_rep(request_state=RequestState(scope=build_scope(path="/graphql"), body=body, receive=None))
+
+    assert get_request_body_rep(body=json.dumps({"query": query, "variables": {"user": {"password": "secret"}}}).encode()) == {
+        "query": 'mutation { addUsers(users: [{firstName: "Jose", password: "[redacted]"}]) { errors } }',
+        "variables": {"user": {"password": "[redacted]"}},
+    }
+    assert get_request_body_rep(body=json.dumps({"query": "a" * 256}).encode()) == {"truncated": True, "bodyBytes": 269}
+
+
+def test_database_health_check_only_rejects_the_routes_of_the_unhealthy_databases(monkeypatch: pytest.MonkeyPatch) -> None:
+    states: Dict[str, DatabaseHealthState] = {
+        "cacheDatabase": DatabaseHealthState(),
+        "usersDatabase": DatabaseHealthState(),
+        "tvDatabase": DatabaseHealthState(),
+    }
+    states["cacheDatabase"].update(is_healthy=False, latency_ms=1.0)
+    states["tvDatabase"].update(is_healthy=False, latency_ms=1.0)
+    monkeypatch.setattr(database_health_monitor, "_states", states)
+    monkeypatch.setattr(configs, "app_database_health_check_routes_databases", {"graphql": {"usersDatabase"}, "rest/tv-channel": {"tvDatabase"}})
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    assert call_middlewares_chain(app=app, path="/graphql/users", body_chunks=[b""])[0]["status"] == 200
+    assert call_middlewares_chain(app=app, path="/rest/internal/stats/cache", body_chunks=[b""])[0]["status"] == 200
+    assert call_middlewares_chain(app=app, path="/rest/tv-channel/programmation/add-programmation", body_chunks=[b""])[0]["status"] == 503
@@ -0,0 +1,362 @@
+# ** info: python imports
+from os.path import join
+from os import path
+import sys
+
+# **info: appending src path to the system paths for absolute imports from src path
+sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "."))
+
+# ** info: python imports
+import argparse
+import platform
+import asyncio
+import logging
+import random
+import json
+import math
+import time
+
+# ** info: typing imports
+from typing import Callable
+from typing import Union
+from typing import Tuple
+from typing import List
+from typing import Dict
+from typing import Any
+
+# ** info: httpx imports
+import httpx
+
+# ---------------------------------------------------------------------------------------------------------------------
+# ** info: load generator, drives a weighted mix of the graphql and rest endpoints against the app in process or against
+# ** info: a running instance and prints the throughput and latency percentiles as json, run it with python tools/load_generator.py
+# ---------------------------------------------------------------------------------------------------------------------
+
+GRAPHQL_PATH: str = "/graphql/users"
+PROGRAMMATION_PATH: str = "/rest/tv-channel/programmation"
+IN_PROCESS_BASE_URL: str = "http://in-process"
+DEFAULT_MIX: str = "listUsers=60,search-programmation-raw-return=30,addUser=5,add-programmation=5"
+LATENCY_PERCENTILES: Tuple[float, ...] = (0.5, 0.9, 0.95, 0.99)
+
+LoadRequest = Tuple[str, Dict[str, Any]]
+
+
+def build_graphql_arguments(arguments: Dict[str, Any]) -> str:
+    # ** info: the arguments are sent as literals, the graphql cost validator of the app doesn't receive the request variables
+    return ", ".join(f"{name}: {json.dumps(value)}" for name, value in arguments.items())
+
+
+def list_users_request(sequence: int) -> LoadRequest:
+    first_name: Union[None, str] = ["Jo", "Ma", None][sequence % 3]
+    arguments: Dict[str, Any] = {"limit": 10, "offset": sequence % 100, **({"firstName": first_name} if first_name is not None else dict())}
+    query: str = (
+        f"query listUsers {{ listUsers({build_graphql_arguments(arguments=arguments)}) {{ internalId estatalId firstName lastName email }} }}"
+    )
+    return GRAPHQL_PATH, {"operationName": "listUsers", "query": query}
+
+
+def add_user_request(sequence: int) -> LoadRequest:
+    # ** info: the estatal ids, phones and emails are unique per run, so the inserts don't collide with the previous runs rows,
+    # ** info: both numbers stay below the 2147483647 limit of the integer columns
+    unique_id: int = (time.time_ns() // 1000 + sequence) % 10**9
+    arguments: Dict[str, Any] = {
+        "estatalId": 1000000000 + unique_id,
+        "firstName": "Load",
+        "lastName": "Generator",
+        "phoneNumber": 1000000000 + unique_id,
+        "email": f"load{unique_id}@mail.com",
+        "gender": "female",
+        "birthday": "1990-01-01",
+        "password": "load-generator-password",
+    }
+    query: str = f"mutation addUser {{ addUser({build_graphql_arguments(arguments=arguments)}) {{ internalId }} }}"
+    return GRAPHQL_PATH, {"operationName": "addUser", "query": query}
+
+
+def search_programmation_request(sequence: int) -> LoadRequest:
+    body: Dict[str, Any] = {"channelId": 1 + 4 * (sequence % 5), "channelName": "spo", "year": 2024}
+    return f"{PROGRAMMATION_PATH}/search-programmation-raw-return", body
+
+
+def add_programmation_request(sequence: int) -> LoadRequest:
+    body: Dict[str, Any] = {
+        "channelId": sequence % 20,
+        "channelName": "sports",
+        "channelContentType": "live",
+        "startHoure": f"{sequence % 24:02d}:00:00",
+        "endHoure": f"{(sequence + 1) % 24:02d}:00:00",
+        "weeks": [sequence % 52 + 1],
+        "days": [sequence % 7 + 1],
+        "year": 2024,
+    }
+    return f"{PROGRAMMATION_PATH}/add-programmation", body
+
+
+OPERATIONS: Dict[str, Callable[[int], LoadRequest]] = {
+    "listUsers": list_users_request,
+    "addUser": add_user_request,
+    "search-programmation-raw-return": search_programmation_request,
+    "add-programmation": add_programmation_request,
+}
+
+
+class LoadRecorder:
+
+    """load recorder
+    this class keeps the status and latency of every sent request per operation and summarizes
+    them into the load run report
+    """
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {operation: list() for operation in OPERATIONS}
+        self.statuses: Dict[str, Dict[str, int]] = {operation: dict() for operation in OPERATIONS}
+        self.errors: Dict[str, int] = {operation: 0 for operation in OPERATIONS}
+        self.skipped: int = 0
+
+    def record(self, operation: str, status: str, latency: float, is_error: bool) -> None:
+        self.latencies[operation].append(latency)
+        self.statuses[operation][status] = self.statuses[operation].get(status, 0) + 1
+        self.errors[operation] += 1 if is_error else 0
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        all_latencies: List[float] = [latency for latencies in self.latencies.values() for latency in latencies]
+
+        return {
+            "durationSeconds": round(elapsed, 3),
+            "requests": len(all_latencies),
+            "errors": sum(self.errors.values()),
+            "skipped": self.skipped,
+            "throughput": round(len(all_latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latencyMs": summarize_latencies(latencies=all_latencies),
+            "operations": {
+                operation: {
+                    "requests": len(latencies),
+                    "errors": self.errors[operation],
+                    "statuses": self.statuses[operation],
+                    "throughput": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+                    "latencyMs": summarize_latencies(latencies=latencies),
+                }
+                for operation, latencies in self.latencies.items()
+                if len(latencies) > 0
+            },
+        }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """parse mix
+    this function parses the operations mix from its command line representation
+    args:
+    - mix (str): the comma separated operation=weight pairs, like listUsers=80,addUser=20
+    returns:
+    - Dict[str, float]: the weight of each operation of the mix
+    """
+
+    weights: Dict[str, float] = dict()
+
+    for pair in mix.split(","):
+        operation, _, weight = pair.strip().partition("=")
+
+        if operation not in OPERATIONS:
+            raise ValueError(f"unknown operation {operation!r}, the available ones are {', '.join(OPERATIONS)}")
+
+        weights[operation] = float(weight) if weight != "" else 1.0
+
+    if sum(weights.values()) <= 0:
+        raise ValueError("the operations mix needs at least one positive weight")
+
+    return weights
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """summarize latencies
+    this function computes the nearest rank percentiles, the mean and the max of the latencies
+    args:
+    - latencies (List[float]): the requests latencies in seconds
+    returns:
+    - Dict[str, float]: the latencies summary in milliseconds
+    """
+
+    if len(latencies) == 0:
+        return dict()
+
+    ordered: List[float] = sorted(latencies)
+    summary: Dict[str, float] = {
+        f"p{percentile * 100:g}": ordered[max(0, math.ceil(percentile * len(ordered)) - 1)] for percentile in LATENCY_PERCENTILES
+    }
+    summary["mean"] = sum(ordered) / len(ordered)
+    summary["max"] = ordered[-1]
+
+    return {name: round(value * 1000, 3) for name, value in summary.items()}
+
+
+async def send_request(client: httpx.AsyncClient, recorder: LoadRecorder, operation: str, sequence: int, scheduled: float) -> None:
+    endpoint, body = OPERATIONS[operation](sequence)
+    status: str
+
+    try:
+        response: httpx.Response = await client.post(endpoint, json=body)
+        status = str(response.status_code)
+        is_error: bool = response.status_code >= 400 or (endpoint == GRAPHQL_PATH and "errors" in response.json())
+
+    # ! warning: super general exception handling here, the load run keeps going and reports the failure as an error status
+    except Exception as exception:
+        status, is_error = type(exception).__name__, True
+
+    # ** info: the latency is measured from the scheduled send time, so a saturated app can't hide its queueing time
+    recorder.record(operation=operation, status=status, latency=time.perf_counter() - scheduled, is_error=is_error)
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient, recorder: LoadRecorder, weights: Dict[str, float], rate: float, duration: float, max_in_flight: int, seed: int
+) -> float:
+    chooser: random.Random = random.Random(seed)
+    operations: List[str] = list(weights)
+    in_flight: set[asyncio.Task] = set()
+    start: float = time.perf_counter()
+    sequence: int = 0
+
+    while sequence < rate * duration:
+        scheduled: float = start + sequence / rate
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+
+        operation: str = chooser.choices(operations, weights=list(weights.values()))[0]
+
+        # ** info: the arrivals don't wait for the responses, the in flight cap only keeps an overloaded app from exhausting the memory
+        if len(in_flight) >= max_in_flight:
+            recorder.skipped += 1
+        else:
+            task: asyncio.Task = asyncio.create_task(send_request(client, recorder, operation, sequence, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        sequence += 1
+
+    if len(in_flight) > 0:
+        await asyncio.wait(in_flight)
+
+    return time.perf_counter() - start
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient, recorder: LoadRecorder, weights: Dict[str, float], workers: int, duration: float, seed: int
+) -> float:
+    operations: List[str] = list(weights)
+    start: float = time.perf_counter()
+    deadline: float = start + duration
+    sequence: int = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal sequence
+        chooser: random.Random = random.Random(seed + worker_id)
+
+        while time.perf_counter() < deadline:
+            operation: str = chooser.choices(operations, weights=list(weights.values()))[0]
+            sequence += 1
+            await send_request(client, recorder, operation, sequence, time.perf_counter())
+
+    await asyncio.gather(*(worker(worker_id=worker_id) for worker_id in range(workers)))
+
+    return time.perf_counter() - start
+
+
+async def build_in_process_client(users: int, programmations: int) -> Tuple[httpx.AsyncClient, Callable[[], Any]]:
+    # ** info: the app is imported lazily, so a run against an url never loads the app modules and its settings, the app
+    # ** info: startup events aren't run in process, so the databases health monitor and the indexes check stay idle
+    # ** info: the in process mode runs over the test stand ins, so it needs the test directory and the dev dependencies
+    sys.path.append(join(path.dirname(path.realpath(__file__)), "..", "test"))
+    from stand_ins import use_redis_stand_in
+    from stand_ins import SqliteStandIn
+    from stand_ins import RedisStandIn
+    from src.main import app
+
+    sqlite_stand_in: SqliteStandIn = SqliteStandIn(users=users, programmations=programmations)
+    await sqlite_stand_in.start()
+    use_redis_stand_in(stand_in=RedisStandIn())
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=IN_PROCESS_BASE_URL), sqlite_stand_in.stop
+
+
+async def run_load(arguments: argparse.Namespace) -> Dict[str, Any]:
+    weights: Dict[str, float] = parse_mix(mix=arguments.mix)
+    recorder: LoadRecorder = LoadRecorder()
+    elapsed: float
+
+    if arguments.url is None:
+        client, stop_target = await build_in_process_client(users=arguments.users, programmations=arguments.programmations)
+    else:
+        client, stop_target = httpx.AsyncClient(base_url=arguments.url, timeout=arguments.timeout), None
+
+    try:
+        async with client:
+            if arguments.rate is not None:
+                elapsed = await run_open_loop(
+                    client,
+                    recorder,
+                    weights,
+                    rate=arguments.rate,
+                    duration=arguments.duration,
+                    max_in_flight=arguments.max_in_flight,
+                    seed=arguments.seed,
+                )
+            else:
+                elapsed = await run_closed_loop(
+                    client, recorder, weights, workers=arguments.workers, duration=arguments.duration, seed=arguments.seed
+                )
+
+    finally:
+        if stop_target is not None:
+            await stop_target()
+
+    return {
+        "target": arguments.url or "in-process",
+        "mode": "open-loop" if arguments.rate is not None else "closed-loop",
+        "rate": arguments.rate,
+        "workers": arguments.workers if arguments.rate is None else None,
+        "mix": weights,
+        "python": platform.python_version(),
+        **recorder.to_dict(elapsed=elapsed),
+    }
+
+
+def build_arguments_parser() -> argparse.ArgumentParser:
+    argument_parser: argparse.ArgumentParser = argparse.ArgumentParser(description="graphql and rest endpoints load generator")
+    argument_parser.add_argument(
+        "--url", default=None, help="base url of a running app, the app is loaded in process over local stand ins when missing"
+    )
+    argument_parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help=f"comma separated operation=weight pairs, the operations are {', '.join(OPERATIONS)}"
+    )
+    argument_parser.add_argument("--rate", type=float, default=None, help="open loop mode, requests per second sent regardless of the responses")
+    argument_parser.add_argument("--workers", type=int, default=8, help="closed loop mode, concurrent workers sending a request after each response")
+    argument_parser.add_argument("--duration", type=float, default=10.0, help="load run duration in seconds")
+    argument_parser.add_argument(
+        "--max-in-flight", type=int, default=1000, help="open loop mode, in flight requests cap, the extra arrivals are skipped"
+    )
+    argument_parser.add_argument("--timeout", type=float, default=30.0, help="requests timeout in seconds when running against an url")
+    argument_parser.add_argument("--users", type=int, default=5000, help="users rows of the in process stand in database")
+    argument_parser.add_argument("--programmations", type=int, default=5000, help="tv programmations rows of the in process stand in database")
+    argument_parser.add_argument("--seed", type=int, default=0, help="operations choice seed, so the runs send the same sequence")
+    argument_parser.add_argument("--output", default=None, help="file to write the json report to besides the standard output")
+    return argument_parser
+
+
+if __name__ == "__main__":
+    argument_parser: argparse.ArgumentParser = build_arguments_parser()
+    arguments: argparse.Namespace = argument_parser.parse_args()
+
+    try:
+        parse_mix(mix=arguments.mix)
+    except ValueError as exception:
+        argument_parser.error(str(exception))
+
+    # ** info: the app logs are disabled so they neither cost time during the run nor mix with the json report
+    logging.disable(logging.CRITICAL)
+
+    report: Dict[str, Any] = asyncio.run(run_load(arguments=arguments))
+    report_rep: str = json.dumps(report, indent=4)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as report_file:
+            report_file.write(report_rep + "\n")
+
+    print(report_rep)